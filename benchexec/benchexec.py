@@ -14,6 +14,7 @@ import argparse
 import datetime
 import logging
 import os
+import shlex
 import sys
 
 from benchexec import __version__
@@ -64,6 +65,14 @@ class BenchExec(object):
         self.setup_logging()
 
         self.executor = self.load_executor()
+        if self.config.lazy_run_creation:
+            from . import localexecution
+
+            if self.executor is not localexecution:
+                # other executors iterate over the runs without creating them
+                parser.error(
+                    "--lazy-run-creation is supported only for local execution."
+                )
 
         returnCode = 0
         for arg in self.config.files:
@@ -218,6 +227,15 @@ class BenchExec(object):
             "(Applied only if the number of CPU cores is limited).",
             metavar="N,M-K",
         )
+        parser.add_argument(
+            "--core-class",
+            dest="core_class",
+            choices=["performance", "efficiency"],
+            default=None,
+            help="On CPUs with cores of different performance (e.g., hybrid CPUs), "
+            "use only the fastest or slowest cores for all runs "
+            "(Applied only if the number of CPU cores is limited).",
+        )
         parser.add_argument(
             "--no-hyperthreading",
             dest="use_hyperthreading",
@@ -226,6 +244,58 @@ class BenchExec(object):
             help="Disable assignment of more than one sibling virtual core to a single run",
         )
 
+        def parse_pinned_frequency(value):
+            if value == "max":
+                return value
+            return util.parse_frequency_value(value)
+
+        parser.add_argument(
+            "--pin-cpu-frequency",
+            dest="pinned_cpu_frequency",
+            type=parse_pinned_frequency,
+            default=None,
+            metavar="FREQUENCY",
+            help="Fix the frequency of the CPU cores used for benchmarking "
+            "to the given value (e.g., 2GHz), "
+            "or use 'max' for the performance governor without turbo boost. "
+            "The previous settings are restored afterwards "
+            "(needs write access to /sys/devices/system/cpu/).",
+        )
+
+        parser.add_argument(
+            "--calibration-runs",
+            dest="calibration_runs",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Before the benchmark, execute a command that does nothing N times "
+            "on the cores of each parallel run in order to measure the overhead "
+            "of BenchExec, and store its distribution in the result files.",
+        )
+        parser.add_argument(
+            "--calibration-command",
+            dest="calibration_command",
+            type=shlex.split,
+            default=None,
+            metavar="CMD",
+            help="Command line for the calibration runs (default: /bin/true).",
+        )
+        parser.add_argument(
+            "--overhead-corrected-values",
+            action="store_true",
+            help="Add columns with CPU time and wall time of each run minus the "
+            "median overhead measured by the calibration runs.",
+        )
+
+        parser.add_argument(
+            "--lazy-run-creation",
+            action="store_true",
+            help="Create the runs of each run set only while it is executed, "
+            "such that execution of large benchmarks starts earlier "
+            "(the number of runs shown in the progress output is then only an "
+            "upper bound, and this is supported only for local execution).",
+        )
+
         parser.add_argument(
             "--no-compress-results",
             dest="compress_results",
@@ -271,6 +341,16 @@ class BenchExec(object):
             help="maximum size of files the tool may write (checked periodically, counts only files written in container mode or to temporary directories)",
         )
 
+        parser.add_argument(
+            "--time-series-interval",
+            dest="time_series_interval",
+            type=float,
+            metavar="SECONDS",
+            help="Record CPU time and memory usage of each run in the given interval "
+            "and store them in a CSV file next to the log file of the run "
+            "(the interval is increased automatically for long runs).",
+        )
+
         parser.add_argument(
             "--commit",
             dest="commit",
@@ -339,6 +419,19 @@ class BenchExec(object):
         )
         self.check_existing_results(benchmark)
 
+        from . import localexecution
+
+        if self.executor is not localexecution and any(
+            run_set.rlimits.cpu_cores != benchmark.rlimits.cpu_cores
+            for run_set in benchmark.run_sets
+            if run_set.should_be_executed()
+        ):
+            # other executors use the limits of the benchmark for all runs
+            sys.exit(
+                "Run definitions with their own core limit (attribute cpuCores) "
+                "are supported only for local execution."
+            )
+
         self.executor.init(self.config, benchmark)
         output_handler = OutputHandler(
             benchmark, self.executor.get_system_info(), self.config.compress_results
@@ -0,0 +1,133 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+This module allows to measure the overhead of BenchExec itself
+(starting the process in a container, cgroup accounting, etc.)
+by executing a command that does nothing.
+For very short runs, this overhead is a significant part of the measured times.
+"""
+
+import collections
+import logging
+import os
+import statistics
+import tempfile
+
+DEFAULT_COMMAND = ["/bin/true"]
+
+# Measured values that are calibrated
+_MEASURES = ["cputime", "walltime"]
+
+
+class OverheadCalibration(object):
+    """
+    Executes a command that does nothing several times with the same setup as
+    the actual runs and computes the distribution of the measured times,
+    which can be used for computing overhead-corrected values of runs.
+    """
+
+    def __init__(self):
+        # cores of the calibration runs (tuple or None) -> list of measured values
+        self._samples_of_cores = collections.defaultdict(list)
+
+    def calibrate(
+        self,
+        run_executor,
+        count,
+        core_sets,
+        command=DEFAULT_COMMAND,
+        should_stop=lambda: False,
+        **kwargs
+    ):
+        """
+        Execute the calibration runs.
+        @param run_executor: the RunExecutor that is also used for the actual runs
+        @param count: the number of calibration runs for each set of cores
+        @param core_sets: a list of pairs of cores and memory nodes (may be None),
+            as used for the actual runs
+        @param command: the command line of the command that does nothing
+        @param should_stop: a function that returns True if calibration should stop
+        @param kwargs: further arguments for RunExecutor.execute_run()
+        """
+        fd, output_file = tempfile.mkstemp(prefix="BenchExec_calibration_")
+        os.close(fd)
+        try:
+            # interleave cores to avoid measuring a trend of the system as difference
+            for _ in range(count):
+                for cores, memory_nodes in core_sets:
+                    if should_stop():
+                        return
+                    result = run_executor.execute_run(
+                        command,
+                        output_file,
+                        cores=cores,
+                        memory_nodes=memory_nodes,
+                        **kwargs,
+                    )
+                    exitcode = result.get("exitcode")
+                    if (
+                        "terminationreason" in result
+                        or exitcode is None
+                        or exitcode.raw
+                    ):
+                        logging.warning(
+                            "Calibration run of %s failed: %s", command, result
+                        )
+                        continue
+                    self.add_sample(cores, result)
+        finally:
+            os.remove(output_file)
+
+    def add_sample(self, cores, values):
+        """Add the measured values of one calibration run on the given cores."""
+        self._samples_of_cores[tuple(cores) if cores else None].append(
+            {key: values[key] for key in _MEASURES if key in values}
+        )
+
+    def _values(self, measure, cores=None):
+        samples = self._samples_of_cores.get(tuple(cores) if cores else None)
+        if not samples:
+            # runs on cores without calibration use the values of all cores
+            samples = [
+                sample
+                for samples_of_cores in self._samples_of_cores.values()
+                for sample in samples_of_cores
+            ]
+        return [sample[measure] for sample in samples if measure in sample]
+
+    def summary(self):
+        """
+        Return the distribution of the measured overhead over all calibration runs
+        as dict with keys like "cputime-overhead-median" (empty if there are none).
+        """
+        result = collections.OrderedDict()
+        for measure in _MEASURES:
+            values = self._values(measure)
+            if not values:
+                continue
+            result["calibrationruns"] = len(values)
+            result[measure + "-overhead-min"] = min(values)
+            result[measure + "-overhead-median"] = statistics.median(values)
+            result[measure + "-overhead-max"] = max(values)
+            if len(values) > 1:
+                result[measure + "-overhead-stdev"] = statistics.stdev(values)
+        return result
+
+    def corrected_values(self, values, cores=None):
+        """
+        Compute overhead-corrected values for the measured values of a run,
+        by subtracting the median overhead of the calibration runs on the same cores.
+        @return a dict with keys like "cputime-corrected"
+        """
+        result = {}
+        for measure in _MEASURES:
+            overhead = self._values(measure, cores)
+            if overhead and values.get(measure) is not None:
+                corrected = values[measure] - statistics.median(overhead)
+                result[measure + "-corrected"] = max(corrected, 0)
+        return result
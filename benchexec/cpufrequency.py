@@ -0,0 +1,150 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+This module allows to pin the frequency of CPU cores with the cpufreq interface
+of Linux, which avoids that measurements are affected by frequency scaling.
+"""
+
+import logging
+import os
+import re
+
+from benchexec import util
+
+GOVERNOR_PERFORMANCE = "performance"
+
+
+class FrequencyPinning(object):
+    """
+    Changes the cpufreq settings of some CPU cores for the duration of a benchmark
+    and restores the previous settings afterwards.
+    The cores use the "performance" governor and turbo boost is disabled,
+    and if a frequency is given, minimum and maximum frequency are set to this value.
+    This needs write access to sysfs, i.e., typically root access.
+    """
+
+    def __init__(self, cores=None, frequency=None, sys_dir="/sys"):
+        """
+        @param cores: the list of CPU cores to change (default: all)
+        @param frequency: None or the frequency in Hz to which the cores are fixed
+        @param sys_dir: the mount point of sysfs (for tests)
+        """
+        self.frequency = frequency
+        self.governor = GOVERNOR_PERFORMANCE
+        self._cpu_dir = os.path.join(sys_dir, "devices", "system", "cpu")
+        if cores is None:
+            cores = sorted(
+                int(name[3:])
+                for name in os.listdir(self._cpu_dir)
+                if re.fullmatch(r"cpu\d+", name)
+            )
+        self.cores = cores
+        self._previous_settings = None  # list of (file, previous content)
+
+    def _cpufreq_file(self, core, name):
+        return os.path.join(self._cpu_dir, "cpu{}".format(core), "cpufreq", name)
+
+    def _turbo_setting(self):
+        """Return the file for controlling turbo boost and the value that disables it."""
+        boost_file = os.path.join(self._cpu_dir, "cpufreq", "boost")
+        if os.path.exists(boost_file):
+            return boost_file, "0"
+        no_turbo_file = os.path.join(self._cpu_dir, "intel_pstate", "no_turbo")
+        if os.path.exists(no_turbo_file):
+            return no_turbo_file, "1"
+        return None, None
+
+    def _write(self, filename, value):
+        """Write a value to a file and remember the previous content for restore()."""
+        self._previous_settings.append((filename, util.read_file(filename)))
+        util.write_file(value, filename)
+
+    def pin(self):
+        """
+        Change the settings of all cores, or raise an exception (OSError or ValueError)
+        if this is not possible (in this case, all changes are reverted).
+        """
+        assert self._previous_settings is None, "settings are already pinned"
+        self._previous_settings = []
+        try:
+            for core in self.cores:
+                governors = util.read_file(
+                    self._cpufreq_file(core, "scaling_available_governors")
+                ).split()
+                if self.governor not in governors:
+                    raise ValueError(
+                        "CPU core {} does not support governor {}".format(
+                            core, self.governor
+                        )
+                    )
+                if self.frequency is not None:
+                    min_freq = int(
+                        util.read_file(self._cpufreq_file(core, "cpuinfo_min_freq"))
+                    )
+                    max_freq = int(
+                        util.read_file(self._cpufreq_file(core, "cpuinfo_max_freq"))
+                    )
+                    if not min_freq * 1000 <= self.frequency <= max_freq * 1000:
+                        raise ValueError(
+                            "Frequency {} Hz is not supported by CPU core {}, "
+                            "which supports {} Hz to {} Hz".format(
+                                self.frequency, core, min_freq * 1000, max_freq * 1000
+                            )
+                        )
+
+            turbo_file, turbo_disabled = self._turbo_setting()
+            if turbo_file:
+                self._write(turbo_file, turbo_disabled)
+            else:
+                logging.debug("Turbo boost cannot be controlled on this system.")
+
+            for core in self.cores:
+                self._write(self._cpufreq_file(core, "scaling_governor"), self.governor)
+                if self.frequency is not None:
+                    frequency = str(self.frequency // 1000)  # kHz
+                    # the minimum must never be above the maximum,
+                    # so we first lower the minimum as far as possible
+                    self._write(
+                        self._cpufreq_file(core, "scaling_min_freq"),
+                        util.read_file(self._cpufreq_file(core, "cpuinfo_min_freq")),
+                    )
+                    self._write(self._cpufreq_file(core, "scaling_max_freq"), frequency)
+                    self._write(self._cpufreq_file(core, "scaling_min_freq"), frequency)
+        except (OSError, ValueError):
+            self.restore()
+            raise
+        logging.debug(
+            "Pinned CPU cores %s to governor %s and frequency %s.",
+            self.cores,
+            self.governor,
+            self.frequency,
+        )
+
+    def restore(self):
+        """Restore the settings from before pin(). Does nothing if not pinned."""
+        if self._previous_settings is None:
+            return
+        previous_settings = self._previous_settings
+        self._previous_settings = None
+
+        # Restoring in reverse order ensures that the minimum frequency of a core
+        # is never above its maximum, as during pin().
+        for filename, value in reversed(previous_settings):
+            try:
+                util.write_file(value, filename)
+            except OSError as e:
+                logging.warning(
+                    "Could not restore value %s of %s: %s", value, filename, e
+                )
+
+    def __enter__(self):
+        self.pin()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.restore()
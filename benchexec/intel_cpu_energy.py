@@ -11,6 +11,7 @@ import os
 import subprocess
 import signal
 import re
+import threading
 from benchexec.util import find_executable2
 from decimal import Decimal
 
@@ -19,6 +20,12 @@ DOMAIN_CORE = "core"
 DOMAIN_UNCORE = "uncore"
 DOMAIN_DRAM = "dram"
 
+POWERCAP_DIR = "/sys/class/powercap"
+# Interval in seconds for reading the powercap counters during a measurement,
+# such that no wrap-around of the counters is missed
+# (they wrap around after several minutes at full load).
+_POWERCAP_POLL_INTERVAL = 10
+
 
 class EnergyMeasurement(object):
     def __init__(self, executable):
@@ -27,6 +34,16 @@ class EnergyMeasurement(object):
 
     @classmethod
     def create_if_supported(cls):
+        """
+        Create an object for measuring energy, or return None if this is not possible.
+        The counters of the powercap interface of Linux are used if they are readable
+        (cf. PowercapEnergyMeasurement), otherwise the external program
+        cpu-energy-meter is used if available.
+        """
+        measurement = PowercapEnergyMeasurement.create_if_supported()
+        if measurement is not None:
+            return measurement
+
         executable = find_executable2("cpu-energy-meter")
         if executable is None:  # not available on current system
             logging.debug(
@@ -87,6 +104,143 @@ class EnergyMeasurement(object):
         return self._measurement_process is not None
 
 
+class PowercapEnergyMeasurement(object):
+    """
+    Energy measurement that reads the RAPL energy counters of the CPU directly
+    from the powercap interface of Linux (files energy_uj in /sys/class/powercap),
+    which avoids starting an external process for each measurement.
+    On many systems these files are readable only by root.
+    The interface and the results are the same as for EnergyMeasurement.
+    """
+
+    def __init__(self, domains):
+        """
+        @param domains: a list of (package, domain, energy file, max counter value)
+        """
+        self._domains = domains
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @classmethod
+    def create_if_supported(cls, powercap_dir=POWERCAP_DIR):
+        domains = _find_powercap_domains(powercap_dir)
+        if not domains:
+            logging.debug("No RAPL domains found in %s.", powercap_dir)
+            return None
+        measurement = cls(domains)
+        try:
+            measurement._read_counters()
+        except (OSError, ValueError) as e:
+            logging.debug("Cannot read RAPL energy counters from powercap: %s", e)
+            return None
+        return measurement
+
+    def _read_counters(self):
+        values = []
+        for _, _, energy_file, _ in self._domains:
+            with open(energy_file) as f:
+                values.append(int(f.read()))
+        return values
+
+    def _update(self):
+        """Add the energy consumed since the last update."""
+        with self._lock:
+            values = self._read_counters()
+            for i, (value, last_value) in enumerate(zip(values, self._last_values)):
+                if value < last_value:
+                    # counter has wrapped around
+                    value += self._domains[i][3]
+                self._energy[i] += value - last_value
+            self._last_values = values
+
+    def _poll(self):
+        while not self._stop_event.wait(_POWERCAP_POLL_INTERVAL):
+            try:
+                self._update()
+            except (OSError, ValueError) as e:
+                logging.warning("Reading energy counters failed: %s", e)
+
+    def start(self):
+        """Starts the measurement."""
+        assert (
+            not self.is_running()
+        ), "Attempted to start an energy measurement while one was already running."
+        self._energy = [0] * len(self._domains)
+        self._last_values = self._read_counters()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._poll, name="energy-measurement", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops the measurement and returns the measurement result,
+        if the measurement was running."""
+        if not self.is_running():
+            return None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._update()
+        except (OSError, ValueError) as e:
+            logging.warning("Reading energy counters failed: %s", e)
+
+        consumed_energy = collections.defaultdict(dict)
+        for (package, domain, _, _), energy in zip(self._domains, self._energy):
+            consumed_energy[package][domain] = Decimal(energy).scaleb(-6)  # uJ to J
+        return consumed_energy
+
+    def is_running(self):
+        """Returns True if there is currently a measurement running, False otherwise."""
+        return self._thread is not None
+
+
+def _find_powercap_domains(powercap_dir):
+    """
+    Find the RAPL domains in the powercap directory,
+    i.e., the zones "package-N" and their subzones (like "core" and "dram").
+    @return: a list of (package, domain, energy file, max counter value)
+    """
+    domains = []
+    try:
+        zones = sorted(os.listdir(powercap_dir))
+    except OSError:
+        return []
+    for zone in zones:
+        # Zones are named intel-rapl:<package zone> and intel-rapl:<zone>:<subzone>.
+        # Ignore other drivers like intel-rapl-mmio, which duplicate some zones.
+        if not re.fullmatch(r"intel-rapl(:\d+)+", zone):
+            continue
+        package_zone = zone.split(":")[1]
+        zone_dir = os.path.join(powercap_dir, zone)
+        package_dir = os.path.join(powercap_dir, "intel-rapl:" + package_zone)
+        try:
+            with open(os.path.join(package_dir, "name")) as f:
+                package_match = re.fullmatch(r"package-(\d+)", f.read().strip())
+            if not package_match:
+                continue  # e.g., psys
+            if zone_dir == package_dir:
+                domain = DOMAIN_PACKAGE
+            else:
+                with open(os.path.join(zone_dir, "name")) as f:
+                    domain = f.read().strip()
+            with open(os.path.join(zone_dir, "max_energy_range_uj")) as f:
+                max_energy = int(f.read())
+        except (OSError, ValueError) as e:
+            logging.debug("Cannot use powercap zone %s: %s", zone, e)
+            continue
+        domains.append(
+            (
+                int(package_match.group(1)),
+                domain,
+                os.path.join(zone_dir, "energy_uj"),
+                max_energy,
+            )
+        )
+    return domains
+
+
 def format_energy_results(energy):
     """Take the result of an energy measurement and return a flat dictionary that contains all values."""
     if not energy:
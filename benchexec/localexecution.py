@@ -5,20 +5,25 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import atexit
+import itertools
 import logging
 import os
 import queue
 import resource
+import shutil
 import sys
 import threading
 import time
 
 from benchexec import BenchExecException
+from benchexec import calibration
 from benchexec import cgroups
 from benchexec import containerexecutor
+from benchexec import cpufrequency
 from benchexec import resources
 from benchexec.runexecutor import RunExecutor
-from benchexec.pqos import Pqos
+from benchexec.pqos import MonitoringService, Pqos
 from benchexec import systeminfo
 from benchexec import tooladapter
 from benchexec import util
@@ -28,6 +33,9 @@ from benchexec.intel_cpu_energy import EnergyMeasurement
 WORKER_THREADS = []
 STOPPED_BY_INTERRUPT = False
 
+# number of runs whose executions are interleaved if runs are executed repeatedly
+_INTERLEAVED_RUNS_BLOCK_SIZE = 100
+
 
 def init(config, benchmark):
     config.containerargs = {}
@@ -59,9 +67,18 @@ def execute_benchmark(benchmark, output_handler):
 
     logging.debug("I will use %s threads.", benchmark.num_of_threads)
 
+    core_limits = {
+        runSet.rlimits.cpu_cores
+        for runSet in benchmark.run_sets
+        if runSet.should_be_executed()
+    }
+    # requirements default to the highest core limit of all run sets
+    max_core_limit = max(
+        (core_limits | {benchmark.rlimits.cpu_cores}) - {None}, default=None
+    )
     if (
         benchmark.requirements.cpu_model
-        or benchmark.requirements.cpu_cores != benchmark.rlimits.cpu_cores
+        or benchmark.requirements.cpu_cores != max_core_limit
         or benchmark.requirements.memory != benchmark.rlimits.memory
     ):
         logging.warning(
@@ -71,58 +88,134 @@ def execute_benchmark(benchmark, output_handler):
 
     my_cgroups = cgroups.find_my_cgroups()
 
-    coreAssignment = None  # cores per run
-    memoryAssignment = None  # memory banks per run
+    # core limit -> cores and memory banks per run of the run sets with this limit
+    core_assignments = {}
+    monitoring_service = None  # for monitoring cache usage of runs
     cpu_packages = None
     pqos = Pqos(show_warnings=True)  # The pqos class instance for cache allocation
     pqos.reset_monitoring()
 
-    if benchmark.rlimits.cpu_cores:
-        if not my_cgroups.require_subsystem(cgroups.CPUSET):
-            logging.error(
-                "Cgroup subsystem cpuset is required "
-                "for limiting the number of CPU cores/memory nodes."
-            )
-            my_cgroups.handle_errors({cgroups.CPUSET})
-        coreAssignment = resources.get_cpu_cores_per_run(
-            benchmark.rlimits.cpu_cores,
-            benchmark.num_of_threads,
-            benchmark.config.use_hyperthreading,
-            my_cgroups,
-            benchmark.config.coreset,
+    if any(core_limits) and not my_cgroups.require_subsystem(cgroups.CPUSET):
+        logging.error(
+            "Cgroup subsystem cpuset is required "
+            "for limiting the number of CPU cores/memory nodes."
         )
-        pqos.allocate_l3ca(coreAssignment)
+        my_cgroups.handle_errors({cgroups.CPUSET})
+
+    # Run sets are executed one after another, so run sets with different core
+    # limits can each use their own assignment of cores to parallel runs.
+    for core_limit in sorted(core_limits - {None}):
+        if core_limit == benchmark.rlimits.cpu_cores:
+            coreAssignment = resources.get_cpu_cores_per_run(
+                core_limit,
+                benchmark.num_of_threads,
+                benchmark.config.use_hyperthreading,
+                my_cgroups,
+                benchmark.config.coreset,
+                benchmark.config.core_class,
+            )
+        else:
+            # The number of threads is chosen for the limit of the benchmark,
+            # so for run sets with a different limit we keep the machine utilized
+            # with as many parallel runs as fit.
+            coreAssignment = resources.get_cpu_cores_for_max_runs(
+                core_limit,
+                benchmark.num_of_threads,
+                benchmark.config.use_hyperthreading,
+                my_cgroups,
+                benchmark.config.coreset,
+                benchmark.config.core_class,
+            )
+            if len(coreAssignment) < benchmark.num_of_threads:
+                logging.warning(
+                    "Only %s runs with %s CPU cores each fit on this machine, "
+                    "run definitions with this core limit "
+                    "will be executed with fewer parallel runs.",
+                    len(coreAssignment),
+                    core_limit,
+                )
         memoryAssignment = resources.get_memory_banks_per_run(
             coreAssignment, my_cgroups
         )
+        core_assignments[core_limit] = (coreAssignment, memoryAssignment)
+
+    if core_assignments:
+        monitoring_service = MonitoringService(show_warnings=True)
+        if not monitoring_service.start():
+            monitoring_service = None
         cpu_packages = {
             resources.get_cpu_package_for_core(core)
+            for coreAssignment, _ in core_assignments.values()
             for cores_of_run in coreAssignment
             for core in cores_of_run
         }
-    elif benchmark.config.coreset:
+    elif benchmark.config.coreset or benchmark.config.core_class:
         sys.exit(
             "Please limit the number of cores first if you also want to limit the set of available cores."
         )
 
     if benchmark.rlimits.memory:
         # check whether we have enough memory in the used memory banks for all runs
-        resources.check_memory_size(
-            benchmark.rlimits.memory,
-            benchmark.num_of_threads,
-            memoryAssignment,
-            my_cgroups,
-        )
+        assignments = list(core_assignments.values()) or [(None, None)]
+        for coreAssignment, memoryAssignment in assignments:
+            resources.check_memory_size(
+                benchmark.rlimits.memory,
+                len(coreAssignment) if coreAssignment else benchmark.num_of_threads,
+                memoryAssignment,
+                my_cgroups,
+            )
 
-    if benchmark.num_of_threads > 1 and systeminfo.is_turbo_boost_enabled():
+    frequency_pinning = None
+    if benchmark.config.pinned_cpu_frequency:
+        if core_assignments:
+            pinned_cores = sorted(
+                {
+                    core
+                    for coreAssignment, _ in core_assignments.values()
+                    for cores in coreAssignment
+                    for core in cores
+                }
+            )
+        else:
+            pinned_cores = None  # all cores
+        frequency = benchmark.config.pinned_cpu_frequency
+        frequency_pinning = cpufrequency.FrequencyPinning(
+            pinned_cores, None if frequency == "max" else frequency
+        )
+        try:
+            frequency_pinning.pin()
+        except (OSError, ValueError) as e:
+            sys.exit("Could not pin CPU frequency: {}".format(e))
+        # make sure that the settings are restored even if benchexec crashes
+        atexit.register(frequency_pinning.restore)
+        output_handler.store_cpu_frequency_pinning(
+            frequency_pinning.governor, frequency_pinning.frequency
+        )
+    elif benchmark.num_of_threads > 1 and systeminfo.is_turbo_boost_enabled():
         logging.warning(
             "Turbo boost of CPU is enabled. "
             "Starting more than one benchmark in parallel affects the CPU frequency "
             "and thus makes the performance unreliable."
         )
 
+    overhead_calibration = None
+    if benchmark.config.calibration_runs < 0:
+        sys.exit("Number of calibration runs must not be negative.")
+    elif benchmark.config.calibration_runs:
+        overhead_calibration = _calibrate_overhead(
+            benchmark, core_assignments, None in core_limits
+        )
+        output_handler.store_overhead_calibration(overhead_calibration.summary())
+    elif benchmark.config.overhead_corrected_values:
+        sys.exit("Overhead-corrected values need calibration runs.")
+
     throttle_check = systeminfo.CPUThrottleCheck()
     swap_check = systeminfo.SwapCheck()
+    system_health_sampler = systeminfo.SystemHealthSampler()
+    system_health_sampler.start()
+
+    # error during creation of runs, raised after cleanup
+    run_creation_error = None
 
     # iterate over run sets
     for runSet in benchmark.run_sets:
@@ -133,7 +226,7 @@ def execute_benchmark(benchmark, output_handler):
         if not runSet.should_be_executed():
             output_handler.output_for_skipping_run_set(runSet)
 
-        elif not runSet.runs:
+        elif not runSet.run_count():
             output_handler.output_for_skipping_run_set(
                 runSet, "because it has no files"
             )
@@ -147,14 +240,17 @@ def execute_benchmark(benchmark, output_handler):
             if energy_measurement:
                 energy_measurement.start()
 
-            output_handler.output_before_run_set(runSet)
+            coreAssignment, memoryAssignment = core_assignments.get(
+                runSet.rlimits.cpu_cores, (None, None)
+            )
+            if coreAssignment:
+                pqos.reset_resources()
+                pqos.allocate_l3ca(coreAssignment)
 
-            # put all runs into a queue
-            for run in runSet.runs:
-                _Worker.working_queue.put(run)
+            output_handler.output_before_run_set(runSet)
 
             # keep a counter of unfinished runs for the below assertion
-            unfinished_runs = len(runSet.runs)
+            unfinished_runs = 0
             unfinished_runs_lock = threading.Lock()
 
             def run_finished():
@@ -170,20 +266,94 @@ def execute_benchmark(benchmark, output_handler):
                 py_switch_interval = sys.getswitchinterval()
                 sys.setswitchinterval(1000)
 
-            # create some workers
-            for i in range(min(benchmark.num_of_threads, unfinished_runs)):
+            executions = benchmark.warmup + benchmark.repetitions
+
+            # create some workers, they wait for runs to appear in the queue
+            workers = []
+            for i in range(
+                min(
+                    len(coreAssignment) if coreAssignment else benchmark.num_of_threads,
+                    runSet.run_count() * executions,
+                )
+            ):
                 if STOPPED_BY_INTERRUPT:
                     break
                 cores = coreAssignment[i] if coreAssignment else None
                 memBanks = memoryAssignment[i] if memoryAssignment else None
-                WORKER_THREADS.append(
-                    _Worker(benchmark, cores, memBanks, output_handler, run_finished)
+                workers.append(
+                    _Worker(
+                        benchmark,
+                        cores,
+                        memBanks,
+                        output_handler,
+                        run_finished,
+                        monitoring_service,
+                        system_health_sampler,
+                        overhead_calibration
+                        if benchmark.config.overhead_corrected_values
+                        else None,
+                    )
                 )
+            WORKER_THREADS.extend(workers)
+
+            def add_run_to_queue(run, execution=0):
+                nonlocal unfinished_runs
+                with unfinished_runs_lock:
+                    unfinished_runs += 1
+                _Worker.working_queue.put((run, execution))
+
+            def runs_to_execute():
+                # runs that do not exist yet are created on demand such that
+                # execution can start before all runs are created
+                yield from list(runSet.runs)
+                for run in runSet.create_runs():
+                    if STOPPED_BY_INTERRUPT:
+                        break
+                    output_handler.output_for_created_run(run)
+                    yield run
+
+            # The executions of runs that are executed repeatedly are interleaved
+            # within blocks of runs such that changes of the system state over time
+            # affect all runs equally, but runs are still finished (and written)
+            # soon after they were started.
+            block_size = (
+                max(_INTERLEAVED_RUNS_BLOCK_SIZE, len(workers)) if executions > 1 else 1
+            )
+            try:
+                runs = runs_to_execute()
+                block = list(itertools.islice(runs, block_size))
+                while block:
+                    for execution in range(executions):
+                        for run in block:
+                            add_run_to_queue(run, execution)
+                    block = list(itertools.islice(runs, block_size))
+            except BenchExecException as e:
+                # workers are already executing runs, so we need to stop them
+                run_creation_error = e
+                stop()
+            finally:
+                # signal workers that there are no more runs
+                for _worker in workers:
+                    _Worker.working_queue.put(None)
 
             # wait until workers are finished (all tasks done or STOPPED_BY_INTERRUPT)
             for worker in WORKER_THREADS:
                 worker.join()
             assert unfinished_runs == 0 or STOPPED_BY_INTERRUPT
+            # runs with executions that were not finished because of an interrupt
+            for run, (_, results) in _Worker.repetition_results.items():
+                if any(result and "exitcode" in result for result in results):
+                    run_result, visible_columns = _combine_repetitions(run, results)
+                    _store_run_result(
+                        run,
+                        run_result,
+                        visible_columns,
+                        output_handler,
+                        overhead_calibration
+                        if benchmark.config.overhead_corrected_values
+                        else None,
+                    )
+            _Worker.repetition_results.clear()
 
             # get times after runSet
             walltime_after = time.monotonic()
@@ -199,7 +369,9 @@ def execute_benchmark(benchmark, output_handler):
             if not containerexecutor.NATIVE_CLONE_CALLBACK_SUPPORTED:
                 sys.setswitchinterval(py_switch_interval)
 
-            if STOPPED_BY_INTERRUPT:
+            if run_creation_error:
+                output_handler.set_error(str(run_creation_error), runSet)
+            elif STOPPED_BY_INTERRUPT:
                 output_handler.set_error("interrupted", runSet)
             output_handler.output_after_run_set(
                 runSet, cputime=usedCpuTime, walltime=usedWallTime, energy=energy
@@ -215,12 +387,59 @@ def execute_benchmark(benchmark, output_handler):
             "System has swapped during benchmarking. "
             "Benchmark results are unreliable!"
         )
+    system_health_sampler.stop()
+    if monitoring_service:
+        monitoring_service.close()
     pqos.reset_resources()
-    output_handler.output_after_benchmark(STOPPED_BY_INTERRUPT)
-
+    if frequency_pinning:
+        frequency_pinning.restore()
+    output_handler.output_after_benchmark(
+        STOPPED_BY_INTERRUPT and not run_creation_error
+    )
+
+    if run_creation_error:
+        raise run_creation_error
     return 0
 
 
+def _calibrate_overhead(benchmark, core_assignments, without_cores):
+    """
+    Execute the calibration runs for measuring the overhead of BenchExec
+    with the same setup (container, cores, memory nodes) as the actual runs.
+    @param core_assignments: the cores and memory nodes per run for each core limit
+    @param without_cores: whether some runs are executed without a core limit
+    @return: an OverheadCalibration instance
+    """
+    core_sets = []
+    for coreAssignment, memoryAssignment in core_assignments.values():
+        core_sets.extend(
+            zip(coreAssignment, memoryAssignment or [None] * len(coreAssignment))
+        )
+    if without_cores or not core_sets:
+        core_sets.append((None, None))
+
+    util.printOut(
+        "\nexecuting {} calibration runs".format(
+            benchmark.config.calibration_runs * len(core_sets)
+        )
+    )
+    overhead_calibration = calibration.OverheadCalibration()
+    overhead_calibration.calibrate(
+        RunExecutor(**benchmark.config.containerargs),
+        benchmark.config.calibration_runs,
+        core_sets,
+        command=benchmark.config.calibration_command or calibration.DEFAULT_COMMAND,
+        should_stop=lambda: STOPPED_BY_INTERRUPT,
+        memlimit=benchmark.rlimits.memory,
+        environments=benchmark.environment(),
+        workingDir=benchmark.working_directory(),
+        write_header=False,
+    )
+    for key, value in overhead_calibration.summary().items():
+        logging.debug("Calibration: %s = %s", key, value)
+    return overhead_calibration
+
+
 def stop():
     global STOPPED_BY_INTERRUPT
     STOPPED_BY_INTERRUPT = True
@@ -231,6 +450,69 @@ def stop():
         worker.stop()
 
 
+def _combine_repetitions(run, results):
+    """
+    Combine the results of the measured repetitions of a run that is executed
+    repeatedly into the result of the run.
+    The first successful repetition is the main one that provides all values
+    except for the statistics, and its log file becomes the log file of the run.
+    @param results: the list of results of all repetitions,
+        with None for repetitions that were not executed
+    @return: a tuple of the result of the run and the names of the statistic values
+    """
+    benchmark = run.runSet.benchmark
+    measured = [
+        (repetition, result)
+        for repetition, result in enumerate(results)
+        if result is not None
+    ]
+    # failed and killed executions have only a termination reason
+    main_repetition, run_result = next(
+        (
+            (repetition, result)
+            for repetition, result in measured
+            if "exitcode" in result
+        ),
+        measured[0],
+    )
+
+    for repetition in range(1, benchmark.repetitions):
+        log_file = run.execution_log_file(benchmark.warmup + repetition)
+        try:
+            if repetition == main_repetition:
+                if benchmark.config.debug:
+                    shutil.copyfile(log_file, run.log_file)
+                else:
+                    os.replace(log_file, run.log_file)
+            elif not benchmark.config.debug:
+                os.remove(log_file)
+        except OSError:
+            pass
+
+    statistic_values = run.set_repetition_results([result for _, result in measured])
+    run_result = dict(run_result)
+    run_result.update(statistic_values)
+    return run_result, set(statistic_values)
+
+
+def _store_run_result(
+    run, run_result, visible_columns, output_handler, overhead_calibration=None
+):
+    """
+    Store the result of a finished run and output it.
+    """
+    visible_columns = set(visible_columns)
+    if overhead_calibration:
+        corrected_values = overhead_calibration.corrected_values(
+            run_result, run_result.get("cpuCores")
+        )
+        run_result.update(corrected_values)
+        visible_columns.update(corrected_values)
+
+    run.set_result(run_result, visible_columns)
+    output_handler.output_after_run(run)
+
+
 class _Worker(threading.Thread):
     """
     A Worker is a deamonic thread, that takes jobs from the working_queue and runs them.
@@ -238,10 +520,26 @@ class _Worker(threading.Thread):
 
     working_queue = queue.Queue()
 
+    # results of runs that are executed repeatedly and not yet finished:
+    # run -> [number of finished executions, list of results of repetitions]
+    repetition_results = {}
+    repetition_results_lock = threading.Lock()
+
     def __init__(
-        self, benchmark, my_cpus, my_memory_nodes, output_handler, run_finished_callback
+        self,
+        benchmark,
+        my_cpus,
+        my_memory_nodes,
+        output_handler,
+        run_finished_callback,
+        monitoring_service=None,
+        system_health_sampler=None,
+        overhead_calibration=None,
     ):
         threading.Thread.__init__(self)  # constuctor of superclass
+        self.overhead_calibration = overhead_calibration
+        self.monitoring_service = monitoring_service
+        self.system_health_sampler = system_health_sampler
         self.run_finished_callback = run_finished_callback
         self.benchmark = benchmark
         self.my_cpus = my_cpus
@@ -254,14 +552,16 @@ class _Worker(threading.Thread):
 
     def run(self):
         while not STOPPED_BY_INTERRUPT:
-            try:
-                currentRun = _Worker.working_queue.get_nowait()
-            except queue.Empty:
+            item = _Worker.working_queue.get()
+            if item is None:
+                # no more runs in this run set
+                _Worker.working_queue.task_done()
                 return
+            currentRun, execution = item
 
             try:
                 logging.debug('Executing run "%s"', currentRun.identifier)
-                self.execute(currentRun)
+                self.execute(currentRun, execution)
                 logging.debug('Finished run "%s"', currentRun.identifier)
             except SystemExit as e:
                 logging.critical(e)
@@ -272,24 +572,63 @@ class _Worker(threading.Thread):
             self.run_finished_callback()
             _Worker.working_queue.task_done()
 
-    def execute(self, run):
+    def execute(self, run, execution=0):
         """
         This function executes the tool with a sourcefile with options.
         It also calls functions for output before and after the run.
+        @param execution: the index of the execution if runs are executed repeatedly
+        """
+        benchmark = self.benchmark
+        repeated = benchmark.warmup or benchmark.repetitions > 1
+        try:
+            run_result = self._execute_run(run, execution)
+        except BaseException:
+            if repeated:
+                # A run is finished only after all its executions,
+                # so failed executions need to be counted as well.
+                self._finish_execution(run, execution, {"terminationreason": "failed"})
+            raise
+        if run_result is None:
+            if not repeated:
+                return 1  # the run was interrupted, we ignore the result
+            run_result = {"terminationreason": "killed"}
+        self._finish_execution(run, execution, run_result)
+        return None
+
+    def _execute_run(self, run, execution):
+        """
+        Execute the tool once for a run.
+        @return: the result as returned by RunExecutor.execute_run(),
+            or None if the execution was interrupted
         """
-        self.output_handler.output_before_run(run)
         benchmark = self.benchmark
+        if not execution:
+            self.output_handler.output_before_run(run)
+        # Only the first measured repetition of a run stores its result files and
+        # time series, the other executions are for the measurements only.
+        is_main_execution = execution == benchmark.warmup
+        log_file = run.execution_log_file(execution)
+        record_time_series = is_main_execution and benchmark.config.time_series_interval
 
         args = run.cmdline()
         logging.debug("Command line of run is %s", args)
         pqos = Pqos()
+        monitoring_group = None
         if self.my_cpus:
-            pqos.start_monitoring([self.my_cpus])
+            if self.monitoring_service:
+                monitoring_group = self.monitoring_service.start_group(self.my_cpus)
+            else:
+                pqos.start_monitoring([self.my_cpus])
+        run_start = time.monotonic()
+        if self.system_health_sampler:
+            health_baseline = self.system_health_sampler.sample()
         run_result = self.run_executor.execute_run(
             args,
-            output_filename=run.log_file,
+            output_filename=log_file,
             output_dir=run.result_files_folder,
-            result_files_patterns=benchmark.result_files_patterns,
+            result_files_patterns=(
+                benchmark.result_files_patterns if is_main_execution else []
+            ),
             hardtimelimit=benchmark.rlimits.cputime_hard,
             softtimelimit=benchmark.rlimits.cputime,
             walltimelimit=benchmark.rlimits.walltime,
@@ -301,8 +640,14 @@ class _Worker(threading.Thread):
             maxLogfileSize=benchmark.config.maxLogfileSize,
             files_count_limit=benchmark.config.filesCountLimit,
             files_size_limit=benchmark.config.filesSizeLimit,
+            time_series_filename=run.time_series_file if record_time_series else None,
+            time_series_interval=benchmark.config.time_series_interval,
         )
-        mon_data = pqos.stop_monitoring()
+        run_end = time.monotonic()
+        if monitoring_group is not None:
+            mon_data = self.monitoring_service.stop_group(monitoring_group)
+        else:
+            mon_data = pqos.stop_monitoring()
         run_result.update(mon_data)
         if not mon_data:
             logging.debug(
@@ -314,21 +659,86 @@ class _Worker(threading.Thread):
             # If the run was interrupted, we ignore the result and cleanup.
             try:
                 if benchmark.config.debug:
-                    os.rename(run.log_file, run.log_file + ".killed")
+                    os.rename(log_file, log_file + ".killed")
                 else:
-                    os.remove(run.log_file)
+                    os.remove(log_file)
+            except OSError:
+                pass
+            if "timeseries" in run_result:
+                try:
+                    os.remove(run.time_series_file)
+                except OSError:
+                    pass
+            return None
+
+        if execution < benchmark.warmup and not benchmark.config.debug:
+            # log files of measured repetitions are handled by _combine_repetitions
+            try:
+                os.remove(log_file)
             except OSError:
                 pass
-            return 1
+
+        if "timeseries" in run_result:
+            # store path relative to the result files
+            run_result["timeseries"] = os.path.relpath(
+                run_result["timeseries"],
+                os.path.dirname(benchmark.output_base_name) or os.curdir,
+            )
+
+        if self.system_health_sampler:
+            # Values about the state of the system during the run,
+            # useful for finding runs that were disturbed, e.g., by throttling.
+            health = self.system_health_sampler.summarize(
+                run_start, run_end, self.my_cpus, baseline=health_baseline
+            )
+            for key, value in health.items():
+                run_result["systemhealth-" + key] = value
 
         if self.my_cpus:
             run_result["cpuCores"] = self.my_cpus
         if self.my_memory_nodes:
             run_result["memoryNodes"] = self.my_memory_nodes
+        return run_result
 
-        run.set_result(run_result)
-        self.output_handler.output_after_run(run)
-        return None
+    def _finish_execution(self, run, execution, run_result):
+        """
+        Handle the result of one execution of a run, and store the result of the run
+        and output it if this was the last execution of the run.
+        """
+        benchmark = self.benchmark
+        visible_columns = set()
+        if benchmark.warmup or benchmark.repetitions > 1:
+            results = self._collect_repetition(run, execution, run_result)
+            if results is None:
+                return  # other executions of this run are not yet finished
+            run_result, visible_columns = _combine_repetitions(run, results)
+
+        _store_run_result(
+            run,
+            run_result,
+            visible_columns,
+            self.output_handler,
+            self.overhead_calibration,
+        )
+
+    def _collect_repetition(self, run, execution, run_result):
+        """
+        Store the result of one execution of a run that is executed repeatedly.
+        @return: the list of results of all repetitions (without warm-up executions)
+            if this was the last execution of the run, otherwise None
+        """
+        benchmark = self.benchmark
+        with _Worker.repetition_results_lock:
+            finished = _Worker.repetition_results.setdefault(
+                run, [0, [None] * benchmark.repetitions]
+            )
+            finished[0] += 1
+            if execution >= benchmark.warmup:
+                finished[1][execution - benchmark.warmup] = run_result
+            if finished[0] < benchmark.warmup + benchmark.repetitions:
+                return None
+            del _Worker.repetition_results[run]
+        return finished[1]
 
     def stop(self):
         # asynchronous call to runexecutor,
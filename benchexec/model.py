@@ -6,9 +6,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import collections
+import concurrent.futures
 import logging
 import os
 import re
+import statistics
 import sys
 import yaml
 from xml.etree import ElementTree
@@ -30,6 +32,12 @@ WALLTIMELIMIT = "walltimelimit"
 
 _BYTE_FACTOR = 1000  # byte in kilobyte
 
+# Values of runs that are executed repeatedly that are stored for each repetition
+SAMPLE_VALUES = ["cputime", "walltime", "memory", "terminationreason"]
+
+# Measures of runs that are executed repeatedly for which statistics are computed
+REPETITION_MEASURES = ["cputime", "walltime", "memory"]
+
 _ERROR_RESULTS_FOR_TERMINATION_REASON = {
     "cputime": "TIMEOUT",
     "cputime-soft": "TIMEOUT",
@@ -46,6 +54,13 @@ _WARNED_ABOUT_UNSUPPORTED_EXPECTED_RESULT_FILTER = False
 
 _TASK_DEF_VERSIONS = frozenset(["0.1", "1.0", "2.0"])
 
+# The C implementation of the YAML parser is much faster, but optional in PyYAML.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Minimal number of task-definition files for which we start worker processes
+# for parsing them, for fewer files the overhead is not worth it.
+_PARALLEL_TASK_DEF_LOADING_THRESHOLD = 1000
+
 
 def substitute_vars(oldList, runSet=None, task_file=None):
     """
@@ -91,7 +106,7 @@ def load_task_definition_file(task_def_file):
     """Open and parse a task-definition file in YAML format."""
     try:
         with open(task_def_file) as f:
-            task_def = yaml.safe_load(f)
+            task_def = yaml.load(f, Loader=_YAML_LOADER)
     except OSError as e:
         raise BenchExecException("Cannot open task-definition file: " + str(e))
     except yaml.YAMLError as e:
@@ -117,13 +132,159 @@ def load_task_definition_file(task_def_file):
     return task_def
 
 
-def handle_files_from_task_definition(patterns, task_def_file):
+class TaskDefinitionCache(object):
+    """
+    Cache for the parsed content of task-definition files of a benchmark.
+    Each file is parsed at most once, even if several run sets use it,
+    and large numbers of files are parsed in parallel by worker processes.
+    The cached content must not be modified by users of this class.
+    """
+
+    def __init__(self, parallel_threshold=_PARALLEL_TASK_DEF_LOADING_THRESHOLD):
+        self._task_defs = {}
+        self._parallel_threshold = parallel_threshold
+
+    def preload(self, task_def_files):
+        """
+        Parse all given task-definition files that are not yet cached.
+        Files are parsed in parallel if there are enough of them,
+        otherwise nothing is done here and they are parsed lazily in get().
+        """
+        missing = [
+            f
+            for f in collections.OrderedDict.fromkeys(task_def_files)
+            if f not in self._task_defs
+        ]
+        if len(missing) < self._parallel_threshold:
+            return
+
+        worker_count = os.cpu_count() or 1
+        if worker_count == 1:
+            return
+        logging.debug(
+            "Parsing %d task-definition files with %d processes.",
+            len(missing),
+            worker_count,
+        )
+        try:
+            with concurrent.futures.ProcessPoolExecutor(worker_count) as pool:
+                task_defs = pool.map(
+                    load_task_definition_file,
+                    missing,
+                    chunksize=max(1, len(missing) // (worker_count * 4)),
+                )
+                self._task_defs.update(zip(missing, task_defs))
+        except (OSError, yaml.YAMLError, BenchExecException) as e:
+            # Invalid files are reported with the usual error message
+            # when they are parsed again in get().
+            logging.debug(
+                "Could not parse task-definition files in parallel (%s), "
+                "falling back to sequential parsing.",
+                e,
+            )
+
+    def get(self, task_def_file):
+        """Return the parsed content of a task-definition file."""
+        task_def = self._task_defs.get(task_def_file)
+        if task_def is None:
+            task_def = load_task_definition_file(task_def_file)
+            self._task_defs[task_def_file] = task_def
+        return task_def
+
+
+class FileSystemCache(object):
+    """
+    Memoization of file-system accesses during the construction of a benchmark,
+    in order to avoid repeating the same glob and stat calls for every run and
+    every run set (which is slow especially on network file systems).
+    It assumes that the file system does not change while it is in use
+    and keeps statistics about how many accesses it could avoid.
+    """
+
+    def __init__(self):
+        self._glob_results = {}
+        self._samefile_results = {}
+        self._isfile_results = {}
+        self._file_lines = {}
+        self._hits = collections.Counter()
+        self._misses = collections.Counter()
+
+    def _lookup(self, kind, cache, key, compute):
+        try:
+            value = cache[key]
+        except KeyError:
+            self._misses[kind] += 1
+            value = cache[key] = compute()
+        else:
+            self._hits[kind] += 1
+        return value
+
+    def expand_filename_pattern(self, pattern, base_dir):
+        """
+        Like util.expand_filename_pattern(), but cached.
+        The returned list is a fresh copy and can be modified by the caller.
+        """
+        return list(
+            self._lookup(
+                "glob",
+                self._glob_results,
+                (pattern, base_dir),
+                lambda: tuple(util.expand_filename_pattern(pattern, base_dir)),
+            )
+        )
+
+    def samefile(self, path1, path2):
+        """Like os.path.samefile(), but cached."""
+        return self._lookup(
+            "samefile",
+            self._samefile_results,
+            (path1, path2),
+            lambda: os.path.samefile(path1, path2),
+        )
+
+    def isfile(self, path):
+        """Like os.path.isfile(), but cached."""
+        return self._lookup(
+            "isfile", self._isfile_results, path, lambda: os.path.isfile(path)
+        )
+
+    def read_lines(self, filename):
+        """Return the stripped lines of a text file, cached."""
+
+        def read():
+            with open(filename, "rt") as f:
+                return tuple(line.strip() for line in f)
+
+        return self._lookup("read", self._file_lines, filename, read)
+
+    def __str__(self):
+        kinds = sorted(set(self._hits) | set(self._misses))
+        if not kinds:
+            return "no file-system accesses"
+        return ", ".join(
+            "{}: {} of {} cached ({:.0%})".format(
+                kind,
+                self._hits[kind],
+                self._hits[kind] + self._misses[kind],
+                self._hits[kind] / (self._hits[kind] + self._misses[kind]),
+            )
+            for kind in kinds
+        )
+
+
+def handle_files_from_task_definition(patterns, task_def_file, file_system_cache=None):
     """
     Handle content of a key like input_files in a task-definition file and return list
     of matching files.
     @param patterns: the content of such a key (None, list, or string)
     @param task_def_file: name of task-definition file
+    @param file_system_cache: an optional FileSystemCache to use for expanding patterns
     """
+    expand_filename_pattern = (
+        file_system_cache.expand_filename_pattern
+        if file_system_cache
+        else util.expand_filename_pattern
+    )
     if patterns is None:
         return []
     result = []
@@ -131,9 +292,7 @@ def handle_files_from_task_definition(patterns, task_def_file):
         # accept single string in addition to list of strings
         patterns = [patterns]
     for pattern in patterns:
-        expanded = util.expand_filename_pattern(
-            str(pattern), os.path.dirname(task_def_file)
-        )
+        expanded = expand_filename_pattern(str(pattern), os.path.dirname(task_def_file))
         if not expanded:
             raise BenchExecException(
                 "Pattern '{}' in task-definition file {} did not match any paths.".format(
@@ -388,6 +547,20 @@ class Benchmark(object):
             logging.error("At least ONE thread must be given!")
             sys.exit()
 
+        # each run is executed warmup + repetitions times,
+        # but only the last repetitions executions are measured
+        try:
+            self.repetitions = int(rootTag.get("repetitions", 1))
+            self.warmup = int(rootTag.get("warmup", 0))
+        except ValueError as e:
+            sys.exit(
+                "Invalid number of repetitions or warm-up executions: {}".format(e)
+            )
+        if self.repetitions < 1:
+            sys.exit("At least one repetition of each run must be given.")
+        if self.warmup < 0:
+            sys.exit("Number of warm-up executions must not be negative.")
+
         # get global options and property file
         self.options = util.get_list_from_xml(rootTag)
         self.propertytag = get_propertytag(rootTag)
@@ -403,10 +576,13 @@ class Benchmark(object):
             )
         globalSourcefilesTags = rootTag.findall("tasks")
 
+        # cache for file-system accesses during the creation of all runs
+        self.file_system_cache = FileSystemCache()
+
         # get required files
         self._required_files = set()
         for required_files_tag in rootTag.findall("requiredfiles"):
-            required_files = util.expand_filename_pattern(
+            required_files = self.file_system_cache.expand_filename_pattern(
                 required_files_tag.text, self.base_dir
             )
             if not required_files:
@@ -435,6 +611,9 @@ class Benchmark(object):
             # default is "everything below current directory"
             self.result_files_patterns = ["."]
 
+        # parsed task-definition files, shared by all run sets
+        self.task_definitions = TaskDefinitionCache()
+
         # get benchmarks
         self.run_sets = []
         for (i, rundefinitionTag) in enumerate(rootTag.findall("rundefinition")):
@@ -442,6 +621,22 @@ class Benchmark(object):
                 RunSet(rundefinitionTag, self, i + 1, globalSourcefilesTags)
             )
 
+        # the machine needs enough cores for the run set with the highest limit
+        core_limits = [
+            run_set.rlimits.cpu_cores
+            for run_set in self.run_sets
+            if run_set.should_be_executed() and run_set.rlimits.cpu_cores
+        ]
+        if core_limits and max(core_limits) > (self.requirements.cpu_cores or 0):
+            self.requirements.cpu_cores = max(core_limits)
+
+        if not getattr(config, "lazy_run_creation", False):
+            # with lazy run creation, this is logged after runs are created
+            logging.debug(
+                "File-system accesses while loading benchmark: %s",
+                self.file_system_cache,
+            )
+
         if not self.run_sets:
             logging.warning(
                 "Benchmark file %s specifies no runs to execute "
@@ -538,6 +733,24 @@ class RunSet(object):
 
         # get all run-set-specific options from rundefinitionTag
         self.options = benchmark.options + util.get_list_from_xml(rundefinitionTag)
+
+        # run sets may use a different number of CPU cores than the benchmark,
+        # but a limit given on the command line overrides all limits in the XML file
+        self.rlimits = benchmark.rlimits
+        cpu_cores = rundefinitionTag.get(CORELIMIT)
+        if cpu_cores is not None and benchmark.config.corelimit is None:
+            try:
+                cpu_cores = int(cpu_cores)
+            except ValueError:
+                cpu_cores = 0
+            if cpu_cores <= 0:
+                sys.exit(
+                    'Core limit "{}" of run definition {} is invalid, '
+                    "it needs to be a positive number.".format(
+                        rundefinitionTag.get(CORELIMIT), self.real_name
+                    )
+                )
+            self.rlimits = self.rlimits._replace(cpu_cores=cpu_cores)
         self.propertytag = get_propertytag(rundefinitionTag)
         if self.propertytag is None:
             self.propertytag = benchmark.propertytag
@@ -553,11 +766,16 @@ class RunSet(object):
                 "Benchmark file {} has unsupported old format. "
                 "Rename <sourcefiles> tags to <tasks>.".format(benchmark.benchmark_file)
             )
+        # Runs are created by create_runs(), either immediately or later on demand.
+        self.runs = []
+        self.task_identifiers = []
+        self._run_creators = []
+        self._pending_task_count = 0
+        self._identifier_basenames = set()
         self.blocks = self.extract_runs_from_xml(
             globalSourcefilesTags + rundefinitionTag.findall("tasks"),
             required_files_pattern,
         )
-        self.runs = [run for block in self.blocks for run in block.runs]
 
         names = [self.real_name]
         if len(self.blocks) == 1:
@@ -566,6 +784,51 @@ class RunSet(object):
         self.name = ".".join(filter(None, names))
         self.full_name = self.benchmark.name + (("." + self.name) if self.name else "")
 
+        if not getattr(benchmark.config, "lazy_run_creation", False):
+            for _run in self.create_runs():
+                pass
+
+    def should_be_executed(self):
+        return not self.benchmark.config.selected_run_definitions or any(
+            util.wildcard_match(self.real_name, run_definition)
+            for run_definition in self.benchmark.config.selected_run_definitions
+        )
+
+    def run_count(self):
+        """
+        Return the number of runs of this run set.
+        As long as not all runs are created, this is only an upper bound that is cheap
+        to compute because it does not consider filtering of tasks based on their
+        properties and expected verdicts.
+        """
+        return len(self.runs) + self._pending_task_count
+
+    def create_runs(self):
+        """
+        Create all runs of this run set that do not exist yet,
+        add them to self.runs and to their SourcefileSet,
+        and return an iterator over the newly created runs.
+        The runs are created on demand while the iterator is consumed.
+        """
+        if not self._run_creators:
+            return
+        while self._run_creators:
+            block, run_creator = self._run_creators[0]
+            for run in run_creator:
+                self._check_identifier_basename(run)
+                block.runs.append(run)
+                self.runs.append(run)
+                yield run
+            self._run_creators.pop(0)
+
+        if getattr(self.benchmark.config, "lazy_run_creation", False):
+            logging.debug(
+                "File-system accesses while creating runs of %s: %s",
+                self.full_name,
+                self.benchmark.file_system_cache,
+            )
+
+    def _check_identifier_basename(self, run):
         # Currently we store logfiles as "basename.log",
         # so we cannot distinguish sourcefiles in different folder with same basename.
         # For a 'local benchmark' this causes overriding of logfiles after reading them,
@@ -573,29 +836,21 @@ class RunSet(object):
         # For 'cloud-mode' the logfile is overridden before reading it,
         # so the result will be wrong and every measured value will be missing.
         if self.should_be_executed():
-            sourcefilesSet = set()
-            for run in self.runs:
-                base = os.path.basename(run.identifier)
-                if base in sourcefilesSet:
-                    logging.warning(
-                        "Input file with name '%s' appears twice in runset. "
-                        "This could cause problems with equal logfile-names.",
-                        base,
-                    )
-                else:
-                    sourcefilesSet.add(base)
-            del sourcefilesSet
-
-    def should_be_executed(self):
-        return not self.benchmark.config.selected_run_definitions or any(
-            util.wildcard_match(self.real_name, run_definition)
-            for run_definition in self.benchmark.config.selected_run_definitions
-        )
+            base = os.path.basename(run.identifier)
+            if base in self._identifier_basenames:
+                logging.warning(
+                    "Input file with name '%s' appears twice in runset. "
+                    "This could cause problems with equal logfile-names.",
+                    base,
+                )
+            else:
+                self._identifier_basenames.add(base)
 
     def extract_runs_from_xml(self, sourcefilesTagList, global_required_files_pattern):
         """
         This function builds a list of SourcefileSets (containing filename with options).
         The files and their options are taken from the list of sourcefilesTags.
+        The SourcefileSets are returned without runs, these are added by create_runs().
         """
         base_dir = self.benchmark.base_dir
         # runs are structured as sourcefile sets, one set represents one sourcefiles tag
@@ -616,55 +871,24 @@ class RunSet(object):
 
             # get lists of filenames
             task_def_files = self.get_task_def_files_from_xml(sourcefilesTag, base_dir)
-
-            # get file-specific options for filenames
-            fileOptions = util.get_list_from_xml(sourcefilesTag)
-            local_propertytag = get_propertytag(sourcefilesTag)
-
-            # some runs need more than one sourcefile,
-            # the first sourcefile is a normal 'include'-file, we use its name as identifier
-            # for logfile and result-category all other files are 'append'ed.
-            appendFileTags = sourcefilesTag.findall("append")
-
-            currentRuns = []
-            for identifier in task_def_files:
-                if identifier.endswith(".yml"):
-                    if appendFileTags:
-                        raise BenchExecException(
-                            "Cannot combine <append> and task-definition files in the same <tasks> tag."
-                        )
-                    run = self.create_run_from_task_definition(
-                        identifier,
-                        fileOptions,
-                        local_propertytag,
+            without_files = [tag.text for tag in sourcefilesTag.findall("withoutfile")]
+
+            block = SourcefileSet(sourcefileSetName, index, [])
+            blocks.append(block)
+            self.task_identifiers += task_def_files
+            self.task_identifiers += without_files
+            self._pending_task_count += len(task_def_files) + len(without_files)
+            self._run_creators.append(
+                (
+                    block,
+                    self._create_runs_of_block(
+                        sourcefilesTag,
+                        task_def_files,
+                        without_files,
                         required_files_pattern,
-                    )
-                else:
-                    run = self.create_run_for_input_file(
-                        identifier,
-                        fileOptions,
-                        local_propertytag,
-                        required_files_pattern,
-                        appendFileTags,
-                    )
-                if run:
-                    currentRuns.append(run)
-
-            # add runs for cases without source files
-            for run in sourcefilesTag.findall("withoutfile"):
-                currentRuns.append(
-                    Run(
-                        run.text,
-                        [],
-                        None,
-                        fileOptions,
-                        self,
-                        local_propertytag,
-                        required_files_pattern,
-                    )
+                    ),
                 )
-
-            blocks.append(SourcefileSet(sourcefileSetName, index, currentRuns))
+            )
 
         if self.benchmark.config.selected_sourcefile_sets:
             for selected in self.benchmark.config.selected_sourcefile_sets:
@@ -679,6 +903,60 @@ class RunSet(object):
                     )
         return blocks
 
+    def _create_runs_of_block(
+        self, sourcefilesTag, task_def_files, without_files, required_files_pattern
+    ):
+        """Generator for the runs of the given <tasks> tag."""
+        self.benchmark.task_definitions.preload(
+            f for f in task_def_files if f.endswith(".yml")
+        )
+
+        # get file-specific options for filenames
+        fileOptions = util.get_list_from_xml(sourcefilesTag)
+        local_propertytag = get_propertytag(sourcefilesTag)
+
+        # some runs need more than one sourcefile,
+        # the first sourcefile is a normal 'include'-file, we use its name as identifier
+        # for logfile and result-category all other files are 'append'ed.
+        appendFileTags = sourcefilesTag.findall("append")
+
+        for identifier in task_def_files:
+            if identifier.endswith(".yml"):
+                if appendFileTags:
+                    raise BenchExecException(
+                        "Cannot combine <append> and task-definition files in the same <tasks> tag."
+                    )
+                run = self.create_run_from_task_definition(
+                    identifier,
+                    fileOptions,
+                    local_propertytag,
+                    required_files_pattern,
+                )
+            else:
+                run = self.create_run_for_input_file(
+                    identifier,
+                    fileOptions,
+                    local_propertytag,
+                    required_files_pattern,
+                    appendFileTags,
+                )
+            self._pending_task_count -= 1
+            if run:
+                yield run
+
+        # add runs for cases without source files
+        for identifier in without_files:
+            self._pending_task_count -= 1
+            yield Run(
+                identifier,
+                [],
+                None,
+                fileOptions,
+                self,
+                local_propertytag,
+                required_files_pattern,
+            )
+
     def get_task_def_files_from_xml(self, sourcefilesTag, base_dir):
         """Get the task-definition files from the XML definition. Task-definition files are files
         for which we create a run (typically an input file or a YAML task definition).
@@ -687,12 +965,10 @@ class RunSet(object):
 
         def _read_set_file(filename):
             dirname = os.path.dirname(filename)
-            with open(filename, "rt") as f:
-                for line in f:
-                    line = line.strip()  # necessary to remove line separator
-                    # ignore comments and empty lines
-                    if not util.is_comment(line):
-                        yield from self.expand_filename_pattern(line, dirname)
+            for line in self.benchmark.file_system_cache.read_lines(filename):
+                # ignore comments and empty lines
+                if not util.is_comment(line):
+                    yield from self.expand_filename_pattern(line, dirname)
 
         # get included sourcefiles
         for includedFiles in sourcefilesTag.findall("include"):
@@ -787,10 +1063,11 @@ class RunSet(object):
         self, task_def_file, options, local_propertytag, required_files_pattern
     ):
         """Create a Run from a task definition in yaml format"""
-        task_def = load_task_definition_file(task_def_file)
+        task_def = self.benchmark.task_definitions.get(task_def_file)
 
+        file_system_cache = self.benchmark.file_system_cache
         input_files = handle_files_from_task_definition(
-            task_def.get("input_files"), task_def_file
+            task_def.get("input_files"), task_def_file, file_system_cache
         )
         if not input_files:
             raise BenchExecException(
@@ -799,7 +1076,7 @@ class RunSet(object):
                 )
             )
         required_files = handle_files_from_task_definition(
-            task_def.get("required_files"), task_def_file
+            task_def.get("required_files"), task_def_file, file_system_cache
         )
 
         run = Run(
@@ -829,7 +1106,7 @@ class RunSet(object):
                         task_def_file
                     )
                 )
-            expanded = util.expand_filename_pattern(
+            expanded = file_system_cache.expand_filename_pattern(
                 prop_dict["property_file"], os.path.dirname(task_def_file)
             )
             if len(expanded) != 1:
@@ -839,9 +1116,7 @@ class RunSet(object):
                     )
                 )
 
-            # TODO We could reduce I/O by checking absolute paths and using os.path.samestat
-            # with cached stat calls.
-            if prop.filename == expanded[0] or os.path.samefile(
+            if prop.filename == expanded[0] or file_system_cache.samefile(
                 prop.filename, expanded[0]
             ):
                 expected_result = prop_dict.get("expected_verdict")
@@ -913,7 +1188,9 @@ class RunSet(object):
                 "Expanded variables in expression %r to %r.", pattern, expandedPattern
             )
 
-        fileList = util.expand_filename_pattern(expandedPattern, base_dir)
+        fileList = self.benchmark.file_system_cache.expand_filename_pattern(
+            expandedPattern, base_dir
+        )
 
         # sort alphabetical,
         fileList.sort()
@@ -943,6 +1220,30 @@ class Run(object):
     A Run contains some sourcefile, some options, propertyfiles and some other stuff, that is needed for the Run.
     """
 
+    # reduce per-instance memory consumption, benchmarks can have many runs
+    __slots__ = (
+        "identifier",
+        "sourcefiles",
+        "task_options",
+        "runSet",
+        "specific_options",
+        "expected_results",
+        "required_files",
+        "options",
+        "propertytag",
+        "propertyfile",
+        "properties",
+        "columns",
+        "values",
+        "status",
+        "category",
+        "samples",
+        "_cmdline",
+        # set by OutputHandler
+        "resultline",
+        "xml",
+    )
+
     def __init__(
         self,
         identifier,
@@ -962,10 +1263,6 @@ class Run(object):
         self.task_options = task_options
         self.runSet = runSet
         self.specific_options = fileOptions  # options that are specific for this run
-        self.log_file = runSet.log_folder + os.path.basename(self.identifier) + ".log"
-        self.result_files_folder = os.path.join(
-            runSet.result_files_folder, os.path.basename(self.identifier)
-        )
         self.expected_results = expected_results or {}  # filled externally
 
         self.required_files = set(required_files)
@@ -993,7 +1290,7 @@ class Run(object):
             local_propertytag if local_propertytag is not None else runSet.propertytag
         )
         self.propertyfile = util.text_or_none(self.propertytag)
-        self.properties = []  # filled externally
+        self.properties = ()  # filled externally
 
         def log_property_file_once(msg):
             if self.propertyfile not in _logged_missing_property_files:
@@ -1008,8 +1305,9 @@ class Run(object):
         else:
             # we check two cases: direct filename or user-defined substitution, one of them must be a 'file'
             # TODO: do we need the second case? it is equal to previous used option "-spec ${inputfile_path}/ALL.prp"
-            expandedPropertyFiles = util.expand_filename_pattern(
-                self.propertyfile, self.runSet.benchmark.base_dir
+            file_system_cache = runSet.benchmark.file_system_cache
+            expandedPropertyFiles = file_system_cache.expand_filename_pattern(
+                self.propertyfile, runSet.benchmark.base_dir
             )
             substitutedPropertyfiles = substitute_vars(
                 [self.propertyfile], runSet, self.identifier
@@ -1024,7 +1322,7 @@ class Run(object):
                         )
                     )
                 self.propertyfile = expandedPropertyFiles[0]
-            elif substitutedPropertyfiles and os.path.isfile(
+            elif substitutedPropertyfiles and file_system_cache.isfile(
                 substitutedPropertyfiles[0]
             ):
                 self.propertyfile = substitutedPropertyfiles[0]
@@ -1041,21 +1339,51 @@ class Run(object):
 
         self.required_files = list(self.required_files)
 
-        # Copy columns for having own objects in run
-        # (we need this for storing the results in them).
-        self.columns = [
-            Column(c.text, c.title, c.number_of_digits)
-            for c in self.runSet.benchmark.columns
-        ]
+        # All runs share the columns of the benchmark until they have a result,
+        # set_result() creates own Column objects for storing the values.
+        self.columns = self.runSet.benchmark.columns
 
         # here we store the optional result values, e.g. memory usage, energy, host name
         # keys need to be strings, if first character is "@" the value is marked as hidden (e.g., debug info)
         self.values = {}
 
+        # values of each repetition if the run is executed repeatedly
+        self.samples = []
+
         # dummy values, for output in case of interrupt
         self.status = ""
         self.category = result.CATEGORY_UNKNOWN
 
+    @property
+    def log_file(self):
+        return self.runSet.log_folder + os.path.basename(self.identifier) + ".log"
+
+    @property
+    def time_series_file(self):
+        """The file with the resource usage of the run over time (if recorded)."""
+        return self.log_file[: -len(".log")] + ".timeseries.csv"
+
+    def execution_log_file(self, execution):
+        """
+        Return the log file for one execution of this run if it is executed repeatedly.
+        The first measured repetition uses the regular log file.
+        @param execution: the index of the execution, starting with the warm-up ones
+        """
+        repetition = execution - self.runSet.benchmark.warmup
+        if not repetition:
+            return self.log_file
+        elif repetition < 0:
+            suffix = ".warmup{}.log".format(execution + 1)
+        else:
+            suffix = ".repetition{}.log".format(repetition + 1)
+        return self.log_file[: -len(".log")] + suffix
+
+    @property
+    def result_files_folder(self):
+        return os.path.join(
+            self.runSet.result_files_folder, os.path.basename(self.identifier)
+        )
+
     def cmdline(self):
         assert (
             self.runSet.benchmark.executable is not None
@@ -1068,7 +1396,7 @@ class Run(object):
             self.identifier,
             self.propertyfile,
             self.task_options,
-            self.runSet.benchmark.rlimits,
+            self.runSet.rlimits,
         )
         return self._cmdline
 
@@ -1113,18 +1441,63 @@ class Run(object):
             output = []
         output = tooladapter.CURRENT_BASETOOL.RunOutput(output)
 
-        self.status = self._analyze_result(exitcode, output, termination_reason)
+        status = self._analyze_result(exitcode, output, termination_reason)
+        # there are only few different status values, so share equal strings
+        self.status = sys.intern(status) if isinstance(status, str) else status
         self.category = result.get_result_category(
             self.expected_results, self.status, self.properties
         )
 
-        for column in self.columns:
+        self.columns = []
+        for benchmark_column in self.runSet.benchmark.columns:
+            column = Column(
+                benchmark_column.text,
+                benchmark_column.title,
+                benchmark_column.number_of_digits,
+            )
             substitutedColumnText = substitute_vars(
                 [column.text], self.runSet, self.sourcefiles[0]
             )[0]
             column.value = self.runSet.benchmark.tool.get_value_from_output(
                 output, substitutedColumnText
             )
+            self.columns.append(column)
+
+    def set_repetition_results(self, results):
+        """
+        Store the values of all repetitions of a run that was executed repeatedly
+        and compute statistics over them.
+        @param results: a list with the result of each repetition,
+            as returned by RunExecutor.execute_run()
+        @return: a dict with median, minimum, maximum, and standard deviation
+            of each measure (with keys like "cputime" and "cputime-stdev")
+        """
+        self.samples = []
+        for values in results:
+            sample = {key: values[key] for key in SAMPLE_VALUES if key in values}
+            exitcode = values.get("exitcode")
+            if exitcode is not None:
+                if exitcode.signal:
+                    sample["exitsignal"] = exitcode.signal
+                else:
+                    sample["returnvalue"] = exitcode.value
+            self.samples.append(sample)
+
+        statistic_values = {}
+        for measure in REPETITION_MEASURES:
+            measured = [
+                sample[measure]
+                for sample in self.samples
+                if sample.get(measure) is not None
+            ]
+            if not measured:
+                continue
+            statistic_values[measure] = statistics.median(measured)
+            statistic_values[measure + "-min"] = min(measured)
+            statistic_values[measure + "-max"] = max(measured)
+            if len(measured) > 1:
+                statistic_values[measure + "-stdev"] = statistics.stdev(measured)
+        return statistic_values
 
     def _analyze_result(self, exitcode, output, termination_reason):
         """Return status according to result and output of tool."""
@@ -1198,6 +1571,8 @@ class Column(object):
     The class Column contains text, title and number_of_digits of a column.
     """
 
+    __slots__ = ("text", "title", "number_of_digits", "value")
+
     def __init__(self, text, title, numOfDigits):
         self.text = text
         self.title = title
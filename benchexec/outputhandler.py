@@ -5,7 +5,6 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import bz2
 import collections
 import datetime
 import io
@@ -78,6 +77,13 @@ class OutputHandler(object):
         self.all_created_files = set()
         self.benchmark = benchmark
         self.statistics = Statistics()
+        self.overhead_calibration = {}
+        # Start and result of a run can be printed on the same line only if no other
+        # run is executed in between (which happens for interleaved repetitions).
+        self.print_run_on_one_line = (
+            benchmark.num_of_threads == 1
+            and benchmark.warmup + benchmark.repetitions == 1
+        )
 
         version = self.benchmark.tool_version
 
@@ -164,6 +170,28 @@ class OutputHandler(object):
             else:
                 runSet.xml.insert(i, systemInfo)
 
+    def store_cpu_frequency_pinning(self, governor, frequency=None):
+        """
+        Store in the XML that the frequency of the CPU cores was pinned.
+        This needs to be called before the first run set is started.
+        @param governor: the cpufreq governor of the cores
+        @param frequency: None or the fixed frequency of the cores in Hz
+        """
+        for cpuElem in self.xml_header.iter("cpu"):
+            cpuElem.set("governor", governor)
+            if frequency is not None:
+                cpuElem.set("pinnedFrequency", str(frequency) + "Hz")
+            if cpuElem.get("turboboostActive") is not None:
+                cpuElem.set("turboboostActive", "false")
+
+    def store_overhead_calibration(self, values):
+        """
+        Store the distribution of the overhead measured by calibration runs,
+        which is added to the XML of each run set.
+        @param values: a dict as returned by OverheadCalibration.summary()
+        """
+        self.overhead_calibration = values
+
     def set_error(self, msg, runSet=None):
         """
         Mark the benchmark as erroneous, e.g., because the benchmarking tool crashed.
@@ -195,6 +223,9 @@ class OutputHandler(object):
             self.xml_header.set(TIMELIMIT, timelimit)
         if corelimit is not None:
             self.xml_header.set(CORELIMIT, corelimit)
+        if self.benchmark.repetitions > 1 or self.benchmark.warmup:
+            self.xml_header.set("repetitions", str(self.benchmark.repetitions))
+            self.xml_header.set("warmup", str(self.benchmark.warmup))
 
         if self.benchmark.description:
             description_tag = ElementTree.Element("description")
@@ -316,7 +347,10 @@ class OutputHandler(object):
         """
         xml_file_name = self.get_filename(runSet.name, "xml")
 
-        identifier_names = [run.identifier for run in runSet.runs]
+        # If runs are created lazily, we use the identifiers of all tasks instead.
+        identifier_names = [
+            run.identifier for run in runSet.runs
+        ] or runSet.task_identifiers
 
         # common prefix of file names
         runSet.common_prefix = util.common_base_dir(identifier_names)
@@ -332,7 +366,7 @@ class OutputHandler(object):
         )
 
         # write run set name to terminal
-        numberOfFiles = len(runSet.runs)
+        numberOfFiles = runSet.run_count()
         numberOfFilesStr = (
             "     (1 file)"
             if numberOfFiles == 1
@@ -350,35 +384,7 @@ class OutputHandler(object):
 
         # prepare information for text output
         for run in runSet.runs:
-            run.resultline = self.format_sourcefile_name(run.identifier, runSet)
-
-            if run.sourcefiles:
-                adjusted_identifier = util.relative_path(run.identifier, xml_file_name)
-            else:
-                # If no source files exist the task doesn't point to any file that could be downloaded.
-                # In this case, the name doesn't have to be adjusted because it's no path.
-                adjusted_identifier = run.identifier
-
-            # prepare XML structure for each run and runSet
-            run.xml = ElementTree.Element("run", name=adjusted_identifier)
-            if run.sourcefiles:
-                adjusted_sourcefiles = (
-                    util.relative_path(s, xml_file_name) for s in run.sourcefiles
-                )
-                run.xml.set("files", "[" + ", ".join(adjusted_sourcefiles) + "]")
-            if run.specific_options:
-                run.xml.set("options", " ".join(run.specific_options))
-            if run.properties:
-                all_properties = (prop.name for prop in run.properties)
-                run.xml.set("properties", " ".join(sorted(all_properties)))
-            if len(run.properties) == 1:
-                prop = run.properties[0]
-                run.xml.set(
-                    "propertyFile", util.relative_path(prop.filename, xml_file_name)
-                )
-                expected_result = str(run.expected_results.get(prop.filename, ""))
-                if expected_result:
-                    run.xml.set("expectedVerdict", expected_result)
+            self._prepare_run(run, xml_file_name)
 
         block_name = runSet.blocks[0].name if len(runSet.blocks) == 1 else None
         runSet.xml = self.runs_to_xml(runSet, runSet.runs, block_name)
@@ -394,6 +400,49 @@ class OutputHandler(object):
         self.all_created_files.add(runSet.xml_file_name)
         self.xml_file_names.append(runSet.xml_file_name)
 
+    def output_for_created_run(self, run):
+        """
+        The method output_for_created_run() needs to be called for every run
+        that is created lazily after output_before_run_set() was called for its run set,
+        and in the order in which the runs should appear in the result files.
+        @param run: a Run object
+        """
+        self._prepare_run(run, run.runSet.xml_file_name)
+        with OutputHandler.print_lock:
+            # lock because the XML might be written concurrently in output_after_run
+            run.runSet.xml.append(run.xml)
+
+    def _prepare_run(self, run, xml_file_name):
+        run.resultline = self.format_sourcefile_name(run.identifier, run.runSet)
+
+        if run.sourcefiles:
+            adjusted_identifier = util.relative_path(run.identifier, xml_file_name)
+        else:
+            # If no source files exist the task doesn't point to any file that could be downloaded.
+            # In this case, the name doesn't have to be adjusted because it's no path.
+            adjusted_identifier = run.identifier
+
+        # prepare XML structure for each run and runSet
+        run.xml = ElementTree.Element("run", name=adjusted_identifier)
+        if run.sourcefiles:
+            adjusted_sourcefiles = (
+                util.relative_path(s, xml_file_name) for s in run.sourcefiles
+            )
+            run.xml.set("files", "[" + ", ".join(adjusted_sourcefiles) + "]")
+        if run.specific_options:
+            run.xml.set("options", " ".join(run.specific_options))
+        if run.properties:
+            all_properties = (prop.name for prop in run.properties)
+            run.xml.set("properties", " ".join(sorted(all_properties)))
+        if len(run.properties) == 1:
+            prop = run.properties[0]
+            run.xml.set(
+                "propertyFile", util.relative_path(prop.filename, xml_file_name)
+            )
+            expected_result = str(run.expected_results.get(prop.filename, ""))
+            if expected_result:
+                run.xml.set("expectedVerdict", expected_result)
+
     def output_for_skipping_run_set(self, runSet, reason=None):
         """
         This function writes a simple message to terminal and logfile,
@@ -470,10 +519,10 @@ class OutputHandler(object):
 
             timeStr = time.strftime("%H:%M:%S", time.localtime()) + "   "
             progressIndicator = " ({0}/{1})".format(
-                runSet.started_runs, len(runSet.runs)
+                runSet.started_runs, runSet.run_count()
             )
             terminalTitle = TERMINAL_TITLE.format(runSet.full_name + progressIndicator)
-            if self.benchmark.num_of_threads == 1:
+            if self.print_run_on_one_line:
                 util.printOut(
                     terminalTitle
                     + timeStr
@@ -535,7 +584,7 @@ class OutputHandler(object):
             OutputHandler.print_lock.acquire()
 
             valueStr = statusStr + cputime_str.rjust(8) + walltime_str.rjust(8)
-            if self.benchmark.num_of_threads == 1:
+            if self.print_run_on_one_line:
                 util.printOut(valueStr)
             else:
                 timeStr = time.strftime("%H:%M:%S", time.localtime()) + " " * 14
@@ -561,15 +610,19 @@ class OutputHandler(object):
         finally:
             OutputHandler.print_lock.release()
 
-        if self.compress_results:
-            log_file_path = os.path.relpath(
-                run.log_file, os.path.join(self.benchmark.log_folder, os.pardir)
-            )
-            with self.log_zip_lock:
-                self.log_zip.write(run.log_file, log_file_path)
-            os.remove(run.log_file)
-        else:
-            self.all_created_files.add(run.log_file)
+        log_files = [run.log_file]
+        if os.path.exists(run.time_series_file):
+            log_files.append(run.time_series_file)
+        for log_file in log_files:
+            if self.compress_results:
+                log_file_path = os.path.relpath(
+                    log_file, os.path.join(self.benchmark.log_folder, os.pardir)
+                )
+                with self.log_zip_lock:
+                    self.log_zip.write(log_file, log_file_path)
+                os.remove(log_file)
+            else:
+                self.all_created_files.add(log_file)
 
         if os.path.isdir(run.result_files_folder):
             self.all_created_files.add(run.result_files_folder)
@@ -646,6 +699,8 @@ class OutputHandler(object):
             )
         elif runSet.real_name:
             runsElem.set("name", runSet.real_name)
+        if runSet.rlimits.cpu_cores != self.benchmark.rlimits.cpu_cores:
+            runsElem.set(CORELIMIT, str(runSet.rlimits.cpu_cores))
 
         # collect XMLelements from all runs
         for run in runs:
@@ -672,6 +727,13 @@ class OutputHandler(object):
             runElem, key=lambda elem: (elem.get("hidden", ""), elem.get("title"))
         )
 
+        # raw values of each repetition if the run was executed repeatedly
+        for repetition, sample in enumerate(run.samples, start=1):
+            sampleElem = ElementTree.Element("sample", repetition=str(repetition))
+            for key in sorted(sample):
+                self.add_column_to_xml(sampleElem, key, sample[key])
+            runElem.append(sampleElem)
+
     def add_values_to_run_set_xml(self, runSet, cputime, walltime, energy, cache):
         """
         This function adds the result values to the XML representation of a runSet.
@@ -683,6 +745,8 @@ class OutputHandler(object):
             self.add_column_to_xml(runSet.xml, energy_key, energy_value)
         for cache_key, cache_value in cache.items():
             self.add_column_to_xml(runSet.xml, cache_key, cache_value)
+        for key, value in self.overhead_calibration.items():
+            self.add_column_to_xml(runSet.xml, key, value)
 
     def add_column_to_xml(self, xml, title, value, prefix="", value_suffix=""):
         if value is None:
@@ -869,7 +933,8 @@ class OutputHandler(object):
         """Writes a nicely formatted XML file with DOCTYPE, and compressed if necessary."""
         if self.compress_results:
             actual_filename = filename + ".bz2"
-            open_func = bz2.BZ2File
+            # several bzip2 streams allow table-generator to decompress in parallel
+            open_func = util.BZ2MultiStreamWriter
         else:
             # write content to temp file first to prevent losing data
             # in existing file if writing fails
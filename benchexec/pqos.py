@@ -14,6 +14,9 @@ import os
 import logging
 import json
 import grp
+import itertools
+import sys
+import threading
 from signal import SIGINT
 from subprocess import check_output, CalledProcessError, STDOUT, Popen, PIPE
 from benchexec.util import find_executable2, get_capability, check_msr
@@ -233,3 +236,99 @@ class Pqos(object):
                 )
         else:
             logging.warning("Load msr module for using cache allocation/monitoring")
+
+
+class MonitoringService(object):
+    """
+    Monitoring of cache and memory-bandwidth usage for several groups of cores
+    with a single long-running helper process (cf. benchexec.pqos_monitor),
+    which avoids starting pqos_wrapper processes for each run.
+    Instances can be used from several threads.
+    """
+
+    def __init__(self, show_warnings=False, helper_args=None):
+        """
+        @param helper_args: additional command-line arguments for the helper process
+        """
+        self.show_warnings = show_warnings
+        self.helper_args = helper_args or []
+        self.process = None
+        self._lock = threading.Lock()
+        self._group_ids = itertools.count()
+
+    def start(self):
+        """
+        Start the helper process.
+        @return: whether monitoring is available
+        """
+        cmdline = [sys.executable, "-m", "benchexec.pqos_monitor"] + self.helper_args
+        try:
+            self.process = Popen(
+                cmdline, stdin=PIPE, stdout=PIPE, universal_newlines=True
+            )
+        except OSError as e:
+            logging.debug("Could not start cache-monitoring helper: %s", e)
+            return False
+        response = self._receive()
+        if not response.get("ready"):
+            logging.debug(
+                "Cache monitoring with resctrl not available: %s",
+                response.get("error"),
+            )
+            self.close()
+            return False
+        return True
+
+    def _receive(self):
+        line = self.process.stdout.readline()
+        if not line:
+            return {"error": "cache-monitoring helper terminated unexpectedly"}
+        return json.loads(line)
+
+    def _request(self, request):
+        with self._lock:
+            if not self.process:
+                return {"error": "cache-monitoring helper not running"}
+            try:
+                self.process.stdin.write(json.dumps(request) + "\n")
+                self.process.stdin.flush()
+                return self._receive()
+            except (OSError, ValueError) as e:
+                return {"error": str(e)}
+
+    def start_group(self, cores):
+        """
+        Start monitoring the given cores.
+        @return: an identifier for the group that is to be passed to stop_group(),
+            or None if monitoring failed
+        """
+        group = str(next(self._group_ids))
+        response = self._request(
+            {"command": "start", "group": group, "cores": list(cores)}
+        )
+        if "error" in response:
+            if self.show_warnings:
+                logging.warning("Could not monitor events...%s", response["error"])
+            return None
+        return group
+
+    def stop_group(self, group):
+        """
+        Stop monitoring a group of cores.
+        @return: a flat dictionary with the monitoring data like Pqos.stop_monitoring()
+        """
+        response = self._request({"command": "stop", "group": group})
+        if "error" in response:
+            if self.show_warnings:
+                logging.warning("Could not monitor events...%s", response["error"])
+            return {}
+        return Pqos.flatten_mon_data(response["monitoring_data"])
+
+    def close(self):
+        """Stop the helper process, which removes all remaining monitoring groups."""
+        with self._lock:
+            if self.process:
+                self.process.stdin.close()
+                self.process.wait()
+                self.process.stdout.close()
+                self.process = None
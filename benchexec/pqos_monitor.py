@@ -0,0 +1,254 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Long-running helper process for monitoring L3 cache occupancy and memory bandwidth
+of groups of CPU cores with Intel RDT, using the resctrl file system of Linux.
+It is started once per benchmark (cf. benchexec.pqos.MonitoringService)
+and receives commands as JSON objects (one per line) on stdin:
+
+    {"command": "start", "group": "<name>", "cores": [<core>, ...]}
+    {"command": "stop", "group": "<name>"}
+
+Each command is answered with one JSON object on stdout,
+for "stop" this contains the monitoring data in the same structure as for
+pqos_wrapper, but with different keys because the units differ
+(cf. compute_monitoring_data()).
+After startup, the helper writes {"ready": true} or {"error": "<message>"}.
+The helper stops when stdin is closed.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+
+RESCTRL_DIR = "/sys/fs/resctrl"
+
+# Events of resctrl and the keys for their values in the monitoring data.
+# These keys intentionally differ from those of pqos_wrapper ("llc", "mbm_local"),
+# such that values of both sources cannot be mixed up in result files.
+_OCCUPANCY_EVENTS = {"llc_occupancy": "llc_occupancy"}
+_BANDWIDTH_EVENTS = {
+    "mbm_local_bytes": "mbm_local_bandwidth",
+    "mbm_total_bytes": "mbm_total_bandwidth",
+}
+
+_GROUP_PREFIX = "benchexec_"
+
+
+class ResctrlMonitor(object):
+    """Access to monitoring groups of the resctrl file system."""
+
+    def __init__(self, resctrl_dir=RESCTRL_DIR):
+        self.resctrl_dir = resctrl_dir
+
+    def check_support(self):
+        """Return None if monitoring is supported, an error message otherwise."""
+        if not os.path.isdir(os.path.join(self.resctrl_dir, "info", "L3_MON")):
+            return "resctrl file system with L3 monitoring not mounted at {}".format(
+                self.resctrl_dir
+            )
+        if not os.access(os.path.join(self.resctrl_dir, "mon_groups"), os.W_OK):
+            return "no permission for creating monitoring groups in {}".format(
+                self.resctrl_dir
+            )
+        return None
+
+    def _group_dir(self, group):
+        return os.path.join(self.resctrl_dir, "mon_groups", _GROUP_PREFIX + group)
+
+    def create_group(self, group, cores):
+        group_dir = self._group_dir(group)
+        os.makedirs(group_dir, exist_ok=True)
+        with open(os.path.join(group_dir, "cpus_list"), "w") as f:
+            f.write(",".join(str(core) for core in cores))
+
+    def read_group(self, group):
+        """Return the current values of all events of the group, summed over all L3 domains."""
+        values = {}
+        for domain_dir in glob.glob(
+            os.path.join(self._group_dir(group), "mon_data", "mon_L3_*")
+        ):
+            for event in list(_OCCUPANCY_EVENTS) + list(_BANDWIDTH_EVENTS):
+                try:
+                    with open(os.path.join(domain_dir, event)) as f:
+                        value = int(f.read())
+                except (OSError, ValueError):
+                    continue  # event not supported or "Unavailable"
+                values[event] = values.get(event, 0) + value
+        return values
+
+    def remove_group(self, group):
+        os.rmdir(self._group_dir(group))
+
+
+class FakeMonitor(object):
+    """
+    Monitor with synthetic values for testing without RDT hardware:
+    each core occupies 1 MB of cache and transfers 1 MB/s to/from memory.
+    """
+
+    def __init__(self):
+        self._groups = {}
+
+    def check_support(self):
+        return None
+
+    def create_group(self, group, cores):
+        self._groups[group] = (len(cores), time.monotonic())
+
+    def read_group(self, group):
+        core_count, start = self._groups[group]
+        bandwidth_bytes = int((time.monotonic() - start) * 1000000 * core_count)
+        return {
+            "llc_occupancy": 1000000 * core_count,
+            "mbm_local_bytes": bandwidth_bytes,
+            "mbm_total_bytes": bandwidth_bytes,
+        }
+
+    def remove_group(self, group):
+        del self._groups[group]
+
+
+class _Group(object):
+    def __init__(self, cores):
+        self.cores = cores
+        self.samples = []  # list of (timestamp, event values)
+
+
+def compute_monitoring_data(cores, samples):
+    """
+    Compute average and maximum of the occupancy and bandwidth events
+    from a list of samples (timestamp, event values) of a group.
+    Occupancy is given in bytes, bandwidth in bytes per second.
+    """
+    data = {"cores": cores}
+    for event, key in _OCCUPANCY_EVENTS.items():
+        values = [values[event] for _, values in samples if event in values]
+        if values:
+            data[key] = {"avg": sum(values) // len(values), "max": max(values)}
+    for event, key in _BANDWIDTH_EVENTS.items():
+        points = [(t, values[event]) for t, values in samples if event in values]
+        rates = [
+            (value2 - value1) / (t2 - t1)
+            for (t1, value1), (t2, value2) in zip(points, points[1:])
+            if t2 > t1
+        ]
+        if rates:
+            (first_time, first_value), (last_time, last_value) = points[0], points[-1]
+            data[key] = {
+                "avg": int((last_value - first_value) / (last_time - first_time)),
+                "max": int(max(rates)),
+            }
+    return data
+
+
+class MonitoringHelper(object):
+    """Executes the commands for a monitor and samples all active groups periodically."""
+
+    def __init__(self, monitor, interval):
+        self.monitor = monitor
+        self.interval = interval
+        self.groups = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def _sample(self, name):
+        group = self.groups[name]
+        group.samples.append((time.monotonic(), self.monitor.read_group(name)))
+
+    def sample_all(self):
+        with self.lock:
+            for name in self.groups:
+                self._sample(name)
+
+    def _sample_periodically(self):
+        while not self.stopped.wait(self.interval):
+            self.sample_all()
+
+    def handle(self, request):
+        command = request.get("command")
+        name = str(request.get("group"))
+        with self.lock:
+            if command == "start":
+                cores = [int(core) for core in request["cores"]]
+                self.monitor.create_group(name, cores)
+                self.groups[name] = _Group(cores)
+                self._sample(name)
+                return {"group": name}
+            elif command == "stop":
+                if name not in self.groups:
+                    return {"error": "unknown group {}".format(name)}
+                self._sample(name)
+                group = self.groups.pop(name)
+                self.monitor.remove_group(name)
+                return {
+                    "monitoring_data": [
+                        compute_monitoring_data(group.cores, group.samples)
+                    ]
+                }
+            return {"error": "unknown command {}".format(command)}
+
+    def run(self, input_stream, output_stream):
+        def reply(response):
+            output_stream.write(json.dumps(response) + "\n")
+            output_stream.flush()
+
+        error = self.monitor.check_support()
+        if error:
+            reply({"error": error})
+            return
+        reply({"ready": True})
+
+        sampler = threading.Thread(target=self._sample_periodically, daemon=True)
+        sampler.start()
+        try:
+            for line in input_stream:
+                try:
+                    response = self.handle(json.loads(line))
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    response = {"error": str(e)}
+                reply(response)
+        finally:
+            self.stopped.set()
+            sampler.join()
+            for name in list(self.groups):
+                try:
+                    self.monitor.remove_group(name)
+                except OSError:
+                    pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resctrl-dir",
+        default=RESCTRL_DIR,
+        help="mount point of the resctrl file system",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1,
+        help="interval in seconds between two samples of the counters",
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="report synthetic values instead of monitoring (for testing)",
+    )
+    options = parser.parse_args(argv)
+    monitor = FakeMonitor() if options.fake else ResctrlMonitor(options.resctrl_dir)
+    MonitoringHelper(monitor, options.interval).run(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ This module contains functions for computing assignments of resources to runs.
 """
 
 import collections
+import copy
+import glob
 import itertools
 import logging
 import math
@@ -19,8 +21,12 @@ import sys
 from benchexec import cgroups
 from benchexec import util
 
+CORE_CLASS_PERFORMANCE = "performance"
+CORE_CLASS_EFFICIENCY = "efficiency"
+
 __all__ = [
     "check_memory_size",
+    "get_cpu_cores_for_max_runs",
     "get_cpu_cores_per_run",
     "get_memory_banks_per_run",
     "get_cpu_package_for_core",
@@ -28,7 +34,12 @@ __all__ = [
 
 
 def get_cpu_cores_per_run(
-    coreLimit, num_of_threads, use_hyperthreading, my_cgroups, coreSet=None
+    coreLimit,
+    num_of_threads,
+    use_hyperthreading,
+    my_cgroups,
+    coreSet=None,
+    core_class=None,
 ):
     """
     Calculate an assignment of the available CPU cores to a number
@@ -42,6 +53,9 @@ def get_cpu_cores_per_run(
     is lower than the number of cores per CPU
     (splitting a run over multiple CPUs provides worse performance).
     It will also try to split the runs evenly across all available CPUs.
+    Similarly, if several cores share an L3 cache (e.g., a CCX of AMD CPUs),
+    this method tries to put all cores of a run into the same L3 cache
+    and to distribute parallel runs across different L3 caches.
 
     A few theoretically-possible cases are not implemented,
     for example assigning three 10-core runs on a machine
@@ -51,15 +65,88 @@ def get_cpu_cores_per_run(
     The list of available cores is read from the cgroup file system,
     such that the assigned cores are a subset of the cores
     that the current process is allowed to use.
-    This script does currently not support situations
-    where the available cores are asymmetrically split over CPUs,
-    e.g. 3 cores on one CPU and 5 on another.
+    If the available cores are asymmetrically split over CPUs
+    (e.g. 3 cores on one CPU and 5 on another),
+    or if the CPU has cores of different performance (e.g., hybrid CPUs
+    with performance and efficiency cores), this method puts as many runs
+    as possible on cores of the same kind and CPU.
 
     @param coreLimit: the number of cores for each run
     @param num_of_threads: the number of parallel benchmark executions
     @param coreSet: the list of CPU cores identifiers provided by a user, None makes benchexec using all cores
+    @param core_class: None, or CORE_CLASS_PERFORMANCE or CORE_CLASS_EFFICIENCY
+        for using only the fastest or slowest cores of CPUs with different kinds of cores
     @return a list of lists, where each inner list contains the cores for one run
     """
+    return _get_cpu_cores_per_run0(
+        coreLimit,
+        num_of_threads,
+        use_hyperthreading,
+        *_get_cpu_topology(my_cgroups, coreSet, core_class),
+    )
+
+
+def get_cpu_cores_for_max_runs(
+    coreLimit,
+    max_num_of_threads,
+    use_hyperthreading,
+    my_cgroups,
+    coreSet=None,
+    core_class=None,
+):
+    """
+    Like get_cpu_cores_per_run(), but if not all of the parallel runs fit
+    on the available cores, compute the assignment for as many runs as possible.
+    Parameters are as for get_cpu_cores_per_run().
+    @param max_num_of_threads: the maximal number of parallel benchmark executions
+    @return a list of at most max_num_of_threads lists,
+        where each inner list contains the cores for one run
+    """
+    return _get_cpu_cores_for_max_runs0(
+        coreLimit,
+        max_num_of_threads,
+        use_hyperthreading,
+        *_get_cpu_topology(my_cgroups, coreSet, core_class),
+    )
+
+
+def _get_cpu_cores_for_max_runs0(
+    coreLimit, max_num_of_threads, use_hyperthreading, *topology
+):
+    """
+    This method does the actual work of get_cpu_cores_for_max_runs()
+    without reading the machine architecture from the file system
+    in order to be testable.
+    @param topology: the machine architecture as for _get_cpu_cores_per_run0()
+    """
+    for num_of_threads in range(max_num_of_threads, 0, -1):
+        try:
+            # _get_cpu_cores_per_run0 modifies its parameters
+            return _get_cpu_cores_per_run0(
+                coreLimit,
+                num_of_threads,
+                use_hyperthreading,
+                *copy.deepcopy(topology),
+            )
+        except SystemExit:
+            if num_of_threads == 1:
+                raise  # not even a single run fits
+            logging.debug(
+                "Cannot execute %s runs with %s cores in parallel, trying fewer runs.",
+                num_of_threads,
+                coreLimit,
+            )
+
+
+def _get_cpu_topology(my_cgroups, coreSet=None, core_class=None):
+    """
+    Read the available CPU cores and their topology from the kernel.
+    Parameters are as for get_cpu_cores_per_run().
+    @return a tuple of the list of available cores, and mappings from units
+        (CPUs or memory regions) to cores, from cores to their siblings,
+        from L3 caches to cores, and from cores to their performance classes,
+        as needed by _get_cpu_cores_per_run0()
+    """
     try:
         # read list of available CPU cores
         allCpus = util.parse_int_list(my_cgroups.get_value(cgroups.CPUSET, "cpus"))
@@ -75,6 +162,11 @@ def get_cpu_cores_per_run(
                 )
             allCpus = [core for core in allCpus if core in coreSet]
 
+        # read performance classes of cores (empty if all cores are equal)
+        class_of_core = get_core_classes(allCpus)
+        logging.debug("Performance classes of cores are %s.", class_of_core)
+        allCpus, class_of_core = _select_core_class(allCpus, class_of_core, core_class)
+
         logging.debug("List of available CPU cores is %s.", allCpus)
 
         # read mapping of core to memory region
@@ -108,6 +200,17 @@ def get_cpu_cores_per_run(
             cores_of_unit = cores_of_package
             logging.debug("Using physical packages as the basis for cpu core division")
 
+        # runs should not mix cores of different performance,
+        # so we treat the cores of each class as a separate unit
+        if class_of_core:
+            cores_of_unit = {
+                (unit, perf_class): [
+                    core for core in cores if class_of_core[core] == perf_class
+                ]
+                for unit, cores in cores_of_unit.items()
+                for perf_class in set(class_of_core[core] for core in cores)
+            }
+
         # read hyper-threading information (sibling cores sharing the same physical core)
         siblings_of_core = {}
         for core in allCpus:
@@ -120,16 +223,44 @@ def get_cpu_cores_per_run(
             )
             siblings_of_core[core] = siblings
         logging.debug("Siblings of cores are %s.", siblings_of_core)
+
+        # read L3 caches (cores sharing the same last-level cache)
+        cores_of_l3cache = collections.defaultdict(list)
+        for core in allCpus:
+            l3cache = get_l3cache_id_for_core(core)
+            if l3cache is None:
+                # If some cores do not have cache information, skip using it completely
+                cores_of_l3cache = {}
+                break
+            cores_of_l3cache[l3cache].append(core)
+        logging.debug("L3 caches of cores are %s.", cores_of_l3cache)
     except ValueError as e:
         sys.exit("Could not read CPU information from kernel: {0}".format(e))
-    return _get_cpu_cores_per_run0(
-        coreLimit,
-        num_of_threads,
-        use_hyperthreading,
-        allCpus,
-        cores_of_unit,
-        siblings_of_core,
+    return allCpus, cores_of_unit, siblings_of_core, cores_of_l3cache, class_of_core
+
+
+def _select_core_class(allCpus, class_of_core, core_class):
+    """
+    Restrict the given cores to the fastest or slowest ones as requested.
+    @param class_of_core: a mapping from cores to performance classes
+        as returned by get_core_classes()
+    @param core_class: None, or CORE_CLASS_PERFORMANCE or CORE_CLASS_EFFICIENCY
+    @return a tuple of the list of selected cores
+        and the mapping from these cores to their performance classes
+    """
+    if not core_class:
+        return allCpus, class_of_core
+    if not class_of_core:
+        logging.debug(
+            "All CPU cores have the same performance, ignoring core class %s.",
+            core_class,
+        )
+        return allCpus, class_of_core
+    selected_class = (
+        0 if core_class == CORE_CLASS_PERFORMANCE else max(class_of_core.values())
     )
+    # all selected cores have the same performance
+    return [core for core in allCpus if class_of_core[core] == selected_class], {}
 
 
 def _get_cpu_cores_per_run0(
@@ -139,6 +270,8 @@ def _get_cpu_cores_per_run0(
     allCpus,
     cores_of_unit,
     siblings_of_core,
+    cores_of_l3cache=None,
+    class_of_core=None,
 ):
     """This method does the actual work of _get_cpu_cores_per_run
     without reading the machine architecture from the file system
@@ -150,6 +283,9 @@ def _get_cpu_cores_per_run0(
     @param cores_of_unit: a mapping from logical unit (can be memory region (NUMA node) or physical package(CPU), depending on the architecture of system)
                           to lists of cores that belong to this unit
     @param siblings_of_core: a mapping from each core to a list of sibling cores including the core itself (a sibling is a core sharing the same physical core)
+    @param cores_of_l3cache: None or a mapping from L3 caches to lists of cores that share this cache
+    @param class_of_core: None or a mapping from cores to their performance classes (cf. get_core_classes()),
+                          cores of different classes need to be in different units
     """
     # First, do some checks whether this algorithm has a chance to work.
     if coreLimit > len(allCpus):
@@ -166,51 +302,10 @@ def _get_cpu_cores_per_run0(
         )
 
     if not use_hyperthreading:
-        unit_of_core = {}
-        unused_cores = []
-        for unit, cores in cores_of_unit.items():
-            for core in cores:
-                unit_of_core[core] = unit
-        for core, siblings in siblings_of_core.items():
-            if core in allCpus:
-                siblings.remove(core)
-                cores_of_unit[unit_of_core[core]] = [
-                    c for c in cores_of_unit[unit_of_core[core]] if c not in siblings
-                ]
-                siblings_of_core[core] = [core]
-                allCpus = [c for c in allCpus if c not in siblings]
-            else:
-                unused_cores.append(core)
-        for core in unused_cores:
-            siblings_of_core.pop(core)
-        logging.debug(
-            "Running in no-hyperthreading mode, avoiding the use of CPU cores {}".format(
-                unused_cores
-            )
+        allCpus = _remove_hyperthreading_siblings(
+            allCpus, cores_of_unit, siblings_of_core
         )
 
-    unit_size = None  # Number of cores per unit
-    for unit, cores in cores_of_unit.items():
-        if unit_size is None:
-            unit_size = len(cores)
-        elif unit_size != len(cores):
-            sys.exit(
-                "Asymmetric machine architecture not supported: CPU/memory region {0} has {1} cores, but other CPU/memory region has {2} cores.".format(
-                    unit, len(cores), unit_size
-                )
-            )
-
-    core_size = None  # Number of threads per core
-    for core, siblings in siblings_of_core.items():
-        if core_size is None:
-            core_size = len(siblings)
-        elif core_size != len(siblings):
-            sys.exit(
-                "Asymmetric machine architecture not supported: CPU core {0} has {1} siblings, but other core has {2} siblings.".format(
-                    core, len(siblings), core_size
-                )
-            )
-
     all_cpus_set = set(allCpus)
     for core, siblings in siblings_of_core.items():
         siblings_set = set(siblings)
@@ -221,6 +316,26 @@ def _get_cpu_cores_per_run0(
                 )
             )
 
+    unit_sizes = {len(cores) for cores in cores_of_unit.values()}
+    core_sizes = {len(siblings) for siblings in siblings_of_core.values()}
+    if len(unit_sizes) > 1 or len(core_sizes) > 1 or class_of_core:
+        logging.debug(
+            "Asymmetric machine architecture with %s cores per CPU/memory region, "
+            "%s threads per core, and cores of different performance.",
+            sorted(unit_sizes),
+            sorted(core_sizes),
+        )
+        return _get_cpu_cores_per_run_asymmetric(
+            coreLimit,
+            num_of_threads,
+            cores_of_unit,
+            siblings_of_core,
+            cores_of_l3cache,
+            class_of_core,
+        )
+    unit_size = unit_sizes.pop()  # Number of cores per unit
+    core_size = core_sizes.pop()  # Number of threads per core
+
     # Second, compute some values we will need.
     unit_count = len(cores_of_unit)
     units = sorted(cores_of_unit.keys())
@@ -275,6 +390,12 @@ def _get_cpu_cores_per_run0(
         units_per_run,
     )
 
+    l3cache_of_core = {
+        core: l3cache
+        for l3cache, cores in (cores_of_l3cache or {}).items()
+        for core in cores
+    }
+
     # Third, do the actual core assignment.
     result = []
     used_cores = set()
@@ -289,7 +410,9 @@ def _get_cpu_cores_per_run0(
             # so we take the i'th unit out of the list of available units.
             # On normal system this is the identity mapping.
             unit = units[unit_nr]
-            for core in cores_of_unit[unit]:
+            for core in _sort_cores_by_l3cache(
+                cores_of_unit[unit], l3cache_of_core, used_cores, coreLimit - len(cores)
+            ):
                 if core not in cores:
                     cores.extend(
                         c for c in siblings_of_core[core] if c not in used_cores
@@ -323,6 +446,223 @@ def _get_cpu_cores_per_run0(
     return result
 
 
+def _remove_hyperthreading_siblings(allCpus, cores_of_unit, siblings_of_core):
+    """
+    Remove all but one virtual core of each physical core from the given
+    mappings (which are modified) and return the list of remaining cores.
+    Parameters are as for _get_cpu_cores_per_run0().
+    """
+    unit_of_core = {}
+    unused_cores = []
+    for unit, cores in cores_of_unit.items():
+        for core in cores:
+            unit_of_core[core] = unit
+    for core, siblings in siblings_of_core.items():
+        if core in allCpus:
+            siblings.remove(core)
+            cores_of_unit[unit_of_core[core]] = [
+                c for c in cores_of_unit[unit_of_core[core]] if c not in siblings
+            ]
+            siblings_of_core[core] = [core]
+            allCpus = [c for c in allCpus if c not in siblings]
+        else:
+            unused_cores.append(core)
+    for core in unused_cores:
+        siblings_of_core.pop(core)
+    logging.debug(
+        "Running in no-hyperthreading mode, avoiding the use of CPU cores {}".format(
+            unused_cores
+        )
+    )
+    return allCpus
+
+
+def _get_cpu_cores_per_run_asymmetric(
+    coreLimit,
+    num_of_threads,
+    cores_of_unit,
+    siblings_of_core,
+    cores_of_l3cache,
+    class_of_core=None,
+):
+    """
+    Compute the core assignment for machines where the CPUs/memory regions
+    have different numbers of cores or where the physical cores have different
+    numbers of sibling cores (e.g., if only some cores are available
+    or on hybrid CPUs, where only the performance cores have hyper-threading).
+    As many runs as possible should be able to use the same kind of resources,
+    so we prefer (in this order) assignments where each run stays within one
+    CPU/memory region and has its physical cores for itself,
+    where each run has its physical cores for itself,
+    and where each run stays within one CPU/memory region.
+    A run never gets cores of different performance classes,
+    and if possible, all runs get cores of the same class.
+    Runs are distributed evenly across the CPUs/memory regions.
+    Parameters are the same as for _get_cpu_cores_per_run0.
+    """
+    class_of_core = class_of_core or {}
+    l3cache_of_core = {
+        core: l3cache
+        for l3cache, cores in (cores_of_l3cache or {}).items()
+        for core in cores
+    }
+    units = sorted(cores_of_unit.keys())
+    cores_per_unit = [cores_of_unit[unit] for unit in units]
+    classes = sorted(set(class_of_core.values())) or [0]
+    cores_per_class = [
+        [
+            core
+            for cores in cores_per_unit
+            for core in cores
+            if class_of_core.get(core, 0) == perf_class
+        ]
+        for perf_class in classes
+    ]
+
+    for split_siblings, unit_cores in [
+        (False, cores_per_unit),
+        (False, cores_per_class),
+        (True, cores_per_unit),
+        (True, cores_per_class),
+    ]:
+        runs_of_unit = [
+            _get_runs_for_cores(
+                cores, coreLimit, siblings_of_core, l3cache_of_core, split_siblings
+            )
+            for cores in unit_cores
+        ]
+        if sum(len(runs) for runs in runs_of_unit) >= num_of_threads:
+            break
+    else:
+        sys.exit(
+            "Cannot run {} benchmarks in parallel with {} CPU cores each "
+            "without mixing cores of different performance in a run, "
+            "only {} CPU cores of the same kind are available. "
+            "Please reduce the number of threads or CPU cores per run.".format(
+                num_of_threads, coreLimit, max(len(cores) for cores in cores_per_class)
+            )
+        )
+
+    if split_siblings:
+        logging.warning(
+            "The number of threads is too high and hyper-threading sibling cores need to be split among different runs, which makes benchmarking unreliable. Please reduce the number of threads."
+        )
+    if len(unit_cores) < len(units):
+        logging.debug("Runs need to be split across multiple CPUs/memory regions.")
+
+    # Runs on cores of different performance are not comparable,
+    # so we use only the fastest class of cores that suffices for all runs.
+    class_of_runs = [
+        class_of_core.get(runs[0][0], 0) if runs else None for runs in runs_of_unit
+    ]
+    for perf_class in classes:
+        if (
+            sum(
+                len(runs)
+                for runs, run_class in zip(runs_of_unit, class_of_runs)
+                if run_class == perf_class
+            )
+            >= num_of_threads
+        ):
+            runs_of_unit = [
+                runs if run_class == perf_class else []
+                for runs, run_class in zip(runs_of_unit, class_of_runs)
+            ]
+            break
+    else:
+        logging.warning(
+            "Parallel runs need to use CPU cores of different performance, "
+            "which makes benchmarking unreliable. "
+            "Please reduce the number of threads or use --core-class."
+        )
+
+    # distribute runs evenly by always taking the next run from the unit
+    # with the fewest assigned runs among those with runs left
+    result = []
+    assigned_runs = [0] * len(runs_of_unit)
+    for _ in range(num_of_threads):
+        # min() returns the first of several units with the same count
+        unit_nr = min(
+            (i for i, runs in enumerate(runs_of_unit) if runs),
+            key=lambda i: assigned_runs[i],
+        )
+        assigned_runs[unit_nr] += 1
+        result.append(runs_of_unit[unit_nr].pop(0))
+
+    assert (
+        len(set(itertools.chain(*result))) == num_of_threads * coreLimit
+    ), "Cores are not uniquely assigned to runs: " + str(result)
+    logging.debug("Final core assignment: %s.", result)
+    return result
+
+
+def _get_runs_for_cores(
+    cores, coreLimit, siblings_of_core, l3cache_of_core, split_siblings
+):
+    """
+    Compute the cores for as many runs as possible from the given cores.
+    Cores are taken in the given order, unless L3-cache information
+    requires otherwise (cf. _sort_cores_by_l3cache).
+    @param split_siblings: whether the remaining siblings of the last physical core
+        of a run may be used by another run
+    @return a list of lists, where each inner list contains the cores for one run
+    """
+    result = []
+    used_cores = set()
+    while True:
+        unused_cores = [core for core in cores if core not in used_cores]
+        run_cores = []
+        for core in _sort_cores_by_l3cache(
+            unused_cores, l3cache_of_core, used_cores, coreLimit
+        ):
+            if core not in run_cores:
+                run_cores.extend(
+                    c
+                    for c in siblings_of_core[core]
+                    if c not in used_cores and c not in run_cores
+                )
+            if len(run_cores) >= coreLimit:
+                break
+        if len(run_cores) < coreLimit:
+            return result
+        used_cores.update(run_cores[:coreLimit] if split_siblings else run_cores)
+        result.append(sorted(run_cores[:coreLimit]))
+
+
+def _sort_cores_by_l3cache(cores, l3cache_of_core, used_cores, needed):
+    """
+    Sort a list of cores such that the cores of the L3 cache that should be used
+    for the next run come first: This is the L3 cache with the most unused cores
+    among those that have enough unused cores for the run (such that parallel runs
+    are distributed across L3 caches), or if there is no such L3 cache,
+    the cores are sorted by L3 caches with most unused cores first
+    (such that the run is split across as few L3 caches as possible).
+    The order of cores within each L3 cache stays the same.
+    @param needed: the number of cores that are needed for the run
+    """
+    if not l3cache_of_core:
+        return cores
+    cores_of_cache = collections.OrderedDict()
+    for core in cores:
+        cores_of_cache.setdefault(l3cache_of_core.get(core), []).append(core)
+    if len(cores_of_cache) <= 1:
+        return cores
+
+    def unused_count(cache_cores):
+        return sum(1 for core in cache_cores if core not in used_cores)
+
+    caches = list(cores_of_cache.values())
+    fitting_caches = [c for c in caches if unused_count(c) >= needed]
+    if fitting_caches:
+        # max() returns the first of several caches with the same count
+        best_cache = max(fitting_caches, key=unused_count)
+        caches.remove(best_cache)
+        caches.insert(0, best_cache)
+    else:
+        caches.sort(key=unused_count, reverse=True)  # stable sort
+    return list(itertools.chain.from_iterable(caches))
+
+
 def get_memory_banks_per_run(coreAssignment, cgroups):
     """Get an assignment of memory banks to runs that fits to the given coreAssignment,
     i.e., no run is allowed to use memory that is not local (on the same NUMA node)
@@ -474,6 +814,55 @@ def get_cpu_package_for_core(core):
     )
 
 
+def get_l3cache_id_for_core(core):
+    """
+    Get an identifier of the L3 cache a core uses (the lowest number
+    of the cores that share this cache), or None if this is unknown.
+    """
+    for cache_dir in glob.glob(
+        "/sys/devices/system/cpu/cpu{0}/cache/index*/".format(core)
+    ):
+        if util.try_read_file(cache_dir, "level") == "3":
+            shared_cpus = util.try_read_file(cache_dir, "shared_cpu_list")
+            if shared_cpus:
+                return min(util.parse_int_list(shared_cpus))
+    return None
+
+
+def get_core_classes(cores):
+    """
+    Get the performance classes of the given cores on CPUs with different kinds
+    of cores, e.g., performance and efficiency cores of hybrid Intel CPUs
+    or ARM big.LITTLE CPUs.
+    @return a mapping from cores to classes, where class 0 are the fastest cores,
+        or an empty dict if all cores are equal or the information is not available
+    """
+    capacity_of_core = {}
+    # Linux has separate PMU devices for both kinds of cores of hybrid Intel CPUs
+    performance_cores = util.try_read_file("/sys/devices/cpu_core/cpus")
+    efficiency_cores = util.try_read_file("/sys/devices/cpu_atom/cpus")
+    if performance_cores and efficiency_cores:
+        for core in util.parse_int_list(performance_cores):
+            capacity_of_core[core] = 1
+        for core in util.parse_int_list(efficiency_cores):
+            capacity_of_core[core] = 0
+    else:
+        for core in cores:
+            capacity = util.try_read_file(
+                "/sys/devices/system/cpu/cpu{0}/cpu_capacity".format(core)
+            )
+            if capacity is None:
+                return {}
+            capacity_of_core[core] = int(capacity)
+
+    if not all(core in capacity_of_core for core in cores):
+        return {}
+    capacities = sorted({capacity_of_core[core] for core in cores}, reverse=True)
+    if len(capacities) <= 1:
+        return {}
+    return {core: capacities.index(capacity_of_core[core]) for core in cores}
+
+
 def get_cores_of_same_package_as(core):
     return util.parse_int_list(
         util.read_file(
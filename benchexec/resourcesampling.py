@@ -0,0 +1,95 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import logging
+import threading
+import time
+
+from benchexec.cgroups import CPUACCT, MEMORY
+
+# Maximum number of samples that are kept for a run.
+# If a run takes longer, every other sample is dropped and the interval is doubled,
+# such that the samples always cover the whole run with evenly spaced points.
+DEFAULT_MAX_SAMPLES = 1000
+
+TIME_SERIES_COLUMNS = ["walltime (s)", "cputime (s)", "memory (B)"]
+
+
+class ResourceSamplingThread(threading.Thread):
+    """
+    Thread that periodically records the CPU time and the memory usage
+    of the processes in a cgroup, such that their development over time
+    can be inspected after the run.
+    """
+
+    def __init__(self, cgroups, interval, max_samples=DEFAULT_MAX_SAMPLES):
+        super(ResourceSamplingThread, self).__init__()
+        self.name = "ResourceSamplingThread-" + self.name
+        assert interval > 0
+        assert max_samples >= 2
+
+        self._cgroups = cgroups
+        self._interval = interval
+        self._max_samples = max_samples
+        self._memory_file = None
+        if MEMORY in cgroups:
+            for memory_file in ["memsw.usage_in_bytes", "usage_in_bytes"]:
+                if cgroups.has_value(MEMORY, memory_file):
+                    self._memory_file = memory_file
+                    break
+        self._start_time = time.monotonic()
+        self._finished = threading.Event()
+        self.samples = []  # list of (walltime, cputime, memory), values may be None
+
+    def _read_value(self, read_fn):
+        try:
+            return read_fn()
+        except (OSError, ValueError) as e:
+            logging.debug("Could not read resource usage of run: %s", e)
+            return None
+
+    def sample(self):
+        """Record the current resource usage of the cgroup."""
+        cputime = None
+        if CPUACCT in self._cgroups:
+            cputime = self._read_value(self._cgroups.read_cputime)
+        memory = None
+        if self._memory_file:
+            memory = self._read_value(
+                lambda: int(self._cgroups.get_value(MEMORY, self._memory_file))
+            )
+        self.samples.append((time.monotonic() - self._start_time, cputime, memory))
+
+        if len(self.samples) > self._max_samples:
+            # keep the first sample such that the start of the run is still covered
+            self.samples = self.samples[::2]
+            self._interval *= 2
+
+    def run(self):
+        self.sample()
+        while not self._finished.wait(self._interval):
+            self.sample()
+        self.sample()
+
+    def cancel(self):
+        """Stop sampling after recording a final sample."""
+        self._finished.set()
+
+    def write_csv(self, filename):
+        """Write the samples to a CSV file with one line per sample."""
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(TIME_SERIES_COLUMNS)
+            for walltime, cputime, memory in self.samples:
+                writer.writerow(
+                    [
+                        "{:.3f}".format(walltime),
+                        "" if cputime is None else "{:.3f}".format(cputime),
+                        "" if memory is None else memory,
+                    ]
+                )
@@ -29,6 +29,7 @@ from benchexec.filehierarchylimit import FileHierarchyLimitThread
 from benchexec import intel_cpu_energy
 from benchexec import oomhandler
 from benchexec import resources
+from benchexec import resourcesampling
 from benchexec import systeminfo
 from benchexec import util
 
@@ -124,6 +125,20 @@ def main(argv=None):
         metavar="BYTES",
         help="maximum size of files the tool may write (checked periodically, counts only files written in container mode or to temporary directories, only supported with --no-tmpfs)",
     )
+    io_args.add_argument(
+        "--time-series",
+        metavar="FILE",
+        help="record CPU time and memory usage of the command periodically "
+        "and write them as CSV to the given file",
+    )
+    io_args.add_argument(
+        "--time-series-interval",
+        type=float,
+        default=1,
+        metavar="SECONDS",
+        help="interval for --time-series (default: 1s, "
+        "increased automatically for long runs to limit the file size)",
+    )
     io_args.add_argument(
         "--skip-cleanup",
         action="store_false",
@@ -269,6 +284,8 @@ def main(argv=None):
             maxLogfileSize=options.maxOutputSize,
             files_count_limit=options.filesCountLimit,
             files_size_limit=options.filesSizeLimit,
+            time_series_filename=options.time_series,
+            time_series_interval=options.time_series_interval,
             **container_output_options,
         )
     finally:
@@ -613,6 +630,22 @@ class RunExecutor(containerexecutor.ContainerExecutor):
             return file_hierarchy_limit_thread
         return None
 
+    def _setup_resource_sampling(self, time_series_filename, interval, cgroups):
+        """Start thread that records the resource usage of the run periodically."""
+        if time_series_filename is not None:
+            if CPUACCT not in cgroups and MEMORY not in cgroups:
+                logging.warning(
+                    "Cannot record resource usage of run without cgroups "
+                    "for CPU time or memory."
+                )
+                return None
+            resource_sampling_thread = resourcesampling.ResourceSamplingThread(
+                cgroups, interval
+            )
+            resource_sampling_thread.start()
+            return resource_sampling_thread
+        return None
+
     # --- run execution ---
 
     def execute_run(
@@ -634,6 +667,8 @@ class RunExecutor(containerexecutor.ContainerExecutor):
         files_size_limit=None,
         error_filename=None,
         write_header=True,
+        time_series_filename=None,
+        time_series_interval=1,
         **kwargs
     ):
         """
@@ -662,6 +697,8 @@ class RunExecutor(containerexecutor.ContainerExecutor):
         @param files_size_limit: None or maximum size of files that may be written.
         @param error_filename: the file where the error output should be written to (default: same as output_filename)
         @param write_headers: Write informational headers to the output and the error file if separate (default: True)
+        @param time_series_filename: None or a CSV file where the CPU time and memory usage of the run should be written to periodically during the run (requires cgroups)
+        @param time_series_interval: the interval in seconds for recording the CPU time and memory usage (doubled whenever necessary to keep the file small)
         @param **kwargs: further arguments for ContainerExecutor.execute_run()
         @return: dict with result of run (measurement results and process exitcode)
         """
@@ -788,6 +825,8 @@ class RunExecutor(containerexecutor.ContainerExecutor):
                 maxLogfileSize,
                 files_count_limit,
                 files_size_limit,
+                time_series_filename,
+                time_series_interval,
                 **kwargs,
             )
 
@@ -825,6 +864,8 @@ class RunExecutor(containerexecutor.ContainerExecutor):
         max_output_size,
         files_count_limit,
         files_size_limit,
+        time_series_filename,
+        time_series_interval,
         **kwargs
     ):
         """
@@ -834,6 +875,7 @@ class RunExecutor(containerexecutor.ContainerExecutor):
         timelimitThread = None
         oomThread = None
         file_hierarchy_limit_thread = None
+        resource_sampling_thread = None
 
         if self._energy_measurement is not None:
             # Calculate which packages we should use for energy measurements
@@ -952,6 +994,9 @@ class RunExecutor(containerexecutor.ContainerExecutor):
             file_hierarchy_limit_thread = self._setup_file_hierarchy_limit(
                 files_count_limit, files_size_limit, temp_dir, cgroups, pid
             )
+            resource_sampling_thread = self._setup_resource_sampling(
+                time_series_filename, time_series_interval, cgroups
+            )
 
             # wait until process has terminated
             returnvalue, ru_child, (starttime, walltime, energy) = result_fn()
@@ -978,6 +1023,11 @@ class RunExecutor(containerexecutor.ContainerExecutor):
             # (needs to come early to avoid accumulating more CPU time)
             cgroups.kill_all_tasks()
 
+            if resource_sampling_thread:
+                # needs to come before cgroup cleanup for the final sample
+                resource_sampling_thread.cancel()
+                resource_sampling_thread.join()
+
             # normally subprocess closes file, we do this again after all tasks terminated
             outputFile.close()
             if errorFile is not outputFile:
@@ -1001,6 +1051,17 @@ class RunExecutor(containerexecutor.ContainerExecutor):
                 self._energy_measurement.stop()
 
         # cleanup steps that are only relevant in case of success
+        if resource_sampling_thread:
+            try:
+                resource_sampling_thread.write_csv(time_series_filename)
+                result["timeseries"] = time_series_filename
+            except OSError as e:
+                logging.warning(
+                    "Could not write resource usage of run to %s: %s",
+                    time_series_filename,
+                    e.strerror,
+                )
+
         if throttle_check.has_throttled():
             logging.warning(
                 "CPU throttled itself during benchmarking due to overheating. "
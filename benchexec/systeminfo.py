@@ -9,12 +9,16 @@
 This module allows to retrieve information about the current system.
 """
 
+import collections
 from decimal import Decimal
 import glob
 import logging
 import os
 import platform
+import re
 import sys
+import threading
+import time
 
 from benchexec import util
 
@@ -24,6 +28,7 @@ __all__ = [
     "CPUThrottleCheck",
     "SystemInfo",
     "SwapCheck",
+    "SystemHealthSampler",
 ]
 
 _TURBO_BOOST_FILE = "/sys/devices/system/cpu/cpufreq/boost"
@@ -177,6 +182,212 @@ class SwapCheck(object):
         return False
 
 
+# Counters from /proc/vmstat that are recorded by SystemHealthSampler
+_VMSTAT_COUNTERS = ["pswpin", "pswpout", "pgmajfault"]
+# Resources and lines in /proc/pressure that are recorded by SystemHealthSampler
+_PRESSURE_COUNTERS = [
+    ("cpu", "some"),
+    ("memory", "some"),
+    ("memory", "full"),
+    ("io", "some"),
+    ("io", "full"),
+]
+_PRESSURE_TOTAL_PATTERN = re.compile(r"(some|full) .*total=(\d+)")
+
+# One sample of SystemHealthSampler: timestamp (time.monotonic()),
+# current frequency (in kHz) and throttle count of each CPU (or None),
+# and values of _VMSTAT_COUNTERS and _PRESSURE_COUNTERS (or None).
+_HealthSample = collections.namedtuple(
+    "_HealthSample", "time frequencies throttle_counts vmstat pressure"
+)
+
+
+class SystemHealthSampler(object):
+    """
+    Background thread that periodically records the state of the system
+    (CPU frequency, thermal throttling, swapping, page faults, pressure stall
+    information) in a ring buffer, such that for each run it can be determined
+    afterwards whether and how much it was affected by these effects.
+    """
+
+    def __init__(self, interval=1, capacity=3600, sys_dir="/sys", proc_dir="/proc"):
+        """
+        @param interval: the time between two samples in seconds
+        @param capacity: the number of samples that are kept
+        @param sys_dir: the mount point of sysfs (for tests)
+        @param proc_dir: the mount point of procfs (for tests)
+        """
+        self.interval = interval
+        self.proc_dir = proc_dir
+        cpu_dir = os.path.join(sys_dir, "devices", "system", "cpu")
+        try:
+            cpu_names = os.listdir(cpu_dir)
+        except OSError as e:
+            logging.warning("Cannot read list of CPUs from kernel: %s", e)
+            cpu_names = []
+        self._cpus = sorted(
+            int(name[3:]) for name in cpu_names if re.fullmatch(r"cpu\d+", name)
+        )
+        self._frequency_files = [
+            os.path.join(cpu_dir, "cpu{}".format(cpu), "cpufreq", "scaling_cur_freq")
+            for cpu in self._cpus
+        ]
+        self._throttle_files = [
+            glob.glob(
+                os.path.join(
+                    cpu_dir, "cpu{}".format(cpu), "thermal_throttle", "*_throttle_count"
+                )
+            )
+            for cpu in self._cpus
+        ]
+        self._samples = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Take a first sample and start sampling periodically."""
+        self.sample()
+        self._thread = threading.Thread(
+            target=self._run, name="system-health-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    @staticmethod
+    def _read_int(filename):
+        try:
+            return int(util.read_file(filename))
+        except (OSError, ValueError):
+            return None
+
+    def _read_vmstat(self):
+        try:
+            values = dict(util.read_key_value_pairs_from_file(self.proc_dir, "vmstat"))
+            return tuple(int(values[key]) for key in _VMSTAT_COUNTERS)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _read_pressure(self):
+        totals = {}
+        for resource in {resource for resource, _ in _PRESSURE_COUNTERS}:
+            try:
+                with open(os.path.join(self.proc_dir, "pressure", resource)) as f:
+                    for line in f:
+                        match = _PRESSURE_TOTAL_PATTERN.match(line)
+                        if match:
+                            totals[resource, match.group(1)] = int(match.group(2))
+            except OSError:
+                pass
+        return tuple(totals.get(key) for key in _PRESSURE_COUNTERS)
+
+    def sample(self):
+        """
+        Record the current state of the system.
+        @return: the new sample, which can be used as baseline for summarize()
+        """
+        sample = _HealthSample(
+            time.monotonic(),
+            tuple(self._read_int(f) for f in self._frequency_files),
+            tuple(
+                sum(self._read_int(f) or 0 for f in files) if files else None
+                for files in self._throttle_files
+            ),
+            self._read_vmstat(),
+            self._read_pressure(),
+        )
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def summarize(self, start, end, cores=None, baseline=None):
+        """
+        Summarize the state of the system in a time interval (e.g., of a run).
+        A new sample is taken if there is none after the end of the interval yet.
+        Values that depend on samples from before the interval are omitted
+        if these samples are no longer in the ring buffer (e.g., for long runs),
+        unless a baseline sample is given.
+        @param start: the start of the interval as given by time.monotonic()
+        @param end: the end of the interval as given by time.monotonic()
+        @param cores: the list of relevant CPU cores (default: all)
+        @param baseline: a sample returned by sample() at the start of the interval
+            that is used as baseline for the counters
+        @return: a dict with the summary values (only those that could be measured)
+        """
+        if not self._samples or self._samples[-1].time < end:
+            self.sample()
+        with self._lock:
+            samples = list(self._samples)
+
+        # whether the ring buffer still contains the whole interval
+        covered = samples[0].time <= start
+
+        # the last sample before the interval is the baseline for the counters
+        first = 0
+        while first + 1 < len(samples) and samples[first + 1].time <= start:
+            first += 1
+        last = first
+        while last + 1 < len(samples) and samples[last].time < end:
+            last += 1
+        after = samples[last]
+        before = baseline or (samples[first] if covered else None)
+
+        indices = [
+            i for i, cpu in enumerate(self._cpus) if cores is None or cpu in cores
+        ]
+        result = collections.OrderedDict()
+
+        frequencies = [
+            sample.frequencies[i] * 1000  # kHz to Hz
+            for sample in samples[first + 1 : last + 1]
+            if start <= sample.time
+            for i in indices
+            if sample.frequencies[i] is not None
+        ]
+        if frequencies and covered:
+            result["cpufreq-min"] = min(frequencies)
+            result["cpufreq-avg"] = sum(frequencies) // len(frequencies)
+
+        if before is None:
+            return result
+
+        throttle_counts = [
+            after.throttle_counts[i] - before.throttle_counts[i]
+            for i in indices
+            if after.throttle_counts[i] is not None
+            and before.throttle_counts[i] is not None
+        ]
+        if throttle_counts:
+            result["throttlecount"] = sum(throttle_counts)
+
+        if before.vmstat and after.vmstat:
+            vmstat = dict(
+                zip(
+                    _VMSTAT_COUNTERS,
+                    (new - old for old, new in zip(before.vmstat, after.vmstat)),
+                )
+            )
+            result["swappedpages"] = vmstat["pswpin"] + vmstat["pswpout"]
+            result["majorpagefaults"] = vmstat["pgmajfault"]
+
+        for (resource, kind), old, new in zip(
+            _PRESSURE_COUNTERS, before.pressure, after.pressure
+        ):
+            if old is not None and new is not None:
+                key = "pressure-{}-{}".format(resource, kind)
+                result[key] = Decimal(new - old).scaleb(-6)  # us to s
+        return result
+
+
 def is_turbo_boost_enabled():
     """
     Check whether Turbo Boost (scaling CPU frequency beyond nominal frequency)
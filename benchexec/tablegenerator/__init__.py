@@ -6,14 +6,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
-import bz2
 import collections
 import copy
-import functools
 import gzip
 import io
 import itertools
 import logging
+import math
+import operator
 import os.path
 import platform
 import signal
@@ -31,7 +31,14 @@ import benchexec.model as model
 import benchexec.result as result
 import benchexec.tooladapter as tooladapter
 import benchexec.util
-from benchexec.tablegenerator import htmltable, statistics, util
+from benchexec.tablegenerator import (
+    htmltable,
+    performance,
+    remote,
+    statistics,
+    timeseries,
+    util,
+)
 from benchexec.tablegenerator.columns import Column
 from benchexec.tablegenerator.util import TaskId
 import zipfile
@@ -62,6 +69,22 @@ DEFAULT_OUTPUT_PATH = "results"
 
 TEMPLATE_FORMATS = ["html", "csv"]
 
+# Fields of statistics.ColumnStatistics in the order in which they are written
+STATISTICS_FIELDS = [
+    "total",
+    "local",
+    "correct",
+    "correct_true",
+    "correct_false",
+    "correct_unconfirmed",
+    "correct_unconfirmed_true",
+    "correct_unconfirmed_false",
+    "wrong",
+    "wrong_true",
+    "wrong_false",
+    "score",
+]
+
 _BYTE_FACTOR = 1000  # bytes in a kilobyte
 
 UNIT_CONVERSION = {
@@ -134,8 +157,7 @@ def load_results_from_table_definition(
                 tag, table_definition_file
             ):
                 results.append(
-                    parallel.submit(
-                        load_result,
+                    _submit_load_result(
                         resultsFile,
                         options,
                         run_set_id,
@@ -145,6 +167,8 @@ def load_results_from_table_definition(
                 )
 
         elif tag.tag == "union":
+            if options.statistics_only:
+                handle_error("<union> tags are not supported with --statistics-only.")
             results.append(
                 parallel.submit(
                     handle_union_tag,
@@ -156,7 +180,7 @@ def load_results_from_table_definition(
                 )
             )
 
-    return [future.result() for future in results]
+    return [_get_loaded_result(future) for future in results]
 
 
 def handle_union_tag(
@@ -261,6 +285,8 @@ def extract_columns_from_table_definition_file(xmltag, table_definition_file):
             scale_factor,
             c.get("relevantForDiff"),
             c.get("displayTitle"),
+            c.get("diffAbsoluteTolerance"),
+            c.get("diffRelativeTolerance"),
         )
         columns.append(new_column)
 
@@ -398,17 +424,6 @@ class RunSetResult(object):
         """
         self.results = []
 
-        def get_value_from_logfile(lines, identifier):
-            """
-            This method searches for values in lines of the content.
-            It uses a tool-specific method to so.
-            """
-            tool = load_tool(self)
-            if not tool:
-                return None
-            output = tooladapter.CURRENT_BASETOOL.RunOutput(lines)
-            return tool.get_value_from_output(output, identifier)
-
         # Opening the ZIP archive with the logs for every run is too slow, we cache it.
         log_zip_cache = {}
         try:
@@ -416,7 +431,7 @@ class RunSetResult(object):
                 self.results.append(
                     RunResult.create_from_xml(
                         xml_result,
-                        get_value_from_logfile,
+                        self.get_value_from_logfile,
                         self.columns,
                         correct_only,
                         log_zip_cache,
@@ -437,9 +452,46 @@ class RunSetResult(object):
 
         del self._xml_results
 
+    def get_value_from_logfile(self, lines, identifier):
+        """
+        This method searches for values in lines of the content.
+        It uses a tool-specific method to so.
+        """
+        tool = load_tool(self)
+        if not tool:
+            return None
+        output = tooladapter.CURRENT_BASETOOL.RunOutput(lines)
+        return tool.get_value_from_output(output, identifier)
+
     def __str__(self):
         return util.prettylist(self.attributes["filename"])
 
+    def copy(self):
+        """
+        Return a copy of this instance that can be used for a different table.
+        Creating tables modifies only the attributes and the list of results,
+        so the actual RunResult instances and columns are shared.
+        """
+        result = copy.copy(self)
+        result.attributes = copy.copy(self.attributes)
+        if hasattr(self, "results"):
+            result.results = list(self.results)
+        return result
+
+    def __getstate__(self):
+        # Instances are sent from worker processes to the main process after loading,
+        # and pickling each RunResult instance individually is about as expensive as
+        # parsing the result file. So we transfer the results column-wise.
+        state = self.__dict__.copy()
+        if "results" in state:
+            state["results"] = _ColumnarRunResults.from_run_results(state["results"])
+        return state
+
+    def __setstate__(self, state):
+        if "results" in state:
+            state["results"] = state["results"].to_run_results()
+        self.__dict__.update(state)
+
     @staticmethod
     def create_from_xml(
         resultFile,
@@ -489,17 +541,21 @@ class RunSetResult(object):
                 if all_columns or c.get("hidden") != "true"
             }
 
-            if not column_names:
-                # completely empty results break stuff, add at least status column
-                return [MAIN_COLUMNS[0]]
+            return RunSetResult._get_columns_for_titles(column_names)
 
-            # Put main columns first, then rest sorted alphabetically
-            custom_columns = column_names.difference(
-                column.title for column in MAIN_COLUMNS
-            )
-            return [
-                column for column in MAIN_COLUMNS if column.title in column_names
-            ] + [Column(title) for title in sorted(custom_columns)]
+    @staticmethod
+    def _get_columns_for_titles(column_names):
+        if not column_names:
+            # completely empty results break stuff, add at least status column
+            return [MAIN_COLUMNS[0]]
+
+        # Put main columns first, then rest sorted alphabetically
+        custom_columns = column_names.difference(
+            column.title for column in MAIN_COLUMNS
+        )
+        return [column for column in MAIN_COLUMNS if column.title in column_names] + [
+            Column(title) for title in sorted(custom_columns)
+        ]
 
     @staticmethod
     def _extract_attributes_from_result(resultFile, resultTag):
@@ -562,14 +618,57 @@ def load_results(
     columns_relevant_for_diff=set(),
 ):
     """Version of load_result for multiple input files that will be loaded concurrently."""
-    return parallel.map(
-        load_result,
-        result_files,
-        itertools.repeat(options),
-        itertools.repeat(run_set_id),
-        itertools.repeat(columns),
-        itertools.repeat(columns_relevant_for_diff),
+    futures = [
+        _submit_load_result(
+            result_file, options, run_set_id, columns, columns_relevant_for_diff
+        )
+        for result_file in result_files
+    ]
+    return [_get_loaded_result(future) for future in futures]
+
+
+# Futures for results loaded by _submit_load_result().
+# If tables are created for several table definitions at once,
+# this allows to load result files that occur in several tables only once.
+_loaded_results = {}
+
+
+def _submit_load_result(
+    result_file, options, run_set_id, columns, columns_relevant_for_diff
+):
+    """
+    Start loading a single result file with load_result() in the process pool,
+    or return the future of a previous call with the same parameters.
+    The results need to be retrieved with _get_loaded_result().
+    """
+    key = (
+        result_file,
+        run_set_id,
+        tuple(tuple(sorted(vars(column).items())) for column in columns)
+        if columns
+        else None,
+        frozenset(columns_relevant_for_diff),
     )
+    future = _loaded_results.get(key)
+    if future is None:
+        future = _loaded_results[key] = parallel.submit(
+            load_result_statistics if options.statistics_only else load_result,
+            result_file,
+            options,
+            run_set_id,
+            columns,
+            columns_relevant_for_diff,
+        )
+    return future
+
+
+def _get_loaded_result(future):
+    """
+    Return a RunSetResult from a future of _submit_load_result().
+    The RunSetResult may be shared with other tables, so a copy is returned.
+    """
+    result = future.result()
+    return result.copy() if result is not None else None
 
 
 def load_result(
@@ -585,6 +684,7 @@ def load_result(
                                      the diff table
     @return a fully ready RunSetResult instance or None
     """
+    remote.set_cache_dir(options.http_cache)  # we may be in a worker process
     xml = parse_results_file(
         result_file, run_set_id=run_set_id, ignore_errors=options.ignore_errors
     )
@@ -602,6 +702,90 @@ def load_result(
     return result
 
 
+def load_result_statistics(
+    result_file, options, run_set_id=None, columns=None, columns_relevant_for_diff=set()
+):
+    """
+    Version of load_result() for --statistics-only.
+    The result file is streamed and only the statistics of its runs are computed,
+    without keeping the results of the runs in memory.
+    Parameters are the same as for load_result().
+    @return a RunSetResult instance without results but with an attribute "stats"
+        (like returned by statistics.get_stats_of_run_set()) and an attribute
+        "category_counts" (a Counter of the categories of all runs), or None
+    """
+    remote.set_cache_dir(options.http_cache)  # we may be in a worker process
+    runs = iterparse_results_file(
+        result_file, run_set_id=run_set_id, ignore_errors=options.ignore_errors
+    )
+    result_elem = next(runs, None)
+    if result_elem is None:
+        return None
+
+    # Children of result_elem may be incomplete at this point, so use only attributes.
+    result = RunSetResult(
+        [],
+        RunSetResult._extract_attributes_from_result(
+            result_file, ElementTree.Element(result_elem.tag, result_elem.attrib)
+        ),
+        columns or [],
+        columns_relevant_for_diff=columns_relevant_for_diff,
+    )
+    accumulator = statistics.RunSetStatisticsAccumulator(options.correct_only)
+    # If no columns are given, all columns of the runs are used,
+    # and we collect them while reading the runs.
+    run_columns = result.columns
+    column_titles = set()
+
+    log_zip_cache = {}
+    try:
+        for run_tag in runs:
+            if not columns:
+                new_column_titles = {
+                    c.get("title")
+                    for c in run_tag.findall("column")
+                    if options.all_columns or c.get("hidden") != "true"
+                }.difference(column_titles)
+                if new_column_titles:
+                    column_titles.update(new_column_titles)
+                    run_columns = run_columns + [
+                        Column(title) for title in sorted(new_column_titles)
+                    ]
+
+            accumulator.add(
+                RunResult.create_from_xml(
+                    run_tag,
+                    result.get_value_from_logfile,
+                    run_columns,
+                    options.correct_only,
+                    log_zip_cache,
+                    columns_relevant_for_diff,
+                    result_file,
+                )
+            )
+    finally:
+        for file in log_zip_cache.values():
+            file.close()
+
+    if not sum(accumulator.category_counts.values()):
+        logging.warning("Result file '%s' is empty.", result_file)
+    if not columns:
+        result.columns = copy.deepcopy(
+            RunSetResult._get_columns_for_titles(column_titles)
+        )
+
+    # Only now the remaining tags like system information are present.
+    result.attributes = RunSetResult._extract_attributes_from_result(
+        result_file, result_elem
+    )
+    result.summary = RunSetResult._extract_summary_from_result(
+        result_elem, result.columns
+    )
+    result.stats = accumulator.get_stats(result.columns)
+    result.category_counts = accumulator.category_counts
+    return result
+
+
 def parse_results_file(resultFile, run_set_id=None, ignore_errors=False):
     """
     This function parses an XML file that contains the results of the execution of a run set.
@@ -620,7 +804,7 @@ def parse_results_file(resultFile, run_set_id=None, ignore_errors=False):
                     resultElem = parse(typing.cast(typing.IO, gzip.GzipFile(fileobj=f)))
                 except OSError:
                     f.seek(0)
-                    resultElem = parse(bz2.BZ2File(f))
+                    resultElem = parse(util.open_bz2(f))
             except OSError:
                 f.seek(0)
                 resultElem = parse(f)
@@ -653,7 +837,74 @@ def parse_results_file(resultFile, run_set_id=None, ignore_errors=False):
     return resultElem
 
 
+def iterparse_results_file(resultFile, run_set_id=None, ignore_errors=False):
+    """
+    Version of parse_results_file() that does not keep all run tags in memory.
+    This is a generator that first yields the "result" XML tag (without children)
+    and then each run tag, which is removed from the "result" tag afterwards.
+    The other children of the "result" tag (e.g., system information)
+    are present only after all run tags were consumed.
+    Nothing is yielded if the result file should be ignored.
+    """
+    logging.info("    %s", resultFile)
+    url = util.make_url(resultFile)
+
+    try:
+        with util.open_url_seekable(url, mode="rb") as f:
+            magic = f.read(3)
+            f.seek(0)
+            if magic.startswith(b"\x1f\x8b"):
+                xml_file = gzip.GzipFile(fileobj=f)
+            elif magic == b"BZh":
+                xml_file = util.open_bz2(f)
+            else:
+                xml_file = f
+
+            resultElem = None
+            depth = 0
+            events = ElementTree.iterparse(xml_file, events=("start", "end"))
+            for event, elem in events:
+                if event == "start":
+                    depth += 1
+                    if resultElem is None:
+                        resultElem = elem
+                        if resultElem.tag not in ["result", "test"]:
+                            handle_error(
+                                "XML file with benchmark results seems to be invalid.\n"
+                                "The root element of the file is not named 'result' or 'test'."
+                            )
+                        if ignore_errors and "error" in resultElem.attrib:
+                            logging.warning(
+                                'Ignoring file "%s" because of error: %s',
+                                resultFile,
+                                resultElem.attrib["error"],
+                            )
+                            return
+                        log_folder = _get_log_folder(resultFile, resultElem)
+                        yield resultElem
+                    continue
+
+                depth -= 1
+                if depth == 1 and elem.tag in ["run", "sourcefile"]:
+                    if run_set_id is not None:
+                        elem.set("runset", run_set_id)
+                    _insert_logfile_name(resultFile, log_folder, elem)
+                    yield elem
+                    resultElem.remove(elem)
+    except OSError as e:
+        handle_error("Could not read result file %s: %s", resultFile, e)
+    except ElementTree.ParseError as e:
+        handle_error("Result file %s is invalid: %s", resultFile, e)
+
+
 def insert_logfile_names(resultFile, resultElem):
+    log_folder = _get_log_folder(resultFile, resultElem)
+    # for each file: append original filename and insert log_file_name into sourcefileElement
+    for sourcefile in _get_run_tags_from_xml(resultElem):
+        _insert_logfile_name(resultFile, log_folder, sourcefile)
+
+
+def _get_log_folder(resultFile, resultElem):
     # get folder of logfiles (truncate end of XML file name and append .logfiles instead)
     log_folder = resultFile[0 : resultFile.rfind(".results.")] + ".logfiles/"
 
@@ -669,14 +920,15 @@ def insert_logfile_names(resultFile, resultElem):
             assert runSetName.endswith("." + blockname)
             runSetName = runSetName[: -(1 + len(blockname))]  # remove last chars
             log_folder += runSetName + "."
+    return log_folder
 
-    # for each file: append original filename and insert log_file_name into sourcefileElement
-    for sourcefile in _get_run_tags_from_xml(resultElem):
-        if "logfile" in sourcefile.attrib:
-            log_file = urllib.parse.urljoin(resultFile, sourcefile.get("logfile"))
-        else:
-            log_file = log_folder + os.path.basename(sourcefile.get("name")) + ".log"
-        sourcefile.set("logfile", log_file)
+
+def _insert_logfile_name(resultFile, log_folder, sourcefile):
+    if "logfile" in sourcefile.attrib:
+        log_file = urllib.parse.urljoin(resultFile, sourcefile.get("logfile"))
+    else:
+        log_file = log_folder + os.path.basename(sourcefile.get("name")) + ".log"
+    sourcefile.set("logfile", log_file)
 
 
 def merge_tasks(runset_results):
@@ -752,11 +1004,101 @@ def find_common_tasks(runset_results):
         merge_task_lists(runset_results, task_list)
 
 
+def read_logfile_lines(log_file, log_zip_cache, warn_if_missing=True):
+    """
+    Read a log file (or another file in the folder of log files) either directly
+    or from the ZIP archive of log files next to its folder.
+    @param log_zip_cache: a dict for caching opened ZIP archives by their URL
+    @return: the list of lines of the file (empty if it cannot be found)
+    """
+    if not log_file:
+        return []
+    log_file_url = util.make_url(log_file)
+    url_parts = urllib.parse.urlparse(log_file_url, allow_fragments=False)
+    log_zip_path = os.path.dirname(url_parts.path) + ".zip"
+    log_zip_url = urllib.parse.urlunparse(
+        (
+            url_parts.scheme,
+            url_parts.netloc,
+            log_zip_path,
+            url_parts.params,
+            url_parts.query,
+            url_parts.fragment,
+        )
+    )
+    path_in_zip = urllib.parse.unquote(
+        # os.path.relpath creates os-dependant paths, but windows separators can produce errors with zipfile lib
+        util.fix_path_if_on_windows(
+            os.path.relpath(url_parts.path, os.path.dirname(log_zip_path))
+        )
+    )
+    if log_zip_url.startswith("file:///") and not log_zip_path.startswith("/"):
+        # Replace file:/// with file: for relative paths,
+        # otherwise opening fails.
+        log_zip_url = "file:" + log_zip_url[8:]
+
+    log_zip = log_zip_cache.get(log_zip_url)
+    if log_zip is not None:
+        # The archive was needed for previous runs, so probably the log file
+        # does not exist outside of it and we can avoid a request for it.
+        try:
+            with io.TextIOWrapper(log_zip.open(path_in_zip)) as logfile:
+                return logfile.readlines()
+        except (KeyError, OSError):
+            pass
+
+    try:
+        with util.open_url_seekable(log_file_url, "rt") as logfile:
+            return logfile.readlines()
+    except OSError:
+        try:
+            if log_zip_url not in log_zip_cache:
+                log_zip_cache[log_zip_url] = zipfile.ZipFile(
+                    util.open_url_random_access(log_zip_url)
+                )
+            log_zip = log_zip_cache[log_zip_url]
+
+            try:
+                with io.TextIOWrapper(log_zip.open(path_in_zip)) as logfile:
+                    return logfile.readlines()
+            except KeyError:
+                if warn_if_missing:
+                    logging.warning(
+                        "Could not find logfile '%s' in archive '%s'.",
+                        log_file,
+                        log_zip_url,
+                    )
+                return []
+
+        except OSError:
+            if warn_if_missing:
+                logging.warning(
+                    "Could not find logfile '%s' nor log archive '%s'.",
+                    log_file,
+                    log_zip_url,
+                )
+            return []
+
+
 class RunResult(object):
     """
     The class RunResult contains the results of a single verification run.
     """
 
+    # reduce per-instance memory consumption, tables can have many runs
+    __slots__ = (
+        "task_id",
+        "sourcefiles_exist",
+        "status",
+        "log_file",
+        "columns",
+        "values",
+        "category",
+        "score",
+        "columns_relevant_for_diff",
+        "samples",
+    )
+
     def __init__(
         self,
         task_id,
@@ -768,17 +1110,22 @@ class RunResult(object):
         values,
         columns_relevant_for_diff=set(),
         sourcefiles_exist=True,
+        samples=(),
     ):
         assert len(columns) == len(values)
+        assert all(len(columns) == len(sample) for sample in samples)
         self.task_id = task_id
         self.sourcefiles_exist = sourcefiles_exist
         self.status = status
         self.log_file = log_file
         self.columns = columns
-        self.values = values
+        self.values = tuple(values)
         self.category = category
         self.score = score
         self.columns_relevant_for_diff = columns_relevant_for_diff
+        # for runs that were executed repeatedly, the values of each repetition
+        # (only for the columns with values from the XML)
+        self.samples = samples
 
     @staticmethod
     def create_from_xml(
@@ -795,63 +1142,6 @@ class RunResult(object):
         Only columns that should be part of the table are collected.
         """
 
-        def read_logfile_lines(log_file):
-            if not log_file:
-                return []
-            log_file_url = util.make_url(log_file)
-            url_parts = urllib.parse.urlparse(log_file_url, allow_fragments=False)
-            log_zip_path = os.path.dirname(url_parts.path) + ".zip"
-            log_zip_url = urllib.parse.urlunparse(
-                (
-                    url_parts.scheme,
-                    url_parts.netloc,
-                    log_zip_path,
-                    url_parts.params,
-                    url_parts.query,
-                    url_parts.fragment,
-                )
-            )
-            path_in_zip = urllib.parse.unquote(
-                # os.path.relpath creates os-dependant paths, but windows separators can produce errors with zipfile lib
-                util.fix_path_if_on_windows(
-                    os.path.relpath(url_parts.path, os.path.dirname(log_zip_path))
-                )
-            )
-            if log_zip_url.startswith("file:///") and not log_zip_path.startswith("/"):
-                # Replace file:/// with file: for relative paths,
-                # otherwise opening fails.
-                log_zip_url = "file:" + log_zip_url[8:]
-
-            try:
-                with util.open_url_seekable(log_file_url, "rt") as logfile:
-                    return logfile.readlines()
-            except OSError:
-                try:
-                    if log_zip_url not in log_zip_cache:
-                        log_zip_cache[log_zip_url] = zipfile.ZipFile(
-                            util.open_url_seekable(log_zip_url, "rb")
-                        )
-                    log_zip = log_zip_cache[log_zip_url]
-
-                    try:
-                        with io.TextIOWrapper(log_zip.open(path_in_zip)) as logfile:
-                            return logfile.readlines()
-                    except KeyError:
-                        logging.warning(
-                            "Could not find logfile '%s' in archive '%s'.",
-                            log_file,
-                            log_zip_url,
-                        )
-                        return []
-
-                except OSError:
-                    logging.warning(
-                        "Could not find logfile '%s' nor log archive '%s'.",
-                        log_file,
-                        log_zip_url,
-                    )
-                    return []
-
         sourcefiles = sourcefileTag.get("files")
         if sourcefiles:
             if not sourcefiles.startswith("["):
@@ -874,8 +1164,14 @@ class RunResult(object):
         )
         task_id = TaskId(task_name, prop, expected_result, sourcefileTag.get("runset"))
 
+        # there are only few different values for status and category,
+        # so share equal strings
         status = util.get_column_value(sourcefileTag, "status", "")
+        if status:
+            status = sys.intern(status)
         category = util.get_column_value(sourcefileTag, "category")
+        if category:
+            category = sys.intern(category)
         if not category:
             if status:  # only category missing
                 category = result.CATEGORY_MISSING
@@ -901,7 +1197,9 @@ class RunResult(object):
 
                 else:  # collect values from logfile
                     if logfileLines is None:  # cache content
-                        logfileLines = read_logfile_lines(sourcefileTag.get("logfile"))
+                        logfileLines = read_logfile_lines(
+                            sourcefileTag.get("logfile"), log_zip_cache
+                        )
 
                     value = get_value_from_logfile(logfileLines, column.pattern)
 
@@ -911,6 +1209,18 @@ class RunResult(object):
                 value = str(score)
             values.append(value)
 
+        samples = ()
+        if not correct_only or category == result.CATEGORY_CORRECT:
+            samples = tuple(
+                tuple(
+                    util.get_column_value(sample_tag, column.title)
+                    if not column.pattern or column.href
+                    else None
+                    for column in listOfColumns
+                )
+                for sample_tag in sourcefileTag.findall("sample")
+            )
+
         return RunResult(
             task_id,
             status,
@@ -921,8 +1231,43 @@ class RunResult(object):
             values,
             columns_relevant_for_diff,
             sourcefiles_exist=sourcefiles_exist,
+            samples=samples,
+        )
+
+
+class _ColumnarRunResults(
+    collections.namedtuple(
+        "_ColumnarRunResults",
+        "task_ids status category score log_file columns values "
+        "columns_relevant_for_diff sourcefiles_exist samples",
+    )
+):
+    """
+    Column-wise representation of a list of RunResult instances
+    with one tuple per attribute, which can be pickled much faster.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def from_run_results(run_results):
+        def get_all(attribute):
+            return tuple(getattr(run_result, attribute) for run_result in run_results)
+
+        return _ColumnarRunResults(
+            task_ids=tuple(zip(*get_all("task_id"))),
+            **{
+                attribute: get_all(attribute)
+                for attribute in _ColumnarRunResults._fields[1:]
+            },
         )
 
+    def to_run_results(self):
+        return [
+            RunResult(TaskId(*task_id), *attributes)
+            for task_id, *attributes in zip(zip(*self.task_ids), *self[1:])
+        ]
+
 
 class Row(object):
     """
@@ -1013,7 +1358,11 @@ def get_rows(runSetResults):
 
 def filter_rows_with_differences(rows):
     """
-    Find all rows with differences in the status column.
+    Find all rows with differences in the columns that are relevant for the diff
+    (by default the status column).
+    Values in columns with a tolerance for differences (diffAbsoluteTolerance and
+    diffRelativeTolerance in table definitions) are considered different only if they
+    differ by more than all given tolerances.
     """
     if not rows:
         # empty table
@@ -1022,36 +1371,49 @@ def filter_rows_with_differences(rows):
         # table with single column
         return []
 
-    def get_index_of_column(name, cols):
-        assert cols, "Cannot look for column '{}' in empy column list".format(name)
-        for i in range(0, len(cols)):
-            if cols[i].title == name:
-                return i
-        assert False, "Column '{}' not found in columns '{}'".format(name, cols)
-
-    def all_equal_result(listOfResults):
-        relevant_columns = set()
-        for res in listOfResults:
-            for relevant_column in res.columns_relevant_for_diff:
-                relevant_columns.add(relevant_column)
-        if len(relevant_columns) == 0:
-            relevant_columns.add("status")
-
-        status = []
-        for col in relevant_columns:
-            # It's necessary to search for the index of a column every time
-            # because they can differ between results
-            status.append(
-                {
-                    res.values[get_index_of_column(col, res.columns)]
-                    for res in listOfResults
-                    if res.values
-                }
-            )
+    # The comparison is done column-wise for all rows at once,
+    # such that we need to determine the columns and tolerances only once.
+    results_per_run_set = [
+        results for results in rows_to_columns(rows) if results[0].columns
+    ]
 
-        return functools.reduce(lambda x, y: x and (len(y) <= 1), status, True)
+    relevant_columns = set()
+    for results in results_per_run_set:
+        # the sets are shared by most results, so check each set only once
+        for columns_relevant_for_diff in {
+            id(res.columns_relevant_for_diff): res.columns_relevant_for_diff
+            for res in results
+        }.values():
+            relevant_columns.update(columns_relevant_for_diff)
+    if len(relevant_columns) == 0:
+        relevant_columns.add("status")
+
+    has_difference = [False] * len(rows)
+    for column_title in relevant_columns:
+        columns = [
+            _get_column_by_title(column_title, results[0].columns)
+            for results in results_per_run_set
+        ]
+        values = [
+            [res.values[index] for res in results]
+            for (index, _), results in zip(columns, results_per_run_set)
+        ]
+        absolute_tolerance, relative_tolerance = _get_diff_tolerance(
+            column for _, column in columns
+        )
+        if absolute_tolerance is None and relative_tolerance is None:
+            column_has_difference = _get_exact_differences(values)
+        else:
+            numbers = [
+                _get_numbers_for_diff(column_values, column)
+                for column_values, (_, column) in zip(values, columns)
+            ]
+            column_has_difference = _get_differences_with_tolerance(
+                values, numbers, absolute_tolerance or 0, relative_tolerance or 0
+            )
+        has_difference = list(map(operator.or_, has_difference, column_has_difference))
 
-    rowsDiff = [row for row in rows if not all_equal_result(row.results)]
+    rowsDiff = [row for row, differs in zip(rows, has_difference) if differs]
 
     if len(rowsDiff) == 0:
         logging.info("---> NO DIFFERENCE FOUND IN SELECTED COLUMNS")
@@ -1064,6 +1426,87 @@ def filter_rows_with_differences(rows):
     return rowsDiff
 
 
+def _get_column_by_title(name, cols):
+    """Return the index and the Column instance with the given title."""
+    assert cols, "Cannot look for column '{}' in empy column list".format(name)
+    for i, column in enumerate(cols):
+        if column.title == name:
+            return i, column
+    assert False, "Column '{}' not found in columns '{}'".format(name, cols)
+
+
+def _get_diff_tolerance(columns):
+    """
+    Return the absolute and relative tolerance for differences of a column,
+    which is taken from the first of the given Column instances that defines one.
+    """
+    for column in columns:
+        if (
+            column.diff_absolute_tolerance is not None
+            or column.diff_relative_tolerance is not None
+        ):
+            return (
+                None
+                if column.diff_absolute_tolerance is None
+                else float(column.diff_absolute_tolerance),
+                None
+                if column.diff_relative_tolerance is None
+                else float(column.diff_relative_tolerance),
+            )
+    return None, None
+
+
+def _get_exact_differences(values):
+    """
+    For a list of value lists (one per run set), return for each row
+    whether the values differ.
+    """
+    if len(values) == 2:
+        return map(operator.ne, *values)
+    return (len(set(row_values)) > 1 for row_values in zip(*values))
+
+
+def _get_numbers_for_diff(values, column):
+    """
+    Convert the given values of a column into floats in the display unit of the column
+    (None for values that are not finite numbers).
+    """
+    scale_factor = float(column.scale_factor or 1)
+    numbers = []
+    for value in values:
+        number = None
+        if value:
+            try:
+                number = float(util.remove_unit(value.strip())) * scale_factor
+            except ValueError:
+                pass
+            else:
+                if not math.isfinite(number):
+                    number = None
+        numbers.append(number)
+    return numbers
+
+
+def _get_differences_with_tolerance(
+    values, numbers, absolute_tolerance, relative_tolerance
+):
+    """
+    For a list of value lists and a list of corresponding number lists (one per run
+    set), return for each row whether the numbers differ by more than both tolerances.
+    Rows in which not all values are numbers are compared exactly.
+    """
+    for row_values, row_numbers in zip(zip(*values), zip(*numbers)):
+        if None in row_numbers:
+            yield len(set(row_values)) > 1
+        else:
+            low = min(row_numbers)
+            high = max(row_numbers)
+            difference = high - low
+            yield difference > absolute_tolerance and difference > (
+                relative_tolerance * min(abs(low), abs(high))
+            )
+
+
 def format_run_set_attributes_nicely(runSetResults):
     """Replace the attributes of each RunSetResult with nicely formatted strings."""
     for runSetResult in runSetResults:
@@ -1235,21 +1678,28 @@ def get_regression_count(rows, ignoreFlappingTimeouts):  # for options.dump_coun
 
 
 def get_counts(rows):  # for options.dump_counts
-    countsList = []
-
-    for runResults in rows_to_columns(rows):
-        counts = collections.Counter(runResult.category for runResult in runResults)
-        countsList.append(
-            (
-                counts[result.CATEGORY_CORRECT],
-                counts[result.CATEGORY_WRONG],
-                counts[result.CATEGORY_UNKNOWN]
-                + counts[result.CATEGORY_ERROR]
-                + counts[None],  # for rows without a result
-            )
+    return [
+        _summarize_category_counts(
+            collections.Counter(runResult.category for runResult in runResults)
         )
+        for runResults in rows_to_columns(rows)
+    ]
 
-    return countsList
+
+def _summarize_category_counts(counts):
+    return (
+        counts[result.CATEGORY_CORRECT],
+        counts[result.CATEGORY_WRONG],
+        counts[result.CATEGORY_UNKNOWN]
+        + counts[result.CATEGORY_ERROR]
+        + counts[None],  # for rows without a result
+    )
+
+
+def print_counts(counts_list):  # for options.dump_counts
+    print("STATS")
+    for counts in counts_list:
+        print(" ".join(str(e) for e in counts))
 
 
 def create_tables(
@@ -1368,21 +1818,71 @@ def write_csv_table(
         [column.format_title() for run_set in run_sets for column in run_set.columns],
     )
 
-    for row in rows:
-        # row.short_filename may contain paths, so standardize the output across OSs
-        out.write(util.fix_path_if_on_windows(row.short_filename))
-        for row_id, is_relevant in zip(row.id[1:], relevant_id_columns[1:]):
-            if is_relevant:
-                out.write(sep)
-                if row_id is not None:
-                    out.write(str(row_id))
-        for run_result in row.results:
-            for value, column in zip(run_result.values, run_result.columns):
-                out.write(sep)
-                out.write(column.format_value(value or "", "csv"))
+    # Formatting column-wise is much faster than calling format_value() for each cell.
+    formatted_columns = [
+        column.format_values_for_csv([row.results[i].values[j] for row in rows])
+        for i, run_set in enumerate(run_sets)
+        for j, column in enumerate(run_set.columns)
+    ]
+    formatted_rows = (
+        zip(*formatted_columns) if formatted_columns else itertools.repeat(())
+    )
+
+    for row, values in zip(rows, formatted_rows):
+        line = [
+            # row.short_filename may contain paths, so standardize the output across OSs
+            util.fix_path_if_on_windows(row.short_filename)
+        ]
+        line.extend(
+            "" if row_id is None else str(row_id)
+            for row_id, is_relevant in zip(row.id[1:], relevant_id_columns[1:])
+            if is_relevant
+        )
+        line.extend(values)
+        out.write(sep.join(line))
         out.write("\n")
 
 
+def write_statistics_csv(out, run_sets, sep="\t"):
+    """
+    Write the statistics of the given run sets (cf. create_statistics())
+    with one line for each run set, column, and kind of statistics.
+    """
+
+    def format_stat_value(column, key, value):
+        if value is None:
+            return ""
+        if not column.is_numeric():
+            return str(value)
+        if key == "avg" or key == "stdev":
+            return column.format_value(value, "tooltip_stochastic")
+        return column.format_value(value, "csv")
+
+    stat_keys = ["sum", "min", "max", "avg", "median", "stdev"]
+    out.write(sep.join(["run set", "file", "column", "statistics"] + stat_keys))
+    out.write("\n")
+    for run_set in run_sets:
+        for column, column_stats in zip(run_set.columns, run_set.stats):
+            if not column_stats:
+                continue
+            for field in STATISTICS_FIELDS:
+                stat_value = getattr(column_stats, field)
+                if stat_value is None:
+                    continue
+                line = [
+                    run_set.attributes["niceName"],
+                    # file name may contain paths, so standardize the output across OSs
+                    util.fix_path_if_on_windows(run_set.attributes["filename"]),
+                    column.format_title(),
+                    field,
+                ] + [
+                    format_stat_value(column, key, getattr(stat_value, key))
+                    for key in stat_keys
+                ]
+                out.write(sep.join(line))
+                out.write("\n")
+
+
 def write_table_in_format(template_format, outfile, options, **kwargs):
     callback = {"csv": write_csv_table, "html": htmltable.write_html_table}[
         template_format
@@ -1393,7 +1893,7 @@ def write_table_in_format(template_format, outfile, options, **kwargs):
         # declares itself to be UTF-8 in a meta tag.
         encoding = "utf-8" if template_format == "html" else None
         with open(outfile, "w", encoding=encoding) as out:
-            callback(out, options=options, **kwargs)
+            callback(out, options=options, outfile=outfile, **kwargs)
 
         if options.show_table and template_format == "html":
             system = platform.system()
@@ -1445,10 +1945,12 @@ def create_argument_parser():
     parser.add_argument(
         "-x",
         "--xml",
-        action="store",
+        action="append",
         type=str,
-        dest="xmltablefile",
-        help="XML file with the table definition.",
+        dest="xmltablefiles",
+        help="XML file with the table definition. "
+        "Can be specified multiple times for creating the tables of several "
+        "table definitions at once, which loads each result file only once.",
     )
     parser.add_argument(
         "-o",
@@ -1546,6 +2048,76 @@ def create_argument_parser():
         "by default. Valid values can be copied from the URL part after '#' of a table "
         "when the table is in the desired state. (Example: '/table')",
     )
+    parser.add_argument(
+        "--compact-html",
+        action="store_true",
+        dest="compact_html",
+        help="Store the data of HTML tables in a compact column-wise encoding, "
+        "which is much smaller for tables with many rows.",
+    )
+    parser.add_argument(
+        "--compress-html",
+        action="store_true",
+        dest="compress_html",
+        help="Additionally compress the data of HTML tables (implies --compact-html). "
+        "Such tables can be viewed only in browsers that support DecompressionStream.",
+    )
+    parser.add_argument(
+        "--html-chunk-size",
+        action="store",
+        type=int,
+        metavar="ROWS",
+        dest="html_chunk_size",
+        help="Write the rows of HTML tables into separate data files "
+        "with the given number of rows each instead of into the HTML file itself. "
+        "The data files are placed into a directory next to the table "
+        "and loaded only when their rows are shown (implies --compact-html).",
+    )
+    parser.add_argument(
+        "--external-assets",
+        action="store_true",
+        dest="external_assets",
+        help="Do not embed the JavaScript and CSS code into HTML tables, "
+        "but write it into separate files next to the tables "
+        "(with a hash of the content in the file name) and reference them. "
+        "All tables in the same directory share these files.",
+    )
+    parser.add_argument(
+        "--http-cache",
+        dest="http_cache",
+        metavar="DIR",
+        help="Cache result files that are downloaded from HTTP(S) URLs "
+        "in the given directory and use the cached copy as long as the server "
+        "reports that the file was not changed (based on ETag and Last-Modified).",
+    )
+    parser.add_argument(
+        "--performance-report",
+        action="store_true",
+        dest="performance_report",
+        help="Additionally write a file NAME.performance.csv that compares "
+        "cputime, walltime, and memory of each task between consecutive groups of "
+        "run sets. Repetitions of the same run set (same tool, version, options, "
+        "etc.) form a group, and changes of the median value of a task are marked "
+        "if they are significant according to a bootstrap confidence interval.",
+    )
+    parser.add_argument(
+        "--plot-time-series",
+        action="store_true",
+        dest="plot_time_series",
+        help="Additionally create SVG plots of memory usage and CPU utilization "
+        "over time for all runs for which benchexec recorded this "
+        "(cf. --time-series-interval of benchexec) in a directory NAME.timeseries.",
+    )
+    parser.add_argument(
+        "--statistics-only",
+        action="store_true",
+        dest="statistics_only",
+        help="Do not create tables, but only write the summary statistics "
+        "of each result file into a file NAME.statistics.csv. "
+        "The result files are streamed, so this needs little memory "
+        "even for many large result files. "
+        "Medians are estimated with a relative error of at most 1%%.",
+    )
     parser.add_argument(
         "--version", action="version", version="%(prog)s " + __version__
     )
@@ -1570,6 +2142,45 @@ def main(args=None):
         level=logging.WARNING if options.quiet else logging.INFO,
     )
 
+    if options.html_chunk_size is not None and options.html_chunk_size <= 0:
+        arg_parser.error("Chunk size for HTML tables needs to be positive.")
+    if options.outputPath == "-":
+        if options.external_assets:
+            arg_parser.error("--external-assets cannot be used for writing to stdout.")
+        if options.html_chunk_size:
+            arg_parser.error("--html-chunk-size cannot be used for writing to stdout.")
+    if options.xmltablefiles:
+        # Each table definition is handled only once,
+        # otherwise several jobs would write the same output files concurrently.
+        options.xmltablefiles = list(
+            collections.OrderedDict.fromkeys(
+                os.path.normpath(xmltablefile) for xmltablefile in options.xmltablefiles
+            )
+        )
+    if options.output_name and len(options.xmltablefiles or []) > 1:
+        arg_parser.error(
+            "--name cannot be used together with several table-definition files."
+        )
+    if options.xmltablefiles and options.outputPath != "-":
+        output_names = {}
+        for xmltablefile in options.xmltablefiles:
+            output_name = os.path.join(
+                os.path.normpath(
+                    options.outputPath or os.path.dirname(xmltablefile) or "."
+                ),
+                basename_without_ending(xmltablefile),
+            )
+            if output_name in output_names:
+                arg_parser.error(
+                    "Table-definition files {} and {} would produce tables "
+                    "with the same name.".format(
+                        output_names[output_name], xmltablefile
+                    )
+                )
+            output_names[output_name] = xmltablefile
+
+    remote.set_cache_dir(options.http_cache)
+
     global parallel
     import concurrent.futures
 
@@ -1581,6 +2192,30 @@ def main(args=None):
     # Use up to cpu_count*2 workers because some tasks are I/O bound.
     parallel = concurrent.futures.ProcessPoolExecutor(max_workers=cpu_count * 2)
 
+    # All tables are created with the same process pool,
+    # and result files that occur in several tables are loaded only once.
+    futures = []
+    for xmltablefile in options.xmltablefiles or [None]:
+        table_options = copy.copy(options)
+        table_options.xmltablefile = xmltablefile
+        futures += create_tables_for_options(table_options, arg_parser)
+
+    for f in futures:
+        f.result()  # to get any exceptions that may have occurred
+    # All tables are written, so the loaded results are no longer needed.
+    _loaded_results.clear()
+    logging.info("done")
+
+    parallel.shutdown(wait=True)
+
+
+def create_tables_for_options(options, arg_parser):
+    """
+    Load the results and create the tables for one table definition
+    (or the result files given on the command line).
+    @param options: the options with the table-definition file in xmltablefile
+    @return: a list of futures for the tables that are being written
+    """
     name = options.output_name
     outputPath = options.outputPath
     if outputPath == "-":
@@ -1666,6 +2301,10 @@ def main(args=None):
     if not runSetResults:
         handle_error("No benchmark results found.")
 
+    if options.statistics_only:
+        create_statistics(name, runSetResults, outputPath, outputFilePattern, options)
+        return []
+
     logging.info("Merging results...")
     if options.common:
         find_common_tasks(runSetResults)
@@ -1678,6 +2317,10 @@ def main(args=None):
         handle_error("No results found, no tables produced.")
     rowsDiff = filter_rows_with_differences(rows) if options.write_diff_table else []
 
+    if options.performance_report:
+        # needs to be done before attributes are formatted in create_tables()
+        performance_groups = performance.group_run_sets(runSetResults)
+
     logging.info("Generating table...")
     if not os.path.isdir(outputPath) and not outputFilePattern == "-":
         os.makedirs(outputPath)
@@ -1685,22 +2328,200 @@ def main(args=None):
         name, runSetResults, rows, rowsDiff, outputPath, outputFilePattern, options
     )
 
+    if options.performance_report:
+        create_performance_report(
+            name, rows, performance_groups, outputPath, outputFilePattern
+        )
+
+    if options.plot_time_series:
+        create_time_series_plots(name, runSetResults, outputPath)
+
     if options.dump_counts:  # print some stats for Buildbot
         print(
             "REGRESSIONS {}".format(
                 get_regression_count(rows, options.ignoreFlappingTimeouts)
             )
         )
-        countsList = get_counts(rows)
-        print("STATS")
-        for counts in countsList:
-            print(" ".join(str(e) for e in counts))
+        print_counts(get_counts(rows))
 
-    for f in futures:
-        f.result()  # to get any exceptions that may have occurred
-    logging.info("done")
+    return futures
 
-    parallel.shutdown(wait=True)
+
+def create_time_series_plots(name, runSetResults, outputPath):
+    """
+    Write an SVG plot for each run that has a time-series file
+    next to its log file into the directory NAME.timeseries.
+    """
+    plot_dir = os.path.join(outputPath, name + ".timeseries")
+    log_zip_cache = {}
+    count = 0
+    try:
+        for index, run_set_result in enumerate(runSetResults):
+            for run_result in run_set_result.results:
+                time_series_file = timeseries.get_time_series_file(run_result.log_file)
+                lines = read_logfile_lines(
+                    time_series_file, log_zip_cache, warn_if_missing=False
+                )
+                samples = timeseries.parse_time_series(lines)
+                if not samples:
+                    continue
+                os.makedirs(plot_dir, exist_ok=True)
+                plot_name = "{}.{}.svg".format(
+                    index, os.path.basename(time_series_file)[: -len(".csv")]
+                )
+                with open(os.path.join(plot_dir, plot_name), "w") as f:
+                    f.write(timeseries.plot_svg(samples, run_result.task_id.name))
+                count += 1
+    finally:
+        for file in log_zip_cache.values():
+            file.close()
+
+    if count:
+        logging.info("Created %s plots of resource usage in %s.", count, plot_dir)
+    else:
+        logging.warning("No time series of resource usage found for any run.")
+
+
+def create_performance_report(name, rows, groups, outputPath, outputFilePattern):
+    """
+    Compare the performance for each task between consecutive groups of repeated
+    run sets (as returned by performance.group_run_sets()) and write the result.
+    """
+    if len(groups) < 2:
+        logging.warning(
+            "No performance report created, results of at least two different "
+            "run sets are necessary (repetitions of the same run set are grouped)."
+        )
+        return
+
+    run_set_columns = list(rows_to_columns(rows))
+    # If runs were executed repeatedly by benchexec, each repetition is treated
+    # like a repetition of the whole run set.
+    repetitions = [
+        max([len(res.samples) for res in results] + [1]) for results in run_set_columns
+    ]
+    if any(
+        sum(repetitions[i] for i in indices) < performance.MIN_REPETITIONS
+        for _, indices in groups
+    ):
+        logging.warning(
+            "Some run sets are not repeated at least %s times, "
+            "changes in their performance cannot be judged.",
+            performance.MIN_REPETITIONS,
+        )
+
+    logging.info("Comparing performance of %s groups of run sets...", len(groups))
+    comparison_keys = []
+    old_values = []
+    new_values = []
+    for metric in performance.METRICS:
+        metric_column = None
+        values = []  # for each run set a list of values for each repetition
+        for results, repetition_count in zip(run_set_columns, repetitions):
+            for index, column in enumerate(results[0].columns):
+                if column.title == metric:
+                    metric_column = metric_column or column
+                    if any(res.samples for res in results):
+                        values.append(
+                            [
+                                _get_numbers_for_diff(
+                                    (
+                                        res.samples[repetition][index]
+                                        if repetition < len(res.samples)
+                                        else None
+                                        for res in results
+                                    ),
+                                    column,
+                                )
+                                for repetition in range(repetition_count)
+                            ]
+                        )
+                    else:
+                        values.append(
+                            [
+                                _get_numbers_for_diff(
+                                    (res.values[index] for res in results), column
+                                )
+                            ]
+                        )
+                    break
+            else:
+                values.append([[None] * len(rows)])
+        if metric_column is None:
+            continue
+
+        for old_group, new_group in zip(range(len(groups)), range(1, len(groups))):
+            comparison_keys.append((metric_column.format_title(), old_group, new_group))
+            old_values.append([v for i in groups[old_group][1] for v in values[i]])
+            new_values.append([v for i in groups[new_group][1] for v in values[i]])
+
+    comparisons = []
+    for (metric, old_group, new_group), task_comparisons in zip(
+        comparison_keys,
+        parallel.map(performance.compare_groups, old_values, new_values),
+    ):
+        significant_changes = 0
+        for row, comparison in zip(rows, task_comparisons):
+            if comparison:
+                comparisons.append(
+                    (
+                        row.short_filename,
+                        row.id.property and row.id.property.name,
+                        metric,
+                        old_group,
+                        new_group,
+                        comparison,
+                    )
+                )
+                if performance.is_significant(comparison):
+                    significant_changes += 1
+        logging.info(
+            "%s significant changes of %s from '%s' to '%s'.",
+            significant_changes,
+            metric,
+            groups[old_group][0],
+            groups[new_group][0],
+        )
+
+    if outputFilePattern == "-":
+        logging.info("Writing performance report to stdout...")
+        performance.write_performance_csv(sys.stdout, groups, comparisons)
+    else:
+        outfile = os.path.join(outputPath, name + ".performance.csv")
+        logging.info("Writing performance report into %s ...", outfile)
+        with open(outfile, "w") as out:
+            performance.write_performance_csv(out, groups, comparisons)
+
+
+def create_statistics(name, runSetResults, outputPath, outputFilePattern, options):
+    """
+    Write the statistics of results that were loaded by load_result_statistics().
+    """
+    if not options.correct_only:
+        for runSetResult in runSetResults:
+            statistics.add_local_summary_statistics(runSetResult, runSetResult.stats)
+    format_run_set_attributes_nicely(runSetResults)
+
+    if outputFilePattern == "-":
+        logging.info("Writing statistics to stdout...")
+        write_statistics_csv(sys.stdout, runSetResults)
+    else:
+        if not os.path.isdir(outputPath):
+            os.makedirs(outputPath)
+        outfile = os.path.join(outputPath, name + ".statistics.csv")
+        logging.info("Writing statistics into %s ...", outfile)
+        with open(outfile, "w") as out:
+            write_statistics_csv(out, runSetResults)
+
+    if options.dump_counts:  # print some stats for Buildbot
+        logging.warning(
+            "Regressions are not counted with --statistics-only "
+            "because this needs the results for each task."
+        )
+        print_counts(
+            _summarize_category_counts(runSetResult.category_counts)
+            for runSetResult in runSetResults
+        )
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@
 
 import re
 import decimal
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from math import floor, ceil, log10
 import logging
 
@@ -38,11 +38,15 @@ GROUP_EXPONENT_PART = 7
 GROUP_EXPONENT_SIGN = 8
 GROUP_EXPONENT_VALUE = 9
 GROUP_UNIT = 10
+# Numbers in plain decimal notation without superfluous leading zeros,
+# optionally followed by a unit, which format_values_for_csv() handles directly.
+REGEX_PLAIN_NUMBER = re.compile(r"(-?(0|[1-9][0-9]*)(?:\.([0-9]+))?)[^0-9]*")
 POSSIBLE_FORMAT_TARGETS = ["html", "html_cell", "tooltip", "tooltip_stochastic", "csv"]
 
 DEFAULT_NUMBER_OF_SIGNIFICANT_DIGITS = 3
 
 _ONE = Decimal(1)
+_ONE_TUPLE = _ONE.as_tuple()
 UNIT_CONVERSION = {
     "s": {"ms": 1000, "min": _ONE / 60, "h": _ONE / 3600},
     "B": {"kB": Decimal("1e-3"), "MB": Decimal("1e-6"), "GB": Decimal("1e-9")},
@@ -141,6 +145,8 @@ class Column(object):
         scale_factor=None,
         relevant_for_diff=None,
         display_title=None,
+        diff_absolute_tolerance=None,
+        diff_relative_tolerance=None,
     ):
 
         # If scaling on the variables is performed, a display unit must be defined, explicitly
@@ -161,8 +167,19 @@ class Column(object):
         self.source_unit = source_unit
         self.scale_factor = Decimal(scale_factor) if scale_factor else scale_factor
         self.href = href
+        # Tolerances for the difference table (in the display unit of the column),
+        # if set, the column is relevant for the difference table by default.
+        self.diff_absolute_tolerance = _parse_tolerance(
+            diff_absolute_tolerance, title, False
+        )
+        self.diff_relative_tolerance = _parse_tolerance(
+            diff_relative_tolerance, title, True
+        )
         if relevant_for_diff is None:
-            self.relevant_for_diff = False
+            self.relevant_for_diff = (
+                diff_absolute_tolerance is not None
+                or diff_relative_tolerance is not None
+            )
         else:
             self.relevant_for_diff = (
                 True if relevant_for_diff.lower() == "true" else False
@@ -262,6 +279,71 @@ class Column(object):
         else:
             return util.print_decimal(number)
 
+    def format_values_for_csv(self, values):
+        """
+        Format a list of values for CSV output.
+        The result is the same as from calling format_value(value or "", "csv")
+        for each value, but this is much faster for large tables because everything
+        that depends only on the column is determined once and most values
+        do not need to be parsed with regular expressions.
+
+        @param values: the values of this column (strings or None)
+        @return: a list of formatted strings
+        """
+        if not self.is_numeric():
+            return [value or "" for value in values]
+
+        scale_factor = self.scale_factor
+        if scale_factor is not None and Decimal(scale_factor).as_tuple() == _ONE_TUPLE:
+            scale_factor = None  # multiplication with 1 would not change anything
+        number_of_significant_digits = self.get_number_of_significant_digits("csv")
+        # Decimal operations round to this number of digits, so longer numbers
+        # are left to format_value() even if they are not scaled.
+        max_length = decimal.getcontext().prec
+        match_plain_number = REGEX_PLAIN_NUMBER.fullmatch
+        # For finite numbers, this is the same as util.print_decimal() but faster.
+        print_decimal = "{:f}".format
+
+        def format_csv_value(value):
+            if not value:
+                return ""
+            match = (
+                match_plain_number(value.strip()) if isinstance(value, str) else None
+            )
+            if not match or len(match.group(1)) > max_length:
+                return self.format_value(value, "csv")
+            number_str, int_part, dec_part = match.groups()
+
+            if number_of_significant_digits is None:
+                if scale_factor is None:
+                    return number_str
+                return print_decimal(Decimal(number_str) * scale_factor)
+
+            number = Decimal(number_str)
+            if not number:
+                # zero is formatted depending on the column type
+                return self.format_value(value, "csv")
+            # same as _get_significant_digits(number_str)
+            if int_part == "0":
+                current_significant_digits = len(dec_part.lstrip("0"))
+            else:
+                current_significant_digits = len(int_part) + len(dec_part or "")
+
+            if scale_factor is not None:
+                number *= scale_factor
+            # same as _format_number() for format target csv
+            intended_digits = min(
+                current_significant_digits, number_of_significant_digits
+            )
+            rounded_value = round(number, intended_digits - 1 - number.adjusted())
+            formatted_value = print_decimal(rounded_value)
+            if rounded_value.adjusted() > number.adjusted() and "." in formatted_value:
+                # Rounding added a digit (e.g., 9.99 to 10.0), cut one trailing zero.
+                formatted_value = formatted_value[:-1].rstrip(".")
+            return formatted_value
+
+        return [format_csv_value(value) for value in values]
+
     def set_column_type_from(self, column_values):
         """
         Sets the type of this column using a heuristic reading the given column_values.
@@ -424,6 +506,30 @@ def _is_to_cut(value, format_target):
     return correct_target and "." in value and 1 > Decimal(value) >= 0
 
 
+def _parse_tolerance(tolerance, title, is_percentage):
+    """
+    Parse the value of a tolerance attribute for the difference table.
+    Relative tolerances are given in percent (optionally with "%")
+    and are returned as fraction.
+    """
+    if tolerance is None:
+        return None
+    value = tolerance.strip()
+    if is_percentage and value.endswith("%"):
+        value = value[:-1]
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite() or value < 0:
+        raise util.TableDefinitionError(
+            "Invalid tolerance '{}' for difference table (in column {})".format(
+                tolerance, title
+            )
+        )
+    return value / 100 if is_percentage else value
+
+
 def _get_column_type_heur(column, column_values):
     if column.title == "status":
         return ColumnType.status
@@ -0,0 +1,198 @@
+// This file is part of BenchExec, a framework for reliable benchmarking:
+// https://github.com/sosy-lab/benchexec
+//
+// SPDX-FileCopyrightText: 2019-2020 Dirk Beyer <https://www.sosy-lab.org>
+//
+// SPDX-License-Identifier: Apache-2.0
+
+// Restores the rows of window.data if table-generator has written them
+// in the compact (and possibly compressed) encoding of htmltable.py.
+// If the rows are in separate data files,
+// it provides window.benchexecLoadRows() for loading them on demand.
+// This script is not part of the React app because it needs to run before it.
+(function () {
+  "use strict";
+
+  const DEFERRED_SCRIPT_TYPE = "text/x-benchexec-app";
+
+  function valueGetter(encoded, strings) {
+    if (!encoded) {
+      return () => null;
+    }
+    if (encoded.d) {
+      const indices = encoded.d;
+      return (i) => strings[indices[i]];
+    }
+    const values = encoded.v;
+    return (i) => values[i];
+  }
+
+  function linkGetter(encoded, strings) {
+    if (!encoded) {
+      return () => null;
+    }
+    const prefix = valueGetter(encoded.prefix, strings);
+    const name = valueGetter(encoded.name, strings);
+    return (i) => {
+      const prefixValue = prefix(i);
+      return prefixValue === null ? null : prefixValue + name(i);
+    };
+  }
+
+  function setIfPresent(object, key, value) {
+    if (value !== null) {
+      object[key] = value;
+    }
+  }
+
+  function decodeRows(encoded) {
+    const strings = encoded.strings;
+    const ids = encoded.id.map((id) => valueGetter(id, strings));
+    const rowHref = linkGetter(encoded.href, strings);
+    const runSets = encoded.results.map((runSet) => ({
+      category: valueGetter(runSet.category, strings),
+      score: valueGetter(runSet.score, strings),
+      href: linkGetter(runSet.href, strings),
+      values: runSet.values.map((value) => ({
+        href: linkGetter(value.href, strings),
+        raw: valueGetter(value.raw, strings),
+        html: valueGetter(value.html, strings),
+      })),
+    }));
+
+    const rows = new Array(encoded.count);
+    for (let i = 0; i < encoded.count; i++) {
+      const row = { id: [] };
+      ids.forEach((id) => {
+        const idValue = id(i);
+        if (idValue !== null) {
+          row.id.push(idValue);
+        }
+      });
+      row.results = runSets.map((runSet) => {
+        const result = {};
+        setIfPresent(result, "category", runSet.category(i));
+        setIfPresent(result, "score", runSet.score(i));
+        setIfPresent(result, "href", runSet.href(i));
+        result.values = runSet.values.map((value) => {
+          const cell = {};
+          setIfPresent(cell, "href", value.href(i));
+          setIfPresent(cell, "raw", value.raw(i));
+          setIfPresent(cell, "html", value.html(i));
+          return cell;
+        });
+        return result;
+      });
+      setIfPresent(row, "href", rowHref(i));
+      rows[i] = row;
+    }
+    return rows;
+  }
+
+  async function decompress(base64) {
+    const bytes = Uint8Array.from(atob(base64), (c) => c.charCodeAt(0));
+    const stream = new Blob([bytes])
+      .stream()
+      .pipeThrough(new DecompressionStream("deflate"));
+    return JSON.parse(await new Response(stream).text());
+  }
+
+  async function decode(rows) {
+    return decodeRows(
+      rows.encoding === "compressed" ? await decompress(rows.data) : rows,
+    );
+  }
+
+  // Data files are loaded as scripts because browsers do not allow fetch()
+  // for pages opened from the file system. Each data file calls
+  // window.benchexecTableChunk() with its index and its rows.
+  function createRowLoader(index) {
+    const chunks = new Array(index.chunks.length);
+    const resolvers = new Array(index.chunks.length);
+    window.benchexecTableChunk = (i, rows) => resolvers[i](decode(rows));
+
+    function loadChunk(i) {
+      if (!chunks[i]) {
+        chunks[i] = new Promise((resolve, reject) => {
+          resolvers[i] = resolve;
+          const script = document.createElement("script");
+          script.src = index.chunks[i];
+          script.onerror = () =>
+            reject(new Error("Could not load " + index.chunks[i]));
+          document.head.appendChild(script);
+        });
+      }
+      return chunks[i];
+    }
+
+    // Returns a promise for the rows from start (inclusive) to end (exclusive).
+    return (start, end) => {
+      start = Math.max(start, 0);
+      end = Math.min(end, index.count);
+      if (start >= end) {
+        return Promise.resolve([]);
+      }
+      const first = Math.floor(start / index.chunk_size);
+      const last = Math.floor((end - 1) / index.chunk_size);
+      const loading = [];
+      for (let i = first; i <= last; i++) {
+        loading.push(loadChunk(i));
+      }
+      const offset = first * index.chunk_size;
+      return Promise.all(loading).then((chunkRows) =>
+        [].concat(...chunkRows).slice(start - offset, end - offset),
+      );
+    };
+  }
+
+  function startDeferredScripts() {
+    document
+      .querySelectorAll('script[type="' + DEFERRED_SCRIPT_TYPE + '"]')
+      .forEach((deferredScript) => {
+        const script = document.createElement("script");
+        if (deferredScript.src) {
+          script.src = deferredScript.src;
+          script.async = false; // execute in order of insertion
+        } else {
+          script.text = deferredScript.text;
+        }
+        deferredScript.replaceWith(script);
+      });
+  }
+
+  function showError(error) {
+    document.getElementById("msg-container").textContent =
+      "Could not load the data of this table (" +
+      error +
+      "). Please consider using another browser " +
+      "such as Firefox or Google Chrome.";
+  }
+
+  // Decodes the rows with the given function and starts the app afterwards.
+  function decodeBeforeStart(decodeFunction) {
+    const documentLoaded = new Promise((resolve) =>
+      document.readyState === "loading"
+        ? document.addEventListener("DOMContentLoaded", resolve)
+        : resolve(),
+    );
+    Promise.all([decodeFunction(), documentLoaded])
+      .then(([decodedRows]) => {
+        window.data.rows = decodedRows;
+        startDeferredScripts();
+      })
+      .catch(showError);
+  }
+
+  const rows = window.data.rows;
+  if (rows.encoding === "compact") {
+    window.data.rows = decodeRows(rows);
+  } else if (rows.encoding === "compressed") {
+    decodeBeforeStart(() => decode(rows));
+  } else if (rows.encoding === "chunked") {
+    window.benchexecLoadRows = createRowLoader(rows);
+    if (rows.on_demand === false) {
+      // the app needs all rows when it starts
+      decodeBeforeStart(() => window.benchexecLoadRows(0, rows.count));
+    }
+  }
+})();
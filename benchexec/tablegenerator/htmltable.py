@@ -5,10 +5,14 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import base64
 import copy
+import functools
+import hashlib
 import json
 import logging
 import os
+import zlib
 from urllib.parse import quote as url_quote
 
 from benchexec import __version__
@@ -20,6 +24,13 @@ _REACT_FILES = [
     for path in ["vendors.min.", "bundle.min."]
 ]
 
+_COMPACT_DATA_DECODER = os.path.join(
+    os.path.dirname(__file__), "decode-compact-data.js"
+)
+
+# MIME type for app scripts that should be executed only after data were decoded
+_DEFERRED_SCRIPT_TYPE = "text/x-benchexec-app"
+
 
 def write_html_table(
     out,
@@ -31,10 +42,11 @@ def write_html_table(
     relevant_id_columns,
     output_path,
     common_prefix,
+    outfile=None,
     **kwargs
 ):
-    app_css = [util.read_bundled_file(path + "css") for path in _REACT_FILES]
-    app_js = [util.read_bundled_file(path + "js") for path in _REACT_FILES]
+    app_css = [path + "css" for path in _REACT_FILES]
+    app_js = [path + "js" for path in _REACT_FILES]
     benchmark_setup = _prepare_benchmark_setup_data(
         run_sets, common_prefix, relevant_id_columns
     )
@@ -45,16 +57,48 @@ def write_html_table(
     rows_js = _prepare_rows_for_js(rows, output_path, href_base, relevant_id_columns)
     initial_state = options.initial_table_state
 
-    def write_tags(tag_name, contents):
+    app_script_attributes = ""
+    if options.html_chunk_size:
+        assert outfile, "data files need to be written next to the HTML file"
+        rows_js = _write_row_chunks(rows_js, tools, outfile, options)
+        if not _app_loads_rows_on_demand():
+            rows_js["on_demand"] = False
+            app_script_attributes = ' type="{}"'.format(_DEFERRED_SCRIPT_TYPE)
+        decoder_js = [_COMPACT_DATA_DECODER]
+    elif options.compact_html or options.compress_html:
+        rows_js = _encode_rows_compact(rows_js)
+        if options.compress_html:
+            rows_js = _compress_json(rows_js)
+            app_script_attributes = ' type="{}"'.format(_DEFERRED_SCRIPT_TYPE)
+        decoder_js = [_COMPACT_DATA_DECODER]
+    else:
+        decoder_js = []
+
+    def write_tags(tag_name, contents, attributes=""):
         for content in contents:
             out.write("<")
             out.write(tag_name)
+            out.write(attributes)
             out.write(">\n")
             out.write(content)
             out.write("\n</")
             out.write(tag_name)
             out.write(">\n")
 
+    def write_assets(tag_name, files, attributes=""):
+        if not options.external_assets:
+            write_tags(
+                tag_name, [_read_bundled_asset(file)[0] for file in files], attributes
+            )
+            return
+        assert outfile, "assets need to be written next to the HTML file"
+        for file in files:
+            asset = _write_external_asset(file, os.path.dirname(outfile))
+            if tag_name == "style":
+                out.write('<link rel="stylesheet" href="{}">\n'.format(asset))
+            else:
+                out.write('<script{} src="{}"></script>\n'.format(attributes, asset))
+
     def write_json_part(name, value=None, last=False):
         out.write('  "')
         out.write(name)
@@ -76,7 +120,7 @@ def write_html_table(
             title=title, version=__version__
         )
     )
-    write_tags("style", app_css)
+    write_assets("style", app_css)
     out.write(
         """<style>
     #msg-container {
@@ -124,10 +168,41 @@ window.data = data;
 
 """
     )
-    write_tags("script", app_js)
+    write_assets("script", decoder_js)
+    write_assets("script", app_js, app_script_attributes)
     out.write("</body>\n</html>\n")
 
 
+@functools.lru_cache()
+def _read_bundled_asset(path):
+    """
+    Read a file that is packaged together with this application
+    and return its content and a file name that contains a hash of the content.
+    """
+    content = util.read_bundled_file(path)
+    name, ext = os.path.splitext(os.path.basename(path))
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    return content, "{}.{}{}".format(name, content_hash, ext)
+
+
+def _write_external_asset(path, target_dir):
+    """
+    Make sure that the given bundled file exists in the given directory
+    with a name that contains a hash of its content, and return the URL of this file.
+    Existing files are reused, such that all tables in a directory share one copy.
+    """
+    content, asset_name = _read_bundled_asset(path)
+    asset_file = os.path.join(target_dir, asset_name)
+    if not os.path.exists(asset_file):
+        # Several tables may be written in parallel,
+        # so make sure that nobody sees a partially written file.
+        tmp_file = "{}.{}.tmp".format(asset_file, os.getpid())
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file, asset_file)
+    return url_quote(asset_name)
+
+
 def _prepare_benchmark_setup_data(
     runSetResults, commonFileNamePrefix, relevant_id_columns
 ):
@@ -511,6 +586,179 @@ def _prepare_rows_for_js(rows, base_dir, href_base, relevant_id_columns):
     return [clean_up_row(row) for row in rows]
 
 
+def _encode_rows_compact(rows):
+    """
+    Convert the rows as created by _prepare_rows_for_js() into a column-wise
+    representation, which is much smaller for large tables.
+    Columns with many repeated values (e.g., status and category) are
+    dictionary-encoded with indices into a shared list of strings,
+    and links are split into (mostly repeated) directory and file name.
+    decode-compact-data.js restores the original representation in the browser.
+    """
+    strings = [None]  # index 0 is used for absent values
+    string_indices = {None: 0}
+
+    def get_index(value):
+        index = string_indices.get(value)
+        if index is None:
+            index = string_indices[value] = len(strings)
+            strings.append(value)
+        return index
+
+    def encode_values(values):
+        values = list(values)
+        if all(value is None for value in values):
+            return None
+        if len(set(values)) * 2 <= len(values):
+            return {"d": [get_index(value) for value in values]}
+        return {"v": values}
+
+    def encode_links(links):
+        links = list(links)
+        if all(link is None for link in links):
+            return None
+        split_links = [
+            (link[: link.rfind("/") + 1], link[link.rfind("/") + 1 :])
+            if link is not None
+            else (None, None)
+            for link in links
+        ]
+        return {
+            "prefix": encode_values(prefix for prefix, _name in split_links),
+            "name": encode_values(name for _prefix, name in split_links),
+        }
+
+    def encode_run_set(results):
+        column_count = len(results[0]["values"]) if results else 0
+        return {
+            "category": encode_values(r.get("category") for r in results),
+            "score": encode_values(r.get("score") for r in results),
+            "href": encode_links(r.get("href") for r in results),
+            "values": [
+                {
+                    key: encode(r["values"][i].get(key) for r in results)
+                    for key, encode in [
+                        ("raw", encode_values),
+                        ("html", encode_values),
+                        ("href", encode_links),
+                    ]
+                }
+                for i in range(column_count)
+            ],
+        }
+
+    id_length = max((len(row["id"]) for row in rows), default=0)
+    run_set_count = len(rows[0]["results"]) if rows else 0
+    encoded = {
+        "encoding": "compact",
+        "count": len(rows),
+        "id": [
+            encode_values(row["id"][i] if i < len(row["id"]) else None for row in rows)
+            for i in range(id_length)
+        ],
+        "href": encode_links(row.get("href") for row in rows),
+        "results": [
+            encode_run_set([row["results"][i] for row in rows])
+            for i in range(run_set_count)
+        ],
+    }
+    encoded["strings"] = strings
+    return encoded
+
+
+def _compress_json(value):
+    """Return the given value as compressed and base64-encoded JSON."""
+    data = zlib.compress(json.dumps(value, sort_keys=True).encode("utf-8"))
+    return {"encoding": "compressed", "data": base64.b64encode(data).decode("ascii")}
+
+
+def _write_row_chunks(rows, tools, outfile, options):
+    """
+    Write the given rows in chunks of compactly encoded data
+    into JavaScript files in a directory next to the given HTML file.
+    @return: the data for the HTML file, which references the chunks and contains
+        the information about all rows that the app needs before loading them
+    """
+    data_dir = os.path.splitext(outfile)[0] + ".data"
+    os.makedirs(data_dir, exist_ok=True)
+    for old_file in os.listdir(data_dir):  # from previous runs with more chunks
+        if old_file.startswith("rows-") and old_file.endswith(".js"):
+            os.remove(os.path.join(data_dir, old_file))
+
+    chunk_files = []
+    for start in range(0, len(rows), options.html_chunk_size):
+        chunk = _encode_rows_compact(rows[start : start + options.html_chunk_size])
+        if options.compress_html:
+            chunk = _compress_json(chunk)
+        chunk_file = "rows-{}.js".format(len(chunk_files))
+        with open(os.path.join(data_dir, chunk_file), "w", encoding="utf-8") as f:
+            f.write("window.benchexecTableChunk({}, ".format(len(chunk_files)))
+            f.write(json.dumps(chunk, sort_keys=True))
+            f.write(");\n")
+        chunk_files.append(url_quote(os.path.basename(data_dir) + "/" + chunk_file))
+
+    return {
+        "encoding": "chunked",
+        "count": len(rows),
+        "chunk_size": options.html_chunk_size,
+        "chunks": chunk_files,
+        "first_id": rows[0]["id"] if rows else [],
+        "run_sets": [
+            _summarize_run_set_results([row["results"][i] for row in rows], tool)
+            for i, tool in enumerate(tools)
+        ],
+    }
+
+
+def _summarize_run_set_results(results, tool):
+    """
+    Collect the values of the results of one run set that the app needs
+    for its filters if the rows themselves are loaded only on demand:
+    all categories and statuses, the distinct values of text columns,
+    and the range of numeric columns.
+    """
+    columns = []
+    for i, column in enumerate(tool["columns"]):
+        values = [r["values"][i]["raw"] for r in results if "raw" in r["values"][i]]
+        if column["type"] == "status":
+            columns.append({"statuses": sorted(set(values))})
+        elif column["type"] == "text":
+            columns.append({"distincts": sorted(set(values))})
+        else:
+            numbers = []
+            for value in values:
+                try:
+                    numbers.append(float(value))
+                except ValueError:
+                    pass
+            columns.append(
+                {"min": min(numbers), "max": max(numbers)} if numbers else {}
+            )
+    return {
+        "categories": sorted({r.get("category") for r in results} - {None}),
+        "score_based": any("score" in r for r in results),
+        "columns": columns,
+    }
+
+
+@functools.lru_cache()
+def _app_loads_rows_on_demand():
+    """
+    Check whether the bundled app loads rows from data files on demand.
+    Otherwise all data files need to be loaded before the app is started.
+    """
+    app_js = _read_bundled_asset(_REACT_FILES[-1] + "js")[0]
+    if "benchexecLoadRows" in app_js:
+        return True
+    logging.warning(
+        "The bundled app for HTML tables does not support loading rows on demand, "
+        "so all data files are loaded before the table is shown. "
+        "Rebuild the app in %s to use this feature.",
+        os.path.normpath(os.path.dirname(os.path.dirname(_REACT_FILES[-1]))),
+    )
+    return False
+
+
 def _create_link(href, base_dir, runResult=None, href_base=None):
     def get_replacements(task_file):
         var_prefix = "taskdef_" if task_file.endswith(".yml") else "inputfile_"
@@ -542,7 +790,8 @@ def _create_link(href, base_dir, runResult=None, href_base=None):
         util.fix_path_if_on_windows(
             os.path.relpath(runResult.task_id.name, href_base or ".")
         )
-        if runResult
+        # computing the replacements is expensive, skip it if there are no variables
+        if runResult and "${" in href
         else None
     )
 
@@ -0,0 +1,285 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Detection of performance changes between groups of repeated executions
+of the same run sets, based on the median and median absolute deviation
+of the values of each task and bootstrap confidence intervals.
+"""
+
+import collections
+import functools
+import itertools
+import math
+import random
+
+from benchexec.tablegenerator import util
+
+# Columns that are compared
+METRICS = ["cputime", "walltime", "memory"]
+
+# Attributes of run sets that need to be equal for repetitions of the same run set
+GROUP_ATTRIBUTES = [
+    "tool",
+    "version",
+    "benchmarkname",
+    "name",
+    "options",
+    "timelimit",
+    "memlimit",
+    "cpuCores",
+]
+
+CONFIDENCE_LEVEL = 0.95
+
+# Changes are judged only for tasks with at least this number of values in each group,
+# because with fewer values nothing is known about the variation of the values.
+MIN_REPETITIONS = 2
+
+# Up to this number of repetitions, bootstrap distributions are computed exactly,
+# otherwise they are estimated with _BOOTSTRAP_SAMPLES random resamples.
+_MAX_EXACT_BOOTSTRAP_SIZE = 8
+_BOOTSTRAP_SAMPLES = 10000
+
+# for rounding errors when summing up probabilities
+_EPSILON = 1e-9
+
+# Result of comparing the values of one task in two groups of run sets:
+# change is the relative change of the median (None if the old median is 0),
+# confidence_interval the bootstrap confidence interval of the difference of medians
+# (None if there are not enough values).
+TaskComparison = collections.namedtuple(
+    "TaskComparison",
+    "old_median old_mad new_median new_mad change confidence_interval",
+)
+
+
+def group_run_sets(run_set_results):
+    """
+    Group run sets that are repetitions of each other, i.e., that have the same
+    values for all GROUP_ATTRIBUTES.
+    @param run_set_results: a list of RunSetResult instances
+    @return: a list of (title, list of indices of run sets) in order of appearance
+    """
+    groups = collections.OrderedDict()
+    for index, run_set_result in enumerate(run_set_results):
+        attributes = run_set_result.attributes
+        key = tuple(tuple(attributes.get(attr, [])) for attr in GROUP_ATTRIBUTES)
+        groups.setdefault(key, []).append(index)
+
+    result = []
+    for key, indices in groups.items():
+        attributes = dict(zip(GROUP_ATTRIBUTES, key))
+        title = " ".join(
+            util.prettylist(attributes[attr])
+            for attr in ["benchmarkname", "name", "tool", "version"]
+            if any(attributes[attr])
+        )
+        result.append((title, indices))
+    return result
+
+
+def compare_groups(old_values, new_values):
+    """
+    Compare the values of one metric for each task between two groups of run sets.
+    @param old_values: a list with one list per run set of the old group,
+        each of which contains a value (float or None) for each task
+    @param new_values: the same for the new group
+    @return: a list with a TaskComparison instance for each task,
+        or None if a group has no value for this task
+    """
+    return [
+        _compare_task(old, new) for old, new in zip(zip(*old_values), zip(*new_values))
+    ]
+
+
+def _compare_task(old, new):
+    old = sorted(v for v in old if v is not None)
+    new = sorted(v for v in new if v is not None)
+    if not old or not new:
+        return None
+
+    old_median = _median(old)
+    new_median = _median(new)
+    if len(old) >= MIN_REPETITIONS and len(new) >= MIN_REPETITIONS:
+        new_distribution = _get_median_distribution(new)
+        difference_distribution = collections.Counter()
+        for old_value, old_probability in _get_median_distribution(old):
+            for new_value, new_probability in new_distribution:
+                difference_distribution[new_value - old_value] += (
+                    old_probability * new_probability
+                )
+
+        alpha = (1 - CONFIDENCE_LEVEL) / 2
+        differences = sorted(difference_distribution.items())
+        confidence_interval = (
+            _get_quantile(differences, alpha),
+            _get_quantile(differences, 1 - alpha),
+        )
+    else:
+        confidence_interval = None
+
+    return TaskComparison(
+        old_median,
+        _median_absolute_deviation(old, old_median),
+        new_median,
+        _median_absolute_deviation(new, new_median),
+        (new_median - old_median) / old_median if old_median else None,
+        confidence_interval,
+    )
+
+
+def is_significant(comparison):
+    """Check whether the confidence interval of a TaskComparison excludes 0."""
+    if comparison.confidence_interval is None:
+        return False
+    low, high = comparison.confidence_interval
+    return low > 0 or high < 0
+
+
+def _median(sorted_values):
+    half, len_is_odd = divmod(len(sorted_values), 2)
+    if len_is_odd:
+        return sorted_values[half]
+    return (sorted_values[half - 1] + sorted_values[half]) / 2
+
+
+def _median_absolute_deviation(sorted_values, median):
+    return _median(sorted(abs(v - median) for v in sorted_values))
+
+
+def _get_quantile(sorted_distribution, q):
+    """Return the q-quantile of a sorted list of (value, probability) pairs."""
+    cumulative_probability = 0
+    for value, probability in sorted_distribution:
+        cumulative_probability += probability
+        if cumulative_probability >= q - _EPSILON:
+            return value
+    return sorted_distribution[-1][0]
+
+
+def _get_median_distribution(sorted_values):
+    """
+    Return the distribution of the median of bootstrap resamples of the given values
+    as a list of (median, probability) pairs.
+    """
+    distribution = collections.Counter()
+    for (i, j), probability in _get_bootstrap_median_positions(len(sorted_values)):
+        distribution[(sorted_values[i] + sorted_values[j]) / 2] += probability
+    return list(distribution.items())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_bootstrap_median_positions(n):
+    """
+    Return the distribution of the median of a bootstrap resample of n values
+    as a list of ((i, j), probability) pairs, meaning that the median of the resample
+    is (x[i] + x[j]) / 2 for the sorted original values x.
+    This distribution depends only on n and is thus used for all tasks.
+    """
+    lower_middle = (n - 1) // 2
+    upper_middle = n // 2
+
+    def get_median_positions(counts):
+        # counts[i] is how often x[i] occurs in the resample
+        seen = 0
+        lower_position = None
+        for i, count in enumerate(counts):
+            seen += count
+            if lower_position is None and seen > lower_middle:
+                lower_position = i
+            if seen > upper_middle:
+                return lower_position, i
+
+    distribution = collections.Counter()
+    if n <= _MAX_EXACT_BOOTSTRAP_SIZE:
+        total = n ** n
+        for counts in _get_compositions(n, n):
+            resamples = math.factorial(n)
+            for count in counts:
+                resamples //= math.factorial(count)
+            distribution[get_median_positions(counts)] += resamples / total
+    else:
+        rnd = random.Random(n)  # deterministic results
+        for _ in range(_BOOTSTRAP_SAMPLES):
+            counts = [0] * n
+            for _ in range(n):
+                counts[rnd.randrange(n)] += 1
+            distribution[get_median_positions(counts)] += 1 / _BOOTSTRAP_SAMPLES
+    return list(distribution.items())
+
+
+def _get_compositions(total, parts):
+    """Generate all tuples of parts non-negative integers with the given sum."""
+    # each composition corresponds to a choice of positions for parts-1 separators
+    for separators in itertools.combinations(range(total + parts - 1), parts - 1):
+        previous = -1
+        composition = []
+        for separator in separators + (total + parts - 1,):
+            composition.append(separator - previous - 1)
+            previous = separator
+        yield tuple(composition)
+
+
+def write_performance_csv(out, groups, comparisons, sep="\t"):
+    """
+    Write the comparisons as CSV with one line per task, metric, and pair of groups.
+    @param groups: the list of groups as returned by group_run_sets()
+    @param comparisons: a list of (task name, property name, metric title,
+        index of old group, index of new group, TaskComparison) tuples
+    """
+    out.write(
+        sep.join(
+            [
+                "task",
+                "property",
+                "metric",
+                "old",
+                "new",
+                "old median",
+                "old MAD",
+                "new median",
+                "new MAD",
+                "change",
+                "CI low",
+                "CI high",
+                "verdict",
+            ]
+        )
+    )
+    out.write("\n")
+
+    def format_number(number):
+        return "" if number is None else "{:.6g}".format(number)
+
+    for task, prop, metric, old_group, new_group, comparison in comparisons:
+        if not is_significant(comparison):
+            verdict = ""
+        elif comparison.new_median > comparison.old_median:
+            verdict = "regression"  # for all METRICS larger values are worse
+        else:
+            verdict = "improvement"
+        ci_low, ci_high = comparison.confidence_interval or (None, None)
+        change = comparison.change
+        line = [
+            # task name may contain paths, so standardize the output across OSs
+            util.fix_path_if_on_windows(task),
+            prop or "",
+            metric,
+            groups[old_group][0],
+            groups[new_group][0],
+            format_number(comparison.old_median),
+            format_number(comparison.old_mad),
+            format_number(comparison.new_median),
+            format_number(comparison.new_mad),
+            "" if change is None else "{:+.1%}".format(change),
+            format_number(ci_low),
+            format_number(ci_high),
+            verdict,
+        ]
+        out.write(sep.join(line))
+        out.write("\n")
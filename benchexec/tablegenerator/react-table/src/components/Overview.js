@@ -5,7 +5,7 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
-import React from "react";
+import React, { useEffect } from "react";
 import { HashRouter as Router, Switch, Route, Link } from "react-router-dom";
 import Table from "./ReactTable.js";
 import Summary from "./Summary.js";
@@ -36,6 +36,7 @@ import {
   setConstantHashSearch,
 } from "../utils/utils";
 import deepEqual from "deep-equal";
+import { hasRowsOnDemand, loadRows, loadAllRows } from "../utils/rows";
 
 const menuItems = [
   { key: "summary", title: "Summary", path: "/" },
@@ -52,6 +53,20 @@ const menuItems = [
 
 const getCurrentPath = () => document.location.hash.split("?")[0].substr(1);
 
+// Placeholder for views that need all rows, which triggers loading them.
+const RowsLoading = ({ load, error }) => {
+  useEffect(() => {
+    load();
+  }, [load]);
+  return (
+    <div className="rows-loading">
+      {error
+        ? `Could not load the data of this table (${error}).`
+        : "Please wait while the rows of the table are being loaded."}
+    </div>
+  );
+};
+
 export default class Overview extends React.Component {
   constructor(props) {
     super(props);
@@ -74,6 +89,13 @@ export default class Overview extends React.Component {
     this.originalTable = table;
     this.originalTools = tools;
 
+    // Rows in separate data files are loaded when they are shown, and all
+    // of them only when they are needed for filtering, sorting or plots.
+    this.rowsOnDemand = hasRowsOnDemand(props.data);
+    this.rowCount = this.rowsOnDemand
+      ? props.data.rows.count
+      : this.originalTable.length;
+
     this.taskIdNames = taskIdNames;
 
     this.columns = columns;
@@ -101,16 +123,28 @@ export default class Overview extends React.Component {
 
       quantilePreSelection: tools[0].columns[1],
       hiddenCols: createHiddenColsFromURL(tools),
+      allRowsLoaded: !this.rowsOnDemand,
+      rowsError: undefined,
     };
     // Collect all status and category values for filter drop-down
-    this.statusValues = this.findAllValuesOfColumn(
-      (_tool, column) => column.type === "status",
-      (_runResult, value) => getRawOrDefault(value),
-    );
-    this.categoryValues = this.findAllValuesOfColumn(
-      (_tool, column) => column.type === "status",
-      (runResult, _value) => runResult.category,
-    );
+    if (this.rowsOnDemand) {
+      const runSets = props.data.rows.run_sets;
+      this.statusValues = this.findSummarizedValuesOfColumn(
+        (j, i) => runSets[j].columns[i].statuses,
+      );
+      this.categoryValues = this.findSummarizedValuesOfColumn(
+        (j, _i) => runSets[j].categories,
+      );
+    } else {
+      this.statusValues = this.findAllValuesOfColumn(
+        (_tool, column) => column.type === "status",
+        (_runResult, value) => getRawOrDefault(value),
+      );
+      this.categoryValues = this.findAllValuesOfColumn(
+        (_tool, column) => column.type === "status",
+        (runResult, _value) => runResult.category,
+      );
+    }
 
     const categoryValuesWithTrailingSpace = this.categoryValues.map(
       (tool) =>
@@ -129,7 +163,11 @@ export default class Overview extends React.Component {
     );
 
     const deserializedFilters = this.getFiltersFromUrl();
-    if (deserializedFilters) {
+    if (deserializedFilters && this.rowsOnDemand) {
+      // filters are applied once all rows are loaded
+      this.lastFiltered = deserializedFilters;
+      this.state = { ...this.state, filtered: deserializedFilters };
+    } else if (deserializedFilters) {
       this.filteredData = this.runFilter(deserializedFilters);
       this.lastFiltered = deserializedFilters;
       this.state = {
@@ -141,6 +179,9 @@ export default class Overview extends React.Component {
   }
 
   componentDidMount() {
+    if (this.rowsOnDemand && this.state.filtered.length) {
+      this.loadAllRows();
+    }
     this.removeHistoryListener = this.routerRef.current.history.listen(
       (_, action) => {
         this.updateHiddenCols();
@@ -166,7 +207,12 @@ export default class Overview extends React.Component {
 
   updateFiltersFromUrl = () => {
     const newFilters = this.getFiltersFromUrl();
-    if (newFilters) {
+    if (newFilters && !this.state.allRowsLoaded) {
+      // filters are applied once all rows are loaded
+      this.lastFiltered = newFilters;
+      this.setState({ filtered: newFilters });
+      this.loadAllRows();
+    } else if (newFilters) {
       this.filteredData = this.runFilter(newFilters);
       this.setState({
         table: this.filteredData,
@@ -176,6 +222,27 @@ export default class Overview extends React.Component {
     }
   };
 
+  // Load all rows (if they are loaded on demand) and apply the current filters.
+  loadAllRows = () => {
+    if (!this.allRowsLoading) {
+      this.allRowsLoading = loadAllRows(this.props.data).then(
+        (rows) => {
+          this.originalTable = rows;
+          this.filteredData =
+            this.lastFiltered && this.lastFiltered.length
+              ? this.runFilter(this.lastFiltered)
+              : rows;
+          this.setState({ table: this.filteredData, allRowsLoaded: true });
+        },
+        (error) => {
+          this.allRowsLoading = undefined; // allow retrying
+          this.setState({ rowsError: error });
+        },
+      );
+    }
+    return this.allRowsLoading;
+  };
+
   updateHiddenCols = () => {
     this.setState({ hiddenCols: createHiddenColsFromURL(this.state.tools) });
   };
@@ -216,6 +283,16 @@ export default class Overview extends React.Component {
   }
 
   filterPlotData = (filter, runFilterLogic = true) => {
+    if (!this.state.allRowsLoaded) {
+      // filtering needs all rows
+      this.setState({ filtered: filter });
+      this.loadAllRows().then(() => {
+        if (this.state.allRowsLoaded) {
+          this.filterPlotData(filter, runFilterLogic);
+        }
+      });
+      return;
+    }
     // updating url filters on next tick to ensure that state is already set
     // when handler is called);
     if (this.lastImmediate) {
@@ -256,6 +333,13 @@ export default class Overview extends React.Component {
       }),
     );
 
+  findSummarizedValuesOfColumn = (valuesOfColumn) =>
+    this.originalTools.map((tool, j) =>
+      tool.columns.map((column, i) =>
+        column.type === "status" ? valuesOfColumn(j, i) : undefined,
+      ),
+    );
+
   // -----------------------Common Functions-----------------------
   getRowName = (row) => row.id.filter((s) => s).join(" | ");
 
@@ -266,6 +350,13 @@ export default class Overview extends React.Component {
     });
   };
 
+  renderWithAllRows = (render) =>
+    this.state.allRowsLoaded ? (
+      render()
+    ) : (
+      <RowsLoading load={this.loadAllRows} error={this.state.rowsError} />
+    );
+
   render() {
     const reset = ({ className, isReset = false, onClick, enabled }) => (
       <FilterInfoButton
@@ -275,8 +366,10 @@ export default class Overview extends React.Component {
         enabled={enabled}
         isFiltered={!!this.state.filtered.length}
         resetFilters={this.resetFilters}
-        filteredCount={this.state.table.length}
-        totalCount={this.originalTable.length}
+        filteredCount={
+          this.state.allRowsLoaded ? this.state.table.length : this.rowCount
+        }
+        totalCount={this.rowCount}
       />
     );
     let urlParams = document.location.href.split("?")[1] || "";
@@ -308,7 +401,12 @@ export default class Overview extends React.Component {
               hide={() => {
                 this.setState({ filterBoxVisible: false });
               }}
-              ids={getTaskIdParts(this.originalTable, this.taskIdNames)}
+              ids={getTaskIdParts(
+                this.rowsOnDemand
+                  ? [{ id: this.props.data.rows.first_id }]
+                  : this.originalTable,
+                this.taskIdNames,
+              )}
             />
             <div className="menu">
               {menuItems.map(({ key, title, path, icon }) => (
@@ -358,27 +456,34 @@ export default class Overview extends React.Component {
                     statusValues={this.statusValues}
                     categoryValues={this.categoryValues}
                     hiddenCols={this.state.hiddenCols}
+                    rowCount={this.rowCount}
+                    loadRows={this.state.allRowsLoaded ? undefined : loadRows}
+                    loadAllRows={this.loadAllRows}
                   />
                 </Route>
                 <Route path="/quantile">
-                  <QuantilePlot
-                    table={this.state.table}
-                    tools={this.state.tools}
-                    preSelection={this.state.quantilePreSelection}
-                    getRowName={this.getRowName}
-                    hiddenCols={this.state.hiddenCols}
-                    isFlexible={this.props.renderPlotsFlexible}
-                  />
+                  {this.renderWithAllRows(() => (
+                    <QuantilePlot
+                      table={this.state.table}
+                      tools={this.state.tools}
+                      preSelection={this.state.quantilePreSelection}
+                      getRowName={this.getRowName}
+                      hiddenCols={this.state.hiddenCols}
+                      isFlexible={this.props.renderPlotsFlexible}
+                    />
+                  ))}
                 </Route>
                 <Route path="/scatter">
-                  <ScatterPlot
-                    table={this.state.table}
-                    columns={this.columns}
-                    tools={this.state.tools}
-                    getRowName={this.getRowName}
-                    hiddenCols={this.state.hiddenCols}
-                    isFlexible={this.props.renderPlotsFlexible}
-                  />
+                  {this.renderWithAllRows(() => (
+                    <ScatterPlot
+                      table={this.state.table}
+                      columns={this.columns}
+                      tools={this.state.tools}
+                      getRowName={this.getRowName}
+                      hiddenCols={this.state.hiddenCols}
+                      isFlexible={this.props.renderPlotsFlexible}
+                    />
+                  ))}
                 </Route>
                 <Route path="/info">
                   <Info
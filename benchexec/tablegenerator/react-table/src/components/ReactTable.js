@@ -5,7 +5,7 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
-import React, { useState, useEffect, memo } from "react";
+import React, { useState, useEffect, useRef, memo } from "react";
 import ReactTable from "react-table";
 import "react-table/react-table.css";
 import withFixedColumns from "react-table-hoc-fixed-columns";
@@ -37,6 +37,8 @@ const SPECIAL_CATEGORIES = { [RUN_EMPTY]: "Empty rows", [RUN_ABORTED]: "—" };
 
 const ReactTableFixedColumns = withFixedColumns(ReactTable);
 
+const DEFAULT_PAGE_SIZE = 250;
+
 const TableRender = (props) => {
   const [fixed, setFixed] = useState(true);
   let [filteredColumnValues, setFilteredColumnValues] = useState({});
@@ -109,6 +111,52 @@ const TableRender = (props) => {
     setFilteredColumnValues(newFilteredColumnValues);
   }, [props]);
 
+  // If props.loadRows is given, the rows are not in props.data,
+  // but loaded on demand for the current page. Sorting needs all rows,
+  // so props.loadAllRows() is called for it, after which props.data is used.
+  const [pageRows, setPageRows] = useState({
+    rows: [],
+    pages: Math.ceil(props.rowCount / DEFAULT_PAGE_SIZE),
+    loading: true,
+  });
+  const lastPageRequest = useRef(0);
+
+  const fetchPageRows = ({ page, pageSize, sorted }) => {
+    if (sorted.length) {
+      props.loadAllRows();
+      return;
+    }
+    const request = ++lastPageRequest.current;
+    setPageRows((prev) => ({ ...prev, loading: true }));
+    const start = page * pageSize;
+    props.loadRows(start, start + pageSize).then(
+      (rows) => {
+        // ignore responses for pages that are not shown anymore
+        if (request === lastPageRequest.current) {
+          setPageRows({
+            rows,
+            pages: Math.ceil(props.rowCount / pageSize),
+            loading: false,
+          });
+        }
+      },
+      (error) => {
+        console.error(`Could not load rows of table: ${error}`);
+        setPageRows((prev) => ({ ...prev, loading: false }));
+      },
+    );
+  };
+
+  const dataProps = props.loadRows
+    ? {
+        manual: true,
+        data: pageRows.rows,
+        pages: pageRows.pages,
+        loading: pageRows.loading,
+        onFetchData: fetchPageRows,
+      }
+    : { data: props.data };
+
   const handleFixedInputChange = ({ target }) => {
     const value = target.checked;
     setFixed(value);
@@ -391,11 +439,11 @@ const TableRender = (props) => {
   return (
     <div className="mainTable">
       <ReactTableFixedColumns
-        data={props.data}
+        {...dataProps}
         filterable={true}
         filtered={props.filtered}
         columns={[createTaskIdColumn()].concat(resultColumns)}
-        defaultPageSize={250}
+        defaultPageSize={DEFAULT_PAGE_SIZE}
         pageSizeOptions={[50, 100, 250, 500, 1000, 2500]}
         className="-highlight"
         minRows={0}
@@ -5,7 +5,7 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
-import { applyNumericFilter } from "../utils/filters";
+import { applyNumericFilter, getFilterableData } from "../utils/filters";
 
 //Example data set to test the filtering by regex
 const rows = [
@@ -100,3 +100,61 @@ test("applyNumericFilter all numbers", () => {
 test("applyNumericFilter with string", () => {
   expect(getFilteredData("a").length).toBe(0);
 });
+
+const tools = [
+  {
+    tool: "tool",
+    date: "date",
+    niceName: "name",
+    columns: [
+      { type: "status", title: "status" },
+      { type: "measure", title: "cputime" },
+      { type: "text", title: "host" },
+    ],
+  },
+];
+
+test("getFilterableData for rows that are loaded on demand", () => {
+  const rows = [
+    {
+      id: ["a.yml"],
+      results: [
+        {
+          category: "correct",
+          values: [{ raw: "true" }, { raw: "1.5" }, { raw: "host1" }],
+        },
+      ],
+    },
+    {
+      id: ["b.yml"],
+      results: [
+        {
+          category: "error",
+          values: [{ raw: "TIMEOUT" }, { raw: "900" }, { raw: "host1" }],
+        },
+      ],
+    },
+  ];
+  // summary of the same rows as written by table-generator
+  const index = {
+    encoding: "chunked",
+    count: 2,
+    chunk_size: 1,
+    chunks: ["rows-0.js", "rows-1.js"],
+    first_id: ["a.yml"],
+    run_sets: [
+      {
+        categories: ["correct", "error"],
+        score_based: false,
+        columns: [
+          { statuses: ["true", "TIMEOUT"] },
+          { min: 1.5, max: 900 },
+          { distincts: ["host1"] },
+        ],
+      },
+    ],
+  };
+  expect(getFilterableData({ tools, rows: index })).toEqual(
+    getFilterableData({ tools, rows }),
+  );
+});
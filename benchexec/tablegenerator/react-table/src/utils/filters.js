@@ -6,6 +6,7 @@
 // SPDX-License-Identifier: Apache-2.0
 
 import { isNil, getRawOrDefault, omit } from "./utils";
+import { hasRowsOnDemand } from "./rows";
 
 /**
  * Prepares raw data for filtering by retrieving available distinct values as min
@@ -14,6 +15,9 @@ import { isNil, getRawOrDefault, omit } from "./utils";
  * @param {Object} data -  Data object received from json data
  */
 const getFilterableData = ({ tools, rows }) => {
+  if (hasRowsOnDemand({ rows })) {
+    return getFilterableDataFromSummary(tools, rows.run_sets);
+  }
   const start = Date.now();
   const mapped = tools.map((tool, idx) => {
     let statusIdx;
@@ -91,6 +95,49 @@ const getFilterableData = ({ tools, rows }) => {
   return mapped;
 };
 
+/**
+ * Same as getFilterableData, but for rows that are loaded on demand,
+ * for which table-generator provides a summary of the values of each run set.
+ *
+ * @param {Object[]} tools - The run sets of the table
+ * @param {Object[]} runSets - The summary of the values of each run set
+ */
+const getFilterableDataFromSummary = (tools, runSets) =>
+  tools.map((tool, idx) => {
+    const { tool: toolName, date, niceName } = tool;
+    const { categories, columns: values } = runSets[idx];
+    const columns = tool.columns.map((col, colIdx) => {
+      if (!col) {
+        return undefined;
+      }
+      const { statuses, distincts, min, max } = values[colIdx];
+      if (col.type === "status") {
+        return {
+          ...col,
+          idx: colIdx,
+          // convention is to postfix categories with a space character
+          categories: categories.map((category) => `${category} `),
+          statuses,
+        };
+      }
+      if (col.type === "text") {
+        return { ...col, idx: colIdx, distincts };
+      }
+      return {
+        ...col,
+        idx: colIdx,
+        min: isNil(min) ? Infinity : min,
+        max: isNil(max) ? -Infinity : max,
+      };
+    });
+
+    if (!columns.some((col) => col && col.type === "status")) {
+      console.log(`Couldn't find any status columns in tool ${idx}`);
+      return undefined;
+    }
+    return { name: `${toolName} ${date} ${niceName}`, columns };
+  });
+
 const applyNumericFilter = (filter, row, cell) => {
   const raw = getRawOrDefault(row[filter.id]);
   if (raw === undefined) {
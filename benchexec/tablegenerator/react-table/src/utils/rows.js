@@ -0,0 +1,39 @@
+// This file is part of BenchExec, a framework for reliable benchmarking:
+// https://github.com/sosy-lab/benchexec
+//
+// SPDX-FileCopyrightText: 2019-2020 Dirk Beyer <https://www.sosy-lab.org>
+//
+// SPDX-License-Identifier: Apache-2.0
+
+/**
+ * Support for tables whose rows are stored in separate data files
+ * (table-generator option --html-chunk-size). Instead of the rows, the data
+ * contain an index with the number of rows and a summary of their values,
+ * and the rows are loaded on demand with window.benchexecLoadRows(),
+ * which is provided by decode-compact-data.js.
+ */
+
+/**
+ * Check whether the rows of the given table data need to be loaded on demand.
+ *
+ * @param {Object} data - Data object received from json data
+ */
+const hasRowsOnDemand = ({ rows }) =>
+  !Array.isArray(rows) && rows.encoding === "chunked";
+
+/**
+ * Load the rows from start (inclusive) to end (exclusive).
+ *
+ * @returns {Promise<Object[]>} the rows
+ */
+const loadRows = (start, end) => window.benchexecLoadRows(start, end);
+
+/**
+ * Load all rows of the given table data.
+ *
+ * @param {Object} data - Data object received from json data
+ * @returns {Promise<Object[]>} the rows
+ */
+const loadAllRows = ({ rows }) => loadRows(0, rows.count);
+
+export { hasRowsOnDemand, loadRows, loadAllRows };
@@ -6,10 +6,12 @@
 // SPDX-License-Identifier: Apache-2.0
 
 import React from "react";
+import { hasRowsOnDemand } from "./rows";
 
 const emptyStateValue = "##########";
 
 const prepareTableData = ({ head, tools, rows, stats, props, initial }) => {
+  const onDemand = hasRowsOnDemand({ rows });
   return {
     tableHeader: head,
     taskIdNames: head.task_id_names,
@@ -20,10 +22,13 @@ const prepareTableData = ({ head, tools, rows, stats, props, initial }) => {
         ...column,
         colIdx: idx,
       })),
-      scoreBased: rows.some((row) => row.results[idx].score !== undefined),
+      scoreBased: onDemand
+        ? rows.run_sets[idx].score_based
+        : rows.some((row) => row.results[idx].score !== undefined),
     })),
     columns: tools.map((tool) => tool.columns.map((column) => column.title)),
-    table: rows,
+    // rows that are loaded on demand are not available yet
+    table: onDemand ? [] : rows,
     stats: stats,
     properties: props,
     initial: initial,
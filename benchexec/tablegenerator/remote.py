@@ -0,0 +1,352 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Access to result and log files on HTTP(S) servers.
+Connections are kept open and reused for further requests to the same server,
+downloaded files can be cached on disk (and are revalidated with the server
+using the ETag and Last-Modified headers),
+and files like ZIP archives of log files can be opened for random access,
+which downloads only the parts of the file that are actually read.
+"""
+
+import functools
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from benchexec import __version__
+
+_USER_AGENT = "BenchExec-table-generator/" + __version__
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 10
+
+# Files opened with open_url_random_access() are downloaded in blocks of this size.
+BLOCK_SIZE = 256 * 1024
+
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+# Directory for caching downloaded files, None if caching is disabled.
+_cache_dir = None
+
+
+def set_cache_dir(cache_dir):
+    """
+    Set the directory in which files downloaded by open_url() are cached
+    (None disables caching). This needs to be called in each process.
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def can_handle(url):
+    """
+    Check whether the given URL can be opened by this module.
+    This is the case for HTTP(S) URLs, except if a proxy should be used for them,
+    which is left to urllib.
+    """
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    return scheme in ("http", "https") and not _use_proxy(scheme, parts.netloc)
+
+
+@functools.lru_cache(maxsize=None)
+def _use_proxy(scheme, host):
+    return scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(
+        host
+    )
+
+
+class _ConnectionPool(threading.local):
+    """Open HTTP connections of the current thread, one per server."""
+
+    def __init__(self):
+        self.connections = {}
+
+    def send(self, url, method, headers):
+        """
+        Send a single request and return the response, which needs to be read
+        completely before the next request is sent.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme.lower(), parts.hostname, parts.port)
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        headers = dict(headers, **{"User-Agent": _USER_AGENT})
+
+        while True:
+            connection = self.connections.pop(key, None)
+            is_reused = connection is not None
+            if connection is None:
+                if key[0] == "https":
+                    connection = http.client.HTTPSConnection(parts.hostname, parts.port)
+                else:
+                    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+            try:
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                if is_reused:
+                    # The server may have closed the connection in the meantime.
+                    logging.debug("Retrying request to '%s' after error: %s", url, e)
+                    continue
+                if isinstance(e, OSError):
+                    raise
+                raise urllib.error.URLError(e) from e
+
+            if not response.will_close:
+                self.connections[key] = connection
+            return response
+
+
+_pool = _ConnectionPool()
+
+
+def _request(url, headers={}, method="GET"):  # noqa: B006
+    """
+    Send a request, following redirects, and return the final URL and the response,
+    which needs to be read completely before the next request is sent.
+    Error responses are raised as urllib.error.HTTPError like by urllib.
+    """
+    for _ in range(_MAX_REDIRECTS):
+        logging.debug("Making request to '%s'", url)
+        response = _pool.send(url, method, headers)
+        if response.status in _REDIRECT_CODES and response.getheader("Location"):
+            response.read()
+            url = urllib.parse.urljoin(url, response.getheader("Location"))
+            continue
+        logging.debug("Got response %s %s", response.status, response.reason)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                url,
+                response.status,
+                response.reason,
+                response.msg,
+                io.BytesIO(response.read()),
+            )
+        return url, response
+
+    raise urllib.error.URLError("Too many redirects for {}".format(url))
+
+
+def _get_validators(response):
+    """Get the headers from a response that allow to check whether a file changed."""
+    return {
+        key: value
+        for key, value in [
+            ("ETag", response.getheader("ETag")),
+            ("Last-Modified", response.getheader("Last-Modified")),
+        ]
+        if value
+    }
+
+
+def open_url(url):
+    """
+    Download a file from an HTTP(S) URL and return it as a seekable binary file.
+    If a cache directory is set, a cached copy of the file is used
+    if the server confirms that it is still up to date,
+    and new downloads are stored in the cache.
+    """
+    if not _cache_dir:
+        _, response = _request(url)
+        return io.BytesIO(response.read())
+
+    cache_name = os.path.join(
+        _cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest()
+    )
+    metadata_file = cache_name + ".json"
+    headers = {}
+    cached_file = None
+    try:
+        with open(metadata_file) as f:
+            metadata = json.load(f)
+        if metadata["url"] == url:
+            cached_file = open(cache_name, "rb")
+            if "ETag" in metadata:
+                headers["If-None-Match"] = metadata["ETag"]
+            if "Last-Modified" in metadata:
+                headers["If-Modified-Since"] = metadata["Last-Modified"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        _, response = _request(url, headers)
+    except BaseException:
+        if cached_file:
+            cached_file.close()
+        raise
+
+    if response.status == 304 and cached_file:
+        response.read()
+        logging.debug("Using cached copy of '%s'.", url)
+        return cached_file
+    if cached_file:
+        cached_file.close()
+
+    validators = _get_validators(response)
+    if not validators:
+        # without validators we could never use the cached copy
+        return io.BytesIO(response.read())
+
+    # Write to temporary files first such that other processes
+    # never see incomplete files.
+    os.makedirs(_cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=_cache_dir, delete=False) as tmp_file:
+        shutil.copyfileobj(response, tmp_file)
+    os.replace(tmp_file.name, cache_name)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=_cache_dir, delete=False, suffix=".json"
+    ) as tmp_file:
+        json.dump(dict(validators, url=url), tmp_file)
+    os.replace(tmp_file.name, metadata_file)
+    return open(cache_name, "rb")
+
+
+def open_url_random_access(url):
+    """
+    Open an HTTP(S) URL as a seekable binary file for random access.
+    If the server supports range requests, a RemoteFile instance is returned
+    that downloads only the blocks of the file that are actually read,
+    otherwise the whole file is downloaded immediately.
+    """
+    try:
+        url, response = _request(url, {"Range": "bytes=-{}".format(BLOCK_SIZE)})
+    except urllib.error.HTTPError as e:
+        if e.code == 416:  # range not satisfiable because file is empty
+            return io.BytesIO()
+        raise
+    content = response.read()
+    if response.status != 206:
+        logging.debug("Server does not support range requests for '%s'.", url)
+        return io.BytesIO(content)
+
+    start, _, size = _parse_content_range(response)
+    remote_file = RemoteFile(url, size, _get_validators(response))
+    remote_file._add_data(start, content)
+    return remote_file
+
+
+def _parse_content_range(response):
+    match = _CONTENT_RANGE_PATTERN.fullmatch(response.getheader("Content-Range", ""))
+    if not match:
+        raise urllib.error.URLError(
+            "Invalid response to range request: Content-Range is '{}'".format(
+                response.getheader("Content-Range")
+            )
+        )
+    return tuple(int(group) for group in match.groups())
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    A read-only file on an HTTP(S) server that is downloaded in blocks
+    with range requests whenever a part of it is read for the first time.
+    Use open_url_random_access() to create instances.
+    """
+
+    def __init__(self, url, size, validators):
+        super().__init__()
+        self.url = url
+        self.size = size
+        # If-Range lets the server send the whole file instead of the range
+        # if the file has changed, which we detect.
+        # (weak ETags are not allowed for this).
+        self._headers = {}
+        if not validators.get("ETag", "W/").startswith("W/"):
+            self._headers["If-Range"] = validators["ETag"]
+        elif "Last-Modified" in validators:
+            self._headers["If-Range"] = validators["Last-Modified"]
+        self._blocks = {}
+        self._position = 0
+
+    def _add_data(self, start, data):
+        """Store all blocks that are contained completely in the given data."""
+        first_block = -(-start // BLOCK_SIZE)  # round up
+        end = start + len(data)
+        for block in range(first_block, (end - 1) // BLOCK_SIZE + 1):
+            block_start = block * BLOCK_SIZE
+            block_end = min(block_start + BLOCK_SIZE, self.size)
+            if block_end <= end:
+                self._blocks[block] = data[block_start - start : block_end - start]
+
+    def _fetch_blocks(self, first_block, last_block):
+        """Download all missing blocks in the given range (inclusive)."""
+        block = first_block
+        while block <= last_block:
+            if block in self._blocks:
+                block += 1
+                continue
+            # download all consecutive missing blocks with one request
+            end_block = block
+            while end_block < last_block and end_block + 1 not in self._blocks:
+                end_block += 1
+            start = block * BLOCK_SIZE
+            end = min((end_block + 1) * BLOCK_SIZE, self.size) - 1
+            headers = dict(self._headers, Range="bytes={}-{}".format(start, end))
+            _, response = _request(self.url, headers)
+            content = response.read()
+            if response.status != 206:
+                raise OSError("File '{}' changed while reading it.".format(self.url))
+            if _parse_content_range(response) != (start, end, self.size):
+                raise OSError(
+                    "Unexpected range in response from '{}': {}".format(
+                        self.url, response.getheader("Content-Range")
+                    )
+                )
+            self._add_data(start, content)
+            block = end_block + 1
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError("Invalid whence {}".format(whence))
+        if position < 0:
+            raise ValueError("Negative seek position {}".format(position))
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self.size - self._position)
+        if length <= 0:
+            return 0
+        first_block = self._position // BLOCK_SIZE
+        last_block = (self._position + length - 1) // BLOCK_SIZE
+        self._fetch_blocks(first_block, last_block)
+
+        written = 0
+        while written < length:
+            block, offset = divmod(self._position + written, BLOCK_SIZE)
+            data = self._blocks[block][offset : offset + length - written]
+            buffer[written : written + len(data)] = data
+            written += len(data)
+        self._position += length
+        return length
@@ -8,9 +8,11 @@
 import collections
 from decimal import Decimal, InvalidOperation
 import itertools
+import math
 
 from benchexec import result
 from benchexec.tablegenerator import util
+from benchexec.tablegenerator import columns
 from benchexec.tablegenerator.columns import ColumnType
 
 
@@ -167,37 +169,9 @@ def _get_stats_of_number_column(values, categoryList, correct_only):
         )
         return StatValue.from_list(all_values_for_keys)
 
-    stats.correct = create_stat_value_for(
-        (result.CATEGORY_CORRECT, result.RESULT_CLASS_TRUE),
-        (result.CATEGORY_CORRECT, result.RESULT_CLASS_FALSE),
-    )
-    stats.correct_true = create_stat_value_for(
-        (result.CATEGORY_CORRECT, result.RESULT_CLASS_TRUE)
-    )
-    stats.correct_false = create_stat_value_for(
-        (result.CATEGORY_CORRECT, result.RESULT_CLASS_FALSE)
-    )
-    stats.correct_unconfirmed = create_stat_value_for(
-        (result.CATEGORY_CORRECT_UNCONFIRMED, result.RESULT_CLASS_TRUE),
-        (result.CATEGORY_CORRECT_UNCONFIRMED, result.RESULT_CLASS_FALSE),
+    _set_stats_per_category(
+        stats, create_stat_value_for, include_wrong=not correct_only
     )
-    stats.correct_unconfirmed_true = create_stat_value_for(
-        (result.CATEGORY_CORRECT_UNCONFIRMED, result.RESULT_CLASS_TRUE)
-    )
-    stats.correct_unconfirmed_false = create_stat_value_for(
-        (result.CATEGORY_CORRECT_UNCONFIRMED, result.RESULT_CLASS_FALSE)
-    )
-    if not correct_only:
-        stats.wrong = create_stat_value_for(
-            (result.CATEGORY_WRONG, result.RESULT_CLASS_TRUE),
-            (result.CATEGORY_WRONG, result.RESULT_CLASS_FALSE),
-        )
-        stats.wrong_true = create_stat_value_for(
-            (result.CATEGORY_WRONG, result.RESULT_CLASS_TRUE)
-        )
-        stats.wrong_false = create_stat_value_for(
-            (result.CATEGORY_WRONG, result.RESULT_CLASS_FALSE)
-        )
     return stats
 
 
@@ -217,6 +191,17 @@ def _get_stats_of_status_column(run_results, col):
     def create_stat_value_for(*keys):
         return StatValue(sum(counts[key] for key in keys))
 
+    _set_stats_per_category(stats, create_stat_value_for)
+    return stats
+
+
+def _set_stats_per_category(stats, create_stat_value_for, include_wrong=True):
+    """
+    Fill in the fields of a ColumnStatistics instance that are specific
+    to a category of results.
+    @param create_stat_value_for: a function that returns a StatValue for all results
+        with one of the given (category, result classification) pairs
+    """
     stats.correct = create_stat_value_for(
         (result.CATEGORY_CORRECT, result.RESULT_CLASS_TRUE),
         (result.CATEGORY_CORRECT, result.RESULT_CLASS_FALSE),
@@ -237,18 +222,289 @@ def _get_stats_of_status_column(run_results, col):
     stats.correct_unconfirmed_false = create_stat_value_for(
         (result.CATEGORY_CORRECT_UNCONFIRMED, result.RESULT_CLASS_FALSE)
     )
-    stats.wrong = create_stat_value_for(
-        (result.CATEGORY_WRONG, result.RESULT_CLASS_TRUE),
-        (result.CATEGORY_WRONG, result.RESULT_CLASS_FALSE),
-    )
-    stats.wrong_true = create_stat_value_for(
-        (result.CATEGORY_WRONG, result.RESULT_CLASS_TRUE)
-    )
-    stats.wrong_false = create_stat_value_for(
-        (result.CATEGORY_WRONG, result.RESULT_CLASS_FALSE)
-    )
+    if include_wrong:
+        stats.wrong = create_stat_value_for(
+            (result.CATEGORY_WRONG, result.RESULT_CLASS_TRUE),
+            (result.CATEGORY_WRONG, result.RESULT_CLASS_FALSE),
+        )
+        stats.wrong_true = create_stat_value_for(
+            (result.CATEGORY_WRONG, result.RESULT_CLASS_TRUE)
+        )
+        stats.wrong_false = create_stat_value_for(
+            (result.CATEGORY_WRONG, result.RESULT_CLASS_FALSE)
+        )
 
-    return stats
+
+class StatAccumulator(object):
+    """
+    Computes the same values as StatValue.from_list(),
+    but incrementally without storing the values.
+    Instances can be merged, so values can be accumulated in several parts.
+    All values except the median are exact. The median is estimated
+    from a histogram with logarithmically-sized buckets,
+    its relative error is at most _RELATIVE_ACCURACY.
+    """
+
+    _RELATIVE_ACCURACY = 0.01
+    _GAMMA = (1 + _RELATIVE_ACCURACY) / (1 - _RELATIVE_ACCURACY)
+    _LOG_GAMMA = math.log(_GAMMA)
+
+    def __init__(self):
+        self.count = 0  # including None values
+        self.number_count = 0
+        self.sum = Decimal(0)
+        self.sum_of_squares = Decimal(0)
+        self.min = None
+        self.max = None
+        self.has_nan = False
+        self.positive_inf_count = 0
+        self.negative_inf_count = 0
+        self.zero_count = 0
+        # bucket index -> number of values, separately for positive and negative values
+        self.positive_buckets = collections.Counter()
+        self.negative_buckets = collections.Counter()
+
+    def add(self, value):
+        self.count += 1
+        if value is None:
+            return
+        if value.is_nan():
+            self.has_nan = True
+            return
+        self.number_count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if value.is_infinite():
+            if value > 0:
+                self.positive_inf_count += 1
+            else:
+                self.negative_inf_count += 1
+            return
+        self.sum += value
+        self.sum_of_squares += value * value
+
+        float_value = float(value)
+        if float_value > 0:
+            self.positive_buckets[self._get_bucket(float_value)] += 1
+        elif float_value < 0:
+            self.negative_buckets[self._get_bucket(-float_value)] += 1
+        else:
+            self.zero_count += 1
+
+    @classmethod
+    def _get_bucket(cls, value):
+        return math.ceil(math.log(value) / cls._LOG_GAMMA)
+
+    @classmethod
+    def _get_bucket_value(cls, bucket):
+        # the value with the lowest relative error for all values in the bucket
+        return 2 * cls._GAMMA ** bucket / (cls._GAMMA + 1)
+
+    def merge(self, other):
+        """Add all values that were added to another StatAccumulator."""
+        self.count += other.count
+        self.number_count += other.number_count
+        self.sum += other.sum
+        self.sum_of_squares += other.sum_of_squares
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.has_nan = self.has_nan or other.has_nan
+        self.positive_inf_count += other.positive_inf_count
+        self.negative_inf_count += other.negative_inf_count
+        self.zero_count += other.zero_count
+        self.positive_buckets.update(other.positive_buckets)
+        self.negative_buckets.update(other.negative_buckets)
+
+    def _get_value_at(self, index):
+        """Estimate the index-th smallest value."""
+        if index < self.negative_inf_count:
+            return -inf
+        index -= self.negative_inf_count
+        for bucket in sorted(self.negative_buckets, reverse=True):
+            index -= self.negative_buckets[bucket]
+            if index < 0:
+                return self._clamp(-self._get_bucket_value(bucket))
+        index -= self.zero_count
+        if index < 0:
+            return Decimal(0)
+        for bucket in sorted(self.positive_buckets):
+            index -= self.positive_buckets[bucket]
+            if index < 0:
+                return self._clamp(self._get_bucket_value(bucket))
+        return inf
+
+    def _clamp(self, value):
+        value = Decimal("{:.6g}".format(value))
+        return min(max(value, self.min), self.max)
+
+    def to_stat_value(self):
+        if not self.count:
+            return None
+        if self.has_nan:
+            return StatValue(nan, nan, nan, nan, nan, nan)
+        if not self.number_count:
+            return StatValue(Decimal(0))
+
+        if self.min == -inf and self.max == inf:
+            values_sum = nan
+            mean = nan
+            stdev = nan
+        elif self.max == inf:
+            values_sum = inf
+            mean = inf
+            stdev = inf
+        elif self.min == -inf:
+            values_sum = -inf
+            mean = -inf
+            stdev = inf
+        else:
+            values_sum = self.sum
+            mean = values_sum / self.number_count
+            variance = self.sum_of_squares / self.number_count - mean * mean
+            stdev = max(variance, Decimal(0)).sqrt()
+
+        half, len_is_odd = divmod(self.number_count, 2)
+        if len_is_odd:
+            median = self._get_value_at(half)
+        else:
+            median = (
+                self._get_value_at(half - 1) + self._get_value_at(half)
+            ) / Decimal(2)
+
+        return StatValue(
+            values_sum,
+            min=self.min,
+            max=self.max,
+            avg=mean,
+            median=median,
+            stdev=stdev,
+        )
+
+
+class RunSetStatisticsAccumulator(object):
+    """
+    Computes the same statistics as get_stats_of_run_set(),
+    but incrementally for one RunResult at a time,
+    such that the results of a run set do not need to be kept in memory.
+    """
+
+    def __init__(self, correct_only):
+        self.correct_only = correct_only
+        self.category_counts = collections.Counter()
+        self._score = 0
+        self._status_count = 0
+        self._status_counts = collections.Counter()
+        # column title -> (category, result classification) or None for all values
+        # -> StatAccumulator
+        self._value_stats = collections.defaultdict(
+            lambda: collections.defaultdict(StatAccumulator)
+        )
+        # column title -> shape of value -> example value (cf. _get_value_shape())
+        self._value_examples = collections.defaultdict(dict)
+        self._text_columns = set()
+
+    def add(self, run_result):
+        self.category_counts[run_result.category] += 1
+        if run_result.status is not None:
+            key = (
+                run_result.category,
+                result.get_result_classification(run_result.status),
+            )
+
+        for column, value in zip(run_result.columns, run_result.values):
+            if column.title == "status":
+                self._score += run_result.score or 0
+                if value:
+                    self._status_count += 1
+                self._status_counts[
+                    run_result.category, result.get_result_classification(value)
+                ] += 1
+                continue
+            if column.title in self._text_columns:
+                continue
+
+            if value:
+                self._value_examples[column.title].setdefault(
+                    _get_value_shape(value), value
+                )
+            try:
+                number = util.to_decimal(value)
+            except InvalidOperation:
+                self._text_columns.add(column.title)
+                self._value_stats.pop(column.title, None)
+                continue
+
+            value_stats = self._value_stats[column.title]
+            value_stats[None].add(number)
+            if run_result.status is not None:
+                value_stats[key].add(number)
+
+    def get_stats(self, columns):
+        """
+        Return the statistics like get_stats_of_run_set() for the given columns.
+        This also sets the types of the columns according to the values that were seen.
+        """
+        stats = []
+        for column in columns:
+            column.set_column_type_from(self._value_examples[column.title].values())
+            col_type = column.type.type
+            if col_type == ColumnType.status:
+                column_stats = ColumnStatistics()
+                column_stats.score = StatValue(self._score)
+                column_stats.total = StatValue(self._status_count)
+
+                def create_stat_value_for(*keys):
+                    return StatValue(sum(self._status_counts[key] for key in keys))
+
+                _set_stats_per_category(column_stats, create_stat_value_for)
+
+            elif col_type != ColumnType.text and column.title not in self._text_columns:
+                value_stats = self._value_stats[column.title]
+                column_stats = ColumnStatistics()
+                column_stats.total = value_stats[None].to_stat_value()
+
+                def create_stat_value_for(*keys):
+                    accumulator = StatAccumulator()
+                    for key in keys:
+                        if key in value_stats:
+                            accumulator.merge(value_stats[key])
+                    return accumulator.to_stat_value()
+
+                _set_stats_per_category(
+                    column_stats,
+                    create_stat_value_for,
+                    include_wrong=not self.correct_only,
+                )
+
+            else:
+                column_stats = None
+
+            stats.append(column_stats)
+
+        return stats
+
+
+def _get_value_shape(value):
+    """
+    Return a key for a value such that the heuristic for determining column types
+    gives the same result for all values with the same key.
+    This allows to determine the column type without storing all values.
+    """
+    match = columns.REGEX_MEASURE.match(value)
+    if not match:
+        return None  # all values that are not numbers make the column a text column
+    return (
+        tuple(len(group) if group else 0 for group in match.groups()),
+        match.group(columns.GROUP_SPECIAL_FLOATS_PART),
+        match.group(columns.GROUP_EXPONENT_PART),
+        match.group(columns.GROUP_UNIT),
+        bool((match.group(columns.GROUP_INT_PART) or "").strip("0")),
+    )
 
 
 def add_local_summary_statistics(run_set_result, run_set_stats):
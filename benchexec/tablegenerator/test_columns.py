@@ -6,6 +6,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from decimal import Decimal
+import random
 import unittest
 
 from benchexec.tablegenerator.columns import (
@@ -475,3 +476,89 @@ class ColumnsTest(unittest.TestCase):
 
     def test_column_type_comma_decimal_is_text(self):
         self.check_expected_column_type(["1,2"], ColumnType.text)
+
+    def test_diff_tolerance(self):
+        column = Column("cputime")
+        self.assertIsNone(column.diff_absolute_tolerance)
+        self.assertIsNone(column.diff_relative_tolerance)
+        self.assertFalse(column.relevant_for_diff)
+
+        column = Column(
+            "cputime", diff_absolute_tolerance="0.5", diff_relative_tolerance="10%"
+        )
+        self.assertEqual(Decimal("0.5"), column.diff_absolute_tolerance)
+        self.assertEqual(Decimal("0.1"), column.diff_relative_tolerance)
+        self.assertTrue(column.relevant_for_diff)
+
+        column = Column(
+            "cputime", relevant_for_diff="false", diff_relative_tolerance="5"
+        )
+        self.assertEqual(Decimal("0.05"), column.diff_relative_tolerance)
+        self.assertFalse(column.relevant_for_diff)
+
+    def test_invalid_diff_tolerance(self):
+        for tolerance in ["", "abc", "-1", "inf", "5%"]:
+            with self.assertRaises(TableDefinitionError, msg=tolerance):
+                Column("cputime", diff_absolute_tolerance=tolerance)
+
+    def test_format_values_for_csv(self):
+        values = [
+            None,
+            "",
+            "0",
+            "-0",
+            "0.000",
+            "1",
+            "12300",
+            "9.99",
+            "0.0999",
+            "0.00050",
+            "-12.3456s",
+            "60.819608754s",
+            "806817792",
+            " 1.5 MB ",
+            "007",
+            "+3",
+            "1e+5",
+            "NaN",
+            "inf",
+            "-Inf",
+            "1234567890.1234567890123456789012",
+            Decimal("1.25"),
+        ]
+        random_generator = random.Random(0)
+        for _ in range(1000):
+            length = random_generator.randrange(1, 12)
+            digits = "".join(
+                random_generator.choice("0123456789") for _ in range(length)
+            )
+            point = random_generator.randrange(length + 1)
+            values.append(digits[:point] + "." + digits[point:] if point else digits)
+
+        for column in [
+            Column("cputime", col_type=self.measure_type),
+            Column("cputime", num_of_digits=1, col_type=self.measure_type),
+            Column("cputime", num_of_digits="3", col_type=self.measure_type),
+            Column(
+                "memory",
+                num_of_digits=4,
+                col_type=self.measure_type,
+                unit="MB",
+                source_unit="B",
+                scale_factor="0.000001",
+            ),
+            Column("memory", col_type=self.measure_type, unit="kB", scale_factor=1000),
+            Column("memory", col_type=self.measure_type, unit="B", scale_factor="1.0"),
+            Column("count", num_of_digits=2, col_type=ColumnType.count),
+        ]:
+            expected = [column.format_value(value or "", "csv") for value in values]
+            self.assertEqual(
+                expected, column.format_values_for_csv(values), msg=str(column)
+            )
+
+    def test_format_values_for_csv_text(self):
+        column = Column("status", col_type=ColumnType.text)
+        self.assertEqual(
+            ["true", "", "", "1.50"],
+            column.format_values_for_csv(["true", None, "", "1.50"]),
+        )
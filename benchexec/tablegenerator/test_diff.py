@@ -0,0 +1,110 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+from benchexec.tablegenerator import RunResult, Row, filter_rows_with_differences
+from benchexec.tablegenerator.columns import Column
+from benchexec.tablegenerator.util import TaskId
+
+
+class FilterRowsWithDifferencesTest(unittest.TestCase):
+    def create_rows(self, columns, values_per_row, columns_relevant_for_diff):
+        rows = []
+        for i, row_values in enumerate(values_per_row):
+            task_id = TaskId("task{}".format(i), None, None, None)
+            rows.append(
+                Row(
+                    [
+                        RunResult(
+                            task_id,
+                            values[0],
+                            "correct",
+                            None,
+                            None,
+                            columns,
+                            values,
+                            columns_relevant_for_diff,
+                        )
+                        for values in row_values
+                    ]
+                )
+            )
+        return rows
+
+    def get_differing_tasks(self, rows):
+        return [row.id.name for row in filter_rows_with_differences(rows)]
+
+    def test_status(self):
+        columns = [Column("status"), Column("cputime")]
+        rows = self.create_rows(
+            columns,
+            [
+                [("true", "1s"), ("true", "2s"), ("true", "3s")],
+                [("true", "1s"), ("false", "1s"), ("true", "1s")],
+                [("true", "1s"), ("true", "1s"), ("TIMEOUT", "1s")],
+                [("true", "1s"), ("true", "1s"), ("true", "1s")],
+            ],
+            set(),
+        )
+        self.assertEqual(["task1", "task2"], self.get_differing_tasks(rows))
+
+    def test_relevant_column_without_tolerance(self):
+        columns = [Column("status"), Column("cputime", relevant_for_diff="true")]
+        rows = self.create_rows(
+            columns,
+            [
+                [("true", "1s"), ("false", "1s")],
+                [("true", "1s"), ("true", "1.5s")],
+                [("true", "1s"), ("true", "1s")],
+            ],
+            {"cputime"},
+        )
+        self.assertEqual(["task1"], self.get_differing_tasks(rows))
+
+    def test_tolerance(self):
+        columns = [
+            Column("status"),
+            Column(
+                "cputime", diff_absolute_tolerance="1", diff_relative_tolerance="10%"
+            ),
+        ]
+        rows = self.create_rows(
+            columns,
+            [
+                # only relative difference is larger than tolerance
+                [("true", "1s"), ("true", "1.5s"), ("true", "1s")],
+                # only absolute difference is larger than tolerance
+                [("true", "100s"), ("true", "105s"), ("true", "100s")],
+                [("true", "100s"), ("true", "120s"), ("true", "100s")],
+                [("true", "100s"), ("true", "90s"), ("true", "111s")],
+                [("true", "1s"), ("true", None), ("true", "1s")],
+                [("true", "inf"), ("true", "1s"), ("true", "1s")],
+                [("true", None), ("true", None), ("true", None)],
+            ],
+            {"status", "cputime"},
+        )
+        self.assertEqual(
+            ["task2", "task3", "task4", "task5"], self.get_differing_tasks(rows)
+        )
+
+    def test_tolerance_in_display_unit(self):
+        columns = [
+            Column("status"),
+            Column("memory", unit="MB", source_unit="B", diff_absolute_tolerance="10"),
+        ]
+        columns[1].set_column_type_from(["1000000B"])
+        rows = self.create_rows(
+            columns,
+            [
+                [("true", "100000000B"), ("true", "105000000B")],
+                [("true", "100000000B"), ("true", "115000000B")],
+                [("true", "100000000B"), ("true", "100000000B")],
+            ],
+            {"memory"},
+        )
+        self.assertEqual(["task1"], self.get_differing_tasks(rows))
@@ -0,0 +1,356 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import types
+import unittest
+import zlib
+
+from benchexec.tablegenerator import htmltable
+
+# Executes decode-compact-data.js with Node.js in an environment that provides
+# only the parts of a browser that the script uses, and prints the decoded rows.
+_NODE_HARNESS = """
+const fs = require("fs");
+const path = require("path");
+const vm = require("vm");
+const [decoderFile, dataFile, start, end] = process.argv.slice(2);
+globalThis.window = globalThis;
+window.data = { rows: JSON.parse(fs.readFileSync(dataFile, "utf8")) };
+let appStarted = false;
+globalThis.document = {
+  readyState: "complete",
+  getElementById: () => ({
+    set textContent(message) {
+      console.error(message);
+      process.exitCode = 1;
+    },
+  }),
+  querySelectorAll: () => {
+    appStarted = true;
+    return [];
+  },
+  createElement: () => ({}),
+  head: {
+    // scripts are loaded from files relative to the data file
+    appendChild: (script) =>
+      setImmediate(() => {
+        const file = path.join(path.dirname(dataFile), script.src);
+        if (fs.existsSync(file)) {
+          vm.runInThisContext(fs.readFileSync(file, "utf8"));
+        } else {
+          script.onerror();
+        }
+      }),
+  },
+};
+vm.runInThisContext(fs.readFileSync(decoderFile, "utf8"));
+let printed = false;
+function print(rows) {
+  printed = true;
+  console.log(JSON.stringify({ appStarted: appStarted, rows: rows }));
+}
+if (start !== undefined) {
+  window.benchexecLoadRows(Number(start), Number(end)).then(print, (error) => {
+    console.error(String(error));
+    process.exitCode = 1;
+  });
+}
+process.on("beforeExit", () => {
+  if (!printed) {
+    print(window.data.rows);
+  }
+});
+"""
+
+
+def decode_rows(encoded):
+    """Python version of decode-compact-data.js"""
+    strings = encoded["strings"]
+
+    def get_value(column, i):
+        if not column:
+            return None
+        if "d" in column:
+            return strings[column["d"][i]]
+        return column["v"][i]
+
+    def get_link(column, i):
+        if not column or get_value(column["prefix"], i) is None:
+            return None
+        return get_value(column["prefix"], i) + get_value(column["name"], i)
+
+    def decode_result(run_set, i):
+        result = {
+            "category": get_value(run_set["category"], i),
+            "score": get_value(run_set["score"], i),
+            "href": get_link(run_set["href"], i),
+        }
+        result = {k: v for k, v in result.items() if v is not None}
+        result["values"] = [
+            {
+                k: v
+                for k, v in [
+                    ("href", get_link(value["href"], i)),
+                    ("raw", get_value(value["raw"], i)),
+                    ("html", get_value(value["html"], i)),
+                ]
+                if v is not None
+            }
+            for value in run_set["values"]
+        ]
+        return result
+
+    rows = []
+    for i in range(encoded["count"]):
+        row = {
+            "id": [get_value(id_column, i) for id_column in encoded["id"]],
+            "results": [decode_result(run_set, i) for run_set in encoded["results"]],
+        }
+        row["id"] = [id_part for id_part in row["id"] if id_part is not None]
+        href = get_link(encoded["href"], i)
+        if href is not None:
+            row["href"] = href
+        rows.append(row)
+    return rows
+
+
+def create_rows(count):
+    statuses = ["true", "false(unreach-call)", "TIMEOUT"]
+    return [
+        {
+            "id": ["task{}.yml".format(i)] + (["unreach-call.prp"] if i % 2 else []),
+            "href": "../tasks/task{}.yml".format(i),
+            "results": [
+                {
+                    "category": "correct" if i % 3 == 0 else "wrong",
+                    "score": 2 if i % 3 == 0 else -16,
+                    "href": "results.logfiles/task{}.yml.log".format(i),
+                    "values": [
+                        {"raw": statuses[i % 3]},
+                        {"raw": "{}.5".format(i), "html": "{}.5&#x2007;".format(i)},
+                        {},
+                    ],
+                },
+                {"category": "empty", "values": [{}, {}, {}]},
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+TOOLS = [{"columns": [{"type": "status"}, {"type": "measure"}, {"type": "text"}]}] * 2
+
+
+def write_row_chunks(rows, target_dir, chunk_size=2, compress=False):
+    options = types.SimpleNamespace(html_chunk_size=chunk_size, compress_html=compress)
+    outfile = os.path.join(target_dir, "results.table.html")
+    return htmltable._write_row_chunks(rows, TOOLS, outfile, options)
+
+
+class HtmlTableCompactEncodingTest(unittest.TestCase):
+    def test_roundtrip(self):
+        rows = create_rows(10)
+        encoded = htmltable._encode_rows_compact(rows)
+        self.assertEqual(rows, decode_rows(json.loads(json.dumps(encoded))))
+
+    def test_roundtrip_empty(self):
+        encoded = htmltable._encode_rows_compact([])
+        self.assertEqual([], decode_rows(json.loads(json.dumps(encoded))))
+
+    def test_dictionary_encoding(self):
+        encoded = htmltable._encode_rows_compact(create_rows(10))
+        run_set = encoded["results"][0]
+        self.assertIn("d", run_set["category"])
+        self.assertIn("d", run_set["values"][0]["raw"])
+        self.assertIn("v", run_set["values"][1]["raw"])
+        self.assertIn("d", run_set["href"]["prefix"])
+        self.assertIsNone(run_set["values"][2]["raw"])
+        self.assertIsNone(encoded["results"][1]["href"])
+
+    def test_compressed(self):
+        rows = create_rows(10)
+        compressed = htmltable._compress_json(htmltable._encode_rows_compact(rows))
+        self.assertEqual("compressed", compressed["encoding"])
+        encoded = json.loads(zlib.decompress(base64.b64decode(compressed["data"])))
+        self.assertEqual(rows, decode_rows(encoded))
+
+
+class HtmlTableChunksTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="BenchExec_test_htmltable_")
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def read_chunk(self, chunk):
+        with open(os.path.join(self.tmp, chunk), encoding="utf-8") as f:
+            content = f.read()
+        prefix, _, data = content.partition(", ")
+        self.assertTrue(prefix.startswith("window.benchexecTableChunk("))
+        self.assertTrue(data.endswith(");\n"))
+        return json.loads(data[: -len(");\n")])
+
+    def test_chunks(self):
+        rows = create_rows(5)
+        index = write_row_chunks(rows, self.tmp)
+        self.assertEqual("chunked", index["encoding"])
+        self.assertEqual(5, index["count"])
+        self.assertEqual(2, index["chunk_size"])
+        self.assertEqual(
+            [
+                "results.table.data/rows-0.js",
+                "results.table.data/rows-1.js",
+                "results.table.data/rows-2.js",
+            ],
+            index["chunks"],
+        )
+        decoded = []
+        for chunk in index["chunks"]:
+            decoded.extend(decode_rows(self.read_chunk(chunk)))
+        self.assertEqual(rows, decoded)
+
+    def test_chunks_compressed(self):
+        rows = create_rows(3)
+        index = write_row_chunks(rows, self.tmp, compress=True)
+        chunk = self.read_chunk(index["chunks"][0])
+        self.assertEqual("compressed", chunk["encoding"])
+        encoded = json.loads(zlib.decompress(base64.b64decode(chunk["data"])))
+        self.assertEqual(rows[:2], decode_rows(encoded))
+
+    def test_old_chunks_removed(self):
+        write_row_chunks(create_rows(5), self.tmp)
+        index = write_row_chunks(create_rows(1), self.tmp)
+        self.assertEqual(1, len(index["chunks"]))
+        self.assertEqual(
+            ["rows-0.js"], os.listdir(os.path.join(self.tmp, "results.table.data"))
+        )
+
+    def test_summary(self):
+        index = write_row_chunks(create_rows(5), self.tmp)
+        self.assertEqual(["task0.yml"], index["first_id"])
+        run_set = index["run_sets"][0]
+        self.assertEqual(["correct", "wrong"], run_set["categories"])
+        self.assertTrue(run_set["score_based"])
+        self.assertEqual(
+            [
+                {"statuses": ["TIMEOUT", "false(unreach-call)", "true"]},
+                {"min": 0.5, "max": 4.5},
+                {"distincts": []},
+            ],
+            run_set["columns"],
+        )
+        run_set = index["run_sets"][1]
+        self.assertEqual(["empty"], run_set["categories"])
+        self.assertFalse(run_set["score_based"])
+        self.assertEqual({}, run_set["columns"][1])
+
+
+@unittest.skipIf(shutil.which("node") is None, "Node.js is not available")
+class HtmlTableDecoderScriptTest(unittest.TestCase):
+    """Tests for the real decode-compact-data.js, executed with Node.js."""
+
+    def run_node(self, data, *args):
+        """
+        Run the decoder for the given data, which can also be a function
+        that creates the data (and data files) in a given directory.
+        """
+        tmp = tempfile.mkdtemp(prefix="BenchExec_test_htmltable_")
+        try:
+            if callable(data):
+                data = data(tmp)
+            data_file = os.path.join(tmp, "data.json")
+            with open(data_file, "w") as f:
+                json.dump(data, f)
+            harness_file = os.path.join(tmp, "harness.js")
+            with open(harness_file, "w") as f:
+                f.write(_NODE_HARNESS)
+
+            process = subprocess.run(
+                ["node", harness_file, htmltable._COMPACT_DATA_DECODER, data_file]
+                + [str(arg) for arg in args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                timeout=60,
+            )
+        finally:
+            shutil.rmtree(tmp)
+        return process
+
+    def run_decoder(self, data, *args):
+        process = self.run_node(data, *args)
+        self.assertEqual(0, process.returncode, process.stderr)
+        return json.loads(process.stdout)
+
+    def test_compact(self):
+        rows = create_rows(10)
+        result = self.run_decoder(htmltable._encode_rows_compact(rows))
+        self.assertEqual(rows, result["rows"])
+        self.assertFalse(result["appStarted"])
+
+    def test_compact_empty(self):
+        result = self.run_decoder(htmltable._encode_rows_compact([]))
+        self.assertEqual([], result["rows"])
+
+    def test_compressed(self):
+        rows = create_rows(10)
+        compressed = htmltable._compress_json(htmltable._encode_rows_compact(rows))
+        result = self.run_decoder(compressed)
+        self.assertEqual(rows, result["rows"])
+        # the app is started only after the data was decompressed
+        self.assertTrue(result["appStarted"])
+
+    def test_uncompressed_rows_unchanged(self):
+        rows = create_rows(3)
+        self.assertEqual(rows, self.run_decoder(rows)["rows"])
+
+    def test_compressed_invalid(self):
+        data = base64.b64encode(b"not deflated").decode("ascii")
+        process = self.run_node({"encoding": "compressed", "data": data})
+        self.assertNotEqual(0, process.returncode)
+        self.assertIn("Could not load the data of this table", process.stderr)
+        self.assertFalse(json.loads(process.stdout)["appStarted"])
+
+    def test_chunked_on_demand(self):
+        rows = create_rows(5)
+        result = self.run_decoder(lambda tmp: write_row_chunks(rows, tmp), 1, 4)
+        self.assertEqual(rows[1:4], result["rows"])
+        # the app starts immediately and loads rows itself
+        self.assertFalse(result["appStarted"])
+
+    def test_chunked_on_demand_compressed(self):
+        rows = create_rows(5)
+        result = self.run_decoder(
+            lambda tmp: write_row_chunks(rows, tmp, compress=True), 0, 10
+        )
+        self.assertEqual(rows, result["rows"])
+
+    def test_chunked_before_start(self):
+        rows = create_rows(5)
+
+        def create_data(tmp):
+            index = write_row_chunks(rows, tmp)
+            index["on_demand"] = False
+            return index
+
+        result = self.run_decoder(create_data)
+        self.assertEqual(rows, result["rows"])
+        self.assertTrue(result["appStarted"])
+
+    def test_chunked_missing_file(self):
+        def create_data(tmp):
+            index = write_row_chunks(create_rows(5), tmp)
+            os.remove(os.path.join(tmp, index["chunks"][1]))
+            return index
+
+        process = self.run_node(create_data, 0, 5)
+        self.assertNotEqual(0, process.returncode)
+        self.assertIn("Could not load results.table.data/rows-1.js", process.stderr)
@@ -519,6 +519,98 @@ class TableGeneratorIntegrationTests(unittest.TestCase):
             diff_prefix="multi-table.diff",
         )
 
+    def test_multiple_table_definitions(self):
+        self.run_cmd(
+            *tablegenerator
+            + ["--outputpath", self.tmp]
+            + ["-x", os.path.join(here, "multi-table.xml")]
+            + ["-x", os.path.join(here, "multi-table-with-columns.xml")]
+            + ["-x", os.path.join(here, "multi-table.xml")]
+        )
+        prefixes = [
+            "multi-table.table",
+            "multi-table.diff",
+            "multi-table-with-columns.table",
+            "multi-table-with-columns.diff",
+        ]
+        self.assertSetEqual(
+            set(os.listdir(self.tmp)),
+            {prefix + ext for prefix in prefixes for ext in [".csv", ".html"]},
+        )
+        for prefix in prefixes:
+            self.assert_file_content_equals(
+                benchexec.util.read_file(self.tmp, prefix + ".csv"),
+                [here, "expected", prefix + ".csv"],
+            )
+            self.assert_file_content_equals(
+                self.read_table_from_html(os.path.join(self.tmp, prefix + ".html")),
+                [here, "expected", prefix + ".html"],
+            )
+
+    def test_multiple_table_definitions_with_same_name(self):
+        other_dir = os.path.join(self.tmp, "other")
+        os.mkdir(other_dir)
+        shutil.copy(os.path.join(here, "multi-table.xml"), other_dir)
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            subprocess.check_output(
+                args=tablegenerator
+                + ["--outputpath", self.tmp]
+                + ["-x", os.path.join(here, "multi-table.xml")]
+                + ["-x", os.path.join(other_dir, "multi-table.xml")],
+                stderr=subprocess.STDOUT,
+            )
+        self.assertIn(b"would produce tables with the same name", cm.exception.output)
+        self.assertEqual(os.listdir(self.tmp), ["other"])
+
+    def test_statistics_only(self):
+        output = self.run_cmd(
+            *tablegenerator
+            + ["--statistics-only", "--dump", "--outputpath", self.tmp]
+            + ["--name", "big-table"]
+            + [
+                result_file(
+                    "integration-predicateAnalysis.2015-10-20_1355.results.xml.bz2"
+                ),
+                result_file(
+                    "integration-predicateAnalysis.2015-10-22_1113.results.xml.bz2"
+                ),
+            ]
+        )
+        # regressions are not counted because this needs the results for each task
+        self.assertIn("STATS\n338 8 136\n315 8 161\n", output)
+        self.assertNotIn("REGRESSIONS", output)
+
+        lines = benchexec.util.read_file(self.tmp, "big-table.statistics.csv")
+        lines = [line.split("\t") for line in lines.splitlines()]
+        self.assertEqual(
+            [
+                "run set",
+                "file",
+                "column",
+                "statistics",
+                "sum",
+                "min",
+                "max",
+                "avg",
+                "median",
+                "stdev",
+            ],
+            lines[0],
+        )
+        stats = {(line[1], line[2], line[3]): line[4:] for line in lines[1:]}
+        first_file = result_file(
+            "integration-predicateAnalysis.2015-10-20_1355.results.xml.bz2"
+        )
+        self.assertEqual(
+            ["482", "", "", "", "", ""], stats[first_file, "status", "total"]
+        )
+        self.assertEqual(
+            ["10737.366230207", "1.810426485", "66.228349448"],
+            stats[first_file, "cputime (s)", "total"][:3],
+        )
+        self.assertNotIn((first_file, "category", "total"), stats)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "big-table.table.csv")))
+
     def test_multi_table_xml_with_columns(self):
         self.generate_tables_and_compare_content(
             ["-x", os.path.join(here, "multi-table-with-columns.xml")],
@@ -0,0 +1,178 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import collections
+import contextlib
+import io
+import itertools
+import statistics
+import types
+import unittest
+from xml.etree import ElementTree
+
+from benchexec import tablegenerator
+from benchexec.tablegenerator import performance
+from benchexec.tablegenerator.columns import Column
+
+
+class PerformanceTest(unittest.TestCase):
+    def test_bootstrap_distribution_exact(self):
+        for n in range(1, 6):
+            values = [float(2 ** i) for i in range(n)]  # all sums are distinct
+            expected = collections.Counter()
+            for resample in itertools.product(values, repeat=n):
+                expected[statistics.median(resample)] += 1 / n ** n
+
+            actual = dict(performance._get_median_distribution(values))
+            self.assertEqual(set(expected), set(actual))
+            for median, probability in expected.items():
+                self.assertAlmostEqual(probability, actual[median], msg=median)
+
+    def test_bootstrap_distribution_sampled(self):
+        n = performance._MAX_EXACT_BOOTSTRAP_SIZE + 1
+        distribution = performance._get_bootstrap_median_positions(n)
+        self.assertAlmostEqual(1, sum(p for _, p in distribution))
+        for (i, j), _ in distribution:
+            self.assertLessEqual(0, i)
+            self.assertLessEqual(i, j)
+            self.assertLess(j, n)
+
+    def test_compare_groups(self):
+        old = [[10.0, 10.0, 5.0, None], [10.2, 10.0, 5.0, 1.0], [9.9, 10.0, 5.0, 1.0]]
+        new = [[20.0, 10.0, 2.1, 1.0], [20.5, 10.0, 2.0, 1.0], [19.8, 10.0, 2.2, None]]
+        comparisons = performance.compare_groups(old, new)
+
+        slower, unchanged, faster, missing = comparisons
+        self.assertEqual(10.0, slower.old_median)
+        self.assertEqual(20.0, slower.new_median)
+        self.assertAlmostEqual(0.1, slower.old_mad)
+        self.assertAlmostEqual(1.0, slower.change)
+        self.assertTrue(performance.is_significant(slower))
+        self.assertFalse(performance.is_significant(unchanged))
+        self.assertEqual((0, 0), unchanged.confidence_interval)
+        self.assertTrue(performance.is_significant(faster))
+        self.assertLess(faster.confidence_interval[1], 0)
+        self.assertEqual(1.0, missing.old_median)
+        self.assertFalse(performance.is_significant(missing))
+
+    def test_compare_groups_noise(self):
+        old = [[10.0], [12.0], [11.0]]
+        new = [[10.5], [11.5], [13.0]]
+        (comparison,) = performance.compare_groups(old, new)
+        self.assertFalse(performance.is_significant(comparison))
+        low, high = comparison.confidence_interval
+        self.assertLess(low, 0)
+        self.assertGreater(high, 0)
+
+    def test_compare_groups_without_repetitions(self):
+        (comparison,) = performance.compare_groups([[10.0]], [[20.0]])
+        self.assertIsNone(comparison.confidence_interval)
+        self.assertFalse(performance.is_significant(comparison))
+
+    def test_compare_groups_without_values(self):
+        self.assertEqual([None], performance.compare_groups([[None]], [[1.0]]))
+
+    def test_group_run_sets(self):
+        def run_set(version, name):
+            return types.SimpleNamespace(
+                attributes={
+                    "tool": ["CPAchecker"],
+                    "version": [version],
+                    "name": [name],
+                    "date": ["2020-01-01"],
+                }
+            )
+
+        groups = performance.group_run_sets(
+            [
+                run_set("1.0", "predicate"),
+                run_set("1.0", "predicate"),
+                run_set("1.1", "predicate"),
+                run_set("1.0", "predicate"),
+                run_set("1.0", "value"),
+            ]
+        )
+        self.assertEqual(
+            [
+                ("predicate CPAchecker 1.0", [0, 1, 3]),
+                ("predicate CPAchecker 1.1", [2]),
+                ("value CPAchecker 1.0", [4]),
+            ],
+            groups,
+        )
+
+    def test_write_csv(self):
+        groups = [("old", [0, 1]), ("new", [2, 3])]
+        comparisons = performance.compare_groups(
+            [[10.0, 5.0], [10.5, 5.0]], [[20.0, 5.0], [20.5, 5.0]]
+        )
+        out = io.StringIO()
+        performance.write_performance_csv(
+            out,
+            groups,
+            [
+                ("task1.c", "unreach-call", "cputime (s)", 0, 1, comparisons[0]),
+                ("task2.c", None, "cputime (s)", 0, 1, comparisons[1]),
+            ],
+        )
+        lines = [line.split("\t") for line in out.getvalue().splitlines()]
+        self.assertEqual(3, len(lines))
+        self.assertEqual(13, len(lines[0]))
+        self.assertEqual(
+            ["task1.c", "unreach-call", "cputime (s)", "old", "new", "10.25"],
+            lines[1][:6],
+        )
+        self.assertEqual(["+97.6%", "9.5", "10.5", "regression"], lines[1][9:])
+        self.assertEqual(["task2.c", ""], lines[2][:2])
+        self.assertEqual(["+0.0%", "0", "0", ""], lines[2][9:])
+
+    def test_performance_report_with_samples(self):
+        def run_result(*cputimes):
+            run_tag = ElementTree.fromstring(
+                '<run name="task1"><column title="status" value="true"/></run>'
+            )
+            for repetition, cputime in enumerate(cputimes, start=1):
+                sample = ElementTree.SubElement(
+                    run_tag, "sample", repetition=str(repetition)
+                )
+                ElementTree.SubElement(
+                    sample, "column", title="cputime", value="{}s".format(cputime)
+                )
+            return tablegenerator.RunResult.create_from_xml(
+                run_tag,
+                None,
+                [Column("status"), Column("cputime")],
+                False,
+                {},
+                set(),
+                "results.xml",
+            )
+
+        old = run_result(10.0, 10.5, 11.0)
+        self.assertEqual(
+            ((None, "10.0s"), (None, "10.5s"), (None, "11.0s")), old.samples
+        )
+        new = run_result(20.0, 20.5, 21.0)
+        for result in [old, new]:
+            result.columns[1].set_column_type_from(
+                [sample[1] for sample in result.samples]
+            )
+        rows = [tablegenerator.Row([old, new])]
+        rows[0].set_relative_path("", ".")
+
+        # each sample counts as repetition, so one run set per group is enough
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            tablegenerator.create_performance_report(
+                "test", rows, [("old", [0]), ("new", [1])], ".", "-"
+            )
+        lines = [line.split("\t") for line in out.getvalue().splitlines()]
+        self.assertEqual(2, len(lines))
+        self.assertEqual(
+            ["task1", "", "cputime (s)", "old", "new", "10.5"], lines[1][:6]
+        )
+        self.assertEqual("regression", lines[1][-1])
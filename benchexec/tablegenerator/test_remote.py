@@ -0,0 +1,204 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import http.server
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.error
+import zipfile
+
+from benchexec.tablegenerator import remote
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the files of the server with support for validators and ranges."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        content = server.files.get(self.path)
+        if content is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"{}"'.format(hash(content))
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        status = 200
+        headers = {"ETag": etag}
+        requested_range = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if server.support_ranges and requested_range and if_range in (None, etag):
+            start, end = requested_range[len("bytes=") :].split("-")
+            size = len(content)
+            if not start:  # suffix range
+                start, end = max(size - int(end), 0), size - 1
+            else:
+                start, end = int(start), min(int(end), size - 1)
+            status = 206
+            headers["Content-Range"] = "bytes {}-{}/{}".format(start, end, size)
+            content = content[start : end + 1]
+
+        server.bytes_sent += len(content)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(http.server.HTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RequestHandler)
+        self.files = {}
+        self.requests = []
+        self.connections = 0
+        self.bytes_sent = 0
+        self.support_ranges = True
+
+    def process_request(self, request, client_address):
+        # handle each connection in its own thread, like ThreadingHTTPServer
+        self.connections += 1
+        thread = threading.Thread(
+            target=self.process_request_thread, args=(request, client_address)
+        )
+        thread.daemon = True
+        thread.start()
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class RemoteTest(unittest.TestCase):
+    def setUp(self):
+        self.server = _Server()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = "http://127.0.0.1:{}".format(self.server.server_port)
+        self.cache_dir = tempfile.mkdtemp(prefix="BenchExec_test_remote_")
+
+    def tearDown(self):
+        remote.set_cache_dir(None)
+        for connection in remote._pool.connections.values():
+            connection.close()
+        remote._pool.connections.clear()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_open_url(self):
+        self.server.files["/a.xml"] = b"<result/>"
+        self.server.files["/b.xml"] = b"<result></result>"
+        with remote.open_url(self.base_url + "/a.xml") as f:
+            self.assertEqual(b"<result/>", f.read())
+        with remote.open_url(self.base_url + "/b.xml") as f:
+            self.assertEqual(b"<result></result>", f.read())
+        self.assertEqual(1, self.server.connections)
+
+    def test_open_url_not_found(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            remote.open_url(self.base_url + "/missing.xml")
+        self.assertEqual(404, context.exception.code)
+        self.assertIsInstance(context.exception, OSError)
+
+    def test_cache(self):
+        remote.set_cache_dir(self.cache_dir)
+        url = self.base_url + "/a.xml"
+        self.server.files["/a.xml"] = b"<result/>"
+        with remote.open_url(url) as f:
+            self.assertEqual(b"<result/>", f.read())
+        with remote.open_url(url) as f:
+            self.assertEqual(b"<result/>", f.read())
+        self.assertEqual(len(b"<result/>"), self.server.bytes_sent)
+        self.assertIn("If-None-Match", self.server.requests[1][1])
+
+        self.server.files["/a.xml"] = b"<result></result>"
+        with remote.open_url(url) as f:
+            self.assertEqual(b"<result></result>", f.read())
+        with remote.open_url(url) as f:
+            self.assertEqual(b"<result></result>", f.read())
+        self.assertEqual(4, len(self.server.requests))
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def create_zip(self):
+        content = io.BytesIO()
+        with zipfile.ZipFile(content, "w") as zip_file:
+            for i in range(20):
+                zip_file.writestr(
+                    "logs/run{}.log".format(i), os.urandom(5000).hex() * 2
+                )
+        self.server.files["/logs.zip"] = content.getvalue()
+        return zipfile.ZipFile(io.BytesIO(content.getvalue()))
+
+    def test_random_access(self):
+        expected = self.create_zip()
+        old_block_size = remote.BLOCK_SIZE
+        remote.BLOCK_SIZE = 4096
+        try:
+            f = remote.open_url_random_access(self.base_url + "/logs.zip")
+            self.assertIsInstance(f, remote.RemoteFile)
+            with zipfile.ZipFile(f) as zip_file:
+                for name in ["logs/run3.log", "logs/run17.log"]:
+                    self.assertEqual(expected.read(name), zip_file.read(name))
+                self.assertEqual(expected.namelist(), zip_file.namelist())
+        finally:
+            remote.BLOCK_SIZE = old_block_size
+        self.assertLess(self.server.bytes_sent, len(self.server.files["/logs.zip"]) / 4)
+        self.assertEqual(1, self.server.connections)
+
+    def test_random_access_without_range_support(self):
+        self.server.support_ranges = False
+        expected = self.create_zip()
+        f = remote.open_url_random_access(self.base_url + "/logs.zip")
+        self.assertNotIsInstance(f, remote.RemoteFile)
+        with zipfile.ZipFile(f) as zip_file:
+            self.assertEqual(
+                expected.read("logs/run3.log"), zip_file.read("logs/run3.log")
+            )
+
+    def test_random_access_changed_file(self):
+        self.create_zip()
+        f = remote.open_url_random_access(self.base_url + "/logs.zip")
+        self.server.files["/logs.zip"] = b"changed"
+        with self.assertRaises(OSError):
+            f.read()
+
+    def test_random_access_seek_and_read(self):
+        data = bytes(range(256)) * 100
+        self.server.files["/data"] = data
+        old_block_size = remote.BLOCK_SIZE
+        remote.BLOCK_SIZE = 1000
+        try:
+            f = remote.open_url_random_access(self.base_url + "/data")
+            self.assertEqual(len(data), f.seek(0, io.SEEK_END))
+            f.seek(2500)
+            self.assertEqual(data[2500:4600], f.read(2100))
+            self.assertEqual(4600, f.tell())
+            f.seek(-10, io.SEEK_END)
+            self.assertEqual(data[-10:], f.read())
+            self.assertEqual(b"", f.read())
+        finally:
+            remote.BLOCK_SIZE = old_block_size
@@ -0,0 +1,100 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import pickle
+import unittest
+
+from benchexec.tablegenerator import RunResult, RunSetResult
+from benchexec.tablegenerator.columns import Column
+from benchexec.tablegenerator.util import TaskId
+
+
+class RunSetResultPickleTest(unittest.TestCase):
+    def create_run_set_result(self):
+        columns = [Column("status"), Column("cputime"), Column("walltime")]
+        relevant_for_diff = {"cputime"}
+        run_set_result = RunSetResult(
+            [],
+            {"tool": ["DummyTool"], "name": ["test"]},
+            columns,
+            summary={"cputime": "10s"},
+            columns_relevant_for_diff=relevant_for_diff,
+        )
+        run_set_result.results = [
+            RunResult(
+                TaskId("task1.yml", None, True, None),
+                "true",
+                "correct",
+                2,
+                "logs/task1.log",
+                run_set_result.columns,
+                ["true", "1.5s", "2.0s"],
+                relevant_for_diff,
+            ),
+            RunResult(
+                TaskId("task2", None, None, "runset"),
+                "TIMEOUT",
+                "error",
+                None,
+                None,
+                run_set_result.columns,
+                ["TIMEOUT", "900s", None],
+                set(),
+                sourcefiles_exist=False,
+            ),
+            RunResult(
+                TaskId("task3.yml", None, False, None),
+                "false",
+                "correct",
+                1,
+                "logs/task3.log",
+                run_set_result.columns,
+                ["false", "1.0s", "1.1s"],
+                relevant_for_diff,
+                samples=(
+                    (None, "1.0s", "1.1s"),
+                    (None, "1.2s", None),
+                ),
+            ),
+        ]
+        return run_set_result
+
+    def test_pickle_round_trip(self):
+        original = self.create_run_set_result()
+        restored = pickle.loads(pickle.dumps(original))
+
+        self.assertEqual(original.attributes, restored.attributes)
+        self.assertEqual(original.summary, restored.summary)
+        self.assertEqual(
+            original.columns_relevant_for_diff, restored.columns_relevant_for_diff
+        )
+        self.assertEqual(
+            [column.title for column in original.columns],
+            [column.title for column in restored.columns],
+        )
+        self.assertEqual(len(original.results), len(restored.results))
+
+        for expected, actual in zip(original.results, restored.results):
+            for field in RunResult.__slots__:
+                if field == "columns":
+                    self.assertEqual(
+                        [column.title for column in expected.columns],
+                        [column.title for column in actual.columns],
+                    )
+                else:
+                    self.assertEqual(
+                        getattr(expected, field), getattr(actual, field), field
+                    )
+            self.assertIsInstance(actual.task_id, TaskId)
+            # shared objects stay shared
+            self.assertIs(restored.columns, actual.columns)
+
+    def test_pickle_without_results(self):
+        original = RunSetResult([], {"tool": ["DummyTool"]}, [Column("status")])
+        restored = pickle.loads(pickle.dumps(original))
+        self.assertFalse(hasattr(restored, "results"))
+        self.assertEqual(original.attributes, restored.attributes)
@@ -9,7 +9,7 @@ from decimal import Decimal
 import sys
 import unittest
 
-from benchexec.tablegenerator.statistics import StatValue
+from benchexec.tablegenerator.statistics import StatAccumulator, StatValue
 
 sys.dont_write_bytecode = True  # prevent creation of .pyc files
 
@@ -176,3 +176,69 @@ class TestStatValue(unittest.TestCase):
         self.assertEqual(s.min, ninf, "Not -Inf, but " + str(s.min))
         self.assertEqual(s.median, v, "Not 0.123, but " + str(s.median))
         self.assertTrue(s.stdev.is_nan(), "Not NaN, but " + str(s.stdev))
+
+
+class TestStatAccumulator(unittest.TestCase):
+    def assert_same_stat_value(self, values):
+        accumulator = StatAccumulator()
+        for v in values:
+            accumulator.add(v)
+        expected = StatValue.from_list(values)
+        actual = accumulator.to_stat_value()
+        if expected is None:
+            self.assertIsNone(actual)
+            return
+        for key in ["sum", "min", "max", "avg", "stdev"]:
+            expected_value = getattr(expected, key)
+            actual_value = getattr(actual, key)
+            if expected_value is None or not expected_value.is_finite():
+                self.assertEqual(str(expected_value), str(actual_value), key)
+            elif key == "stdev":
+                # computed differently, so rounding errors are different
+                self.assertAlmostEqual(expected_value, actual_value, places=20)
+            else:
+                self.assertEqual(expected_value, actual_value, key)
+        if expected.median is None or not expected.median.is_finite():
+            self.assertEqual(str(expected.median), str(actual.median))
+        else:
+            self.assertAlmostEqual(
+                expected.median,
+                actual.median,
+                delta=abs(expected.median) * Decimal("0.01"),
+            )
+
+    def test_empty(self):
+        self.assert_same_stat_value([])
+        self.assert_same_stat_value([None, None])
+
+    def test_values(self):
+        self.assert_same_stat_value([Decimal("1.23")])
+        self.assert_same_stat_value([Decimal("1.5"), Decimal("2.5")])
+        self.assert_same_stat_value([Decimal(0), Decimal(0), Decimal("-2"), None])
+        self.assert_same_stat_value([Decimal(i) / 7 for i in range(-50, 1000)])
+
+    def test_special_values(self):
+        inf = Decimal("inf")
+        v = Decimal("0.123")
+        self.assert_same_stat_value([Decimal("nan"), v])
+        self.assert_same_stat_value([inf, inf, v])
+        self.assert_same_stat_value([-inf, v, v])
+        self.assert_same_stat_value([inf, -inf, v])
+
+    def test_merge(self):
+        values = [Decimal(i) ** 2 / 8 for i in range(200)]
+        accumulator = StatAccumulator()
+        for start in range(0, len(values), 30):
+            part = StatAccumulator()
+            for v in values[start : start + 30]:
+                part.add(v)
+            accumulator.merge(part)
+        expected = StatValue.from_list(values)
+        actual = accumulator.to_stat_value()
+        self.assertEqual(expected.sum, actual.sum)
+        self.assertEqual(expected.min, actual.min)
+        self.assertEqual(expected.max, actual.max)
+        self.assertAlmostEqual(expected.stdev, actual.stdev, places=20)
+        self.assertAlmostEqual(
+            expected.median, actual.median, delta=expected.median * Decimal("0.01")
+        )
@@ -0,0 +1,47 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from benchexec.tablegenerator import timeseries
+
+_CONTENT = """walltime (s),cputime (s),memory (B)
+0.000,0.000,1000000
+1.000,2.000,3000000
+2.000,2.500,
+invalid,1,1
+"""
+
+
+class TimeSeriesTest(unittest.TestCase):
+    def test_get_time_series_file(self):
+        self.assertEqual(
+            "results.logfiles/task.yml.timeseries.csv",
+            timeseries.get_time_series_file("results.logfiles/task.yml.log"),
+        )
+        self.assertIsNone(timeseries.get_time_series_file(None))
+
+    def test_parse_time_series(self):
+        samples = timeseries.parse_time_series(_CONTENT.splitlines(True))
+        self.assertEqual(
+            [(0.0, 0.0, 1000000), (1.0, 2.0, 3000000), (2.0, 2.5, None)], samples
+        )
+        self.assertEqual(
+            [(1.0, 2.0), (2.0, 0.5)], timeseries.get_cpu_utilization(samples)
+        )
+
+    def test_plot_svg(self):
+        samples = timeseries.parse_time_series(_CONTENT.splitlines(True))
+        svg = ElementTree.fromstring(timeseries.plot_svg(samples, "task <1>"))
+        namespace = "{http://www.w3.org/2000/svg}"
+        self.assertEqual(2, len(svg.findall(namespace + "polyline")))
+        self.assertEqual("task <1>", svg.find(namespace + "text").text)
+
+    def test_plot_svg_empty(self):
+        svg = ElementTree.fromstring(timeseries.plot_svg([], "task"))
+        self.assertEqual([], svg.findall("{http://www.w3.org/2000/svg}polyline"))
@@ -5,7 +5,9 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import bz2
 from decimal import Decimal
+import io
 import sys
 import unittest
 
@@ -98,3 +100,49 @@ class TestUnit(unittest.TestCase):
             expected = str(float(value))
             assert "e" not in expected, expected
             self.assertEqual(expected, util.print_decimal(Decimal(value)))
+
+
+class TestParallelBZ2(unittest.TestCase):
+    def setUp(self):
+        self.data = b"".join(
+            "<run name='task{}'/>\n".format(i).encode() for i in range(100000)
+        )
+        # compress in streams of 100000 bytes
+        self.streams = [
+            bz2.compress(self.data[i : i + 100000])
+            for i in range(0, len(self.data), 100000)
+        ]
+
+    def open_bz2(self, content):
+        old_min_size = util._BZ2_PARALLEL_MIN_SIZE
+        util._BZ2_PARALLEL_MIN_SIZE = 10000
+        try:
+            return util.open_bz2(io.BytesIO(content))
+        finally:
+            util._BZ2_PARALLEL_MIN_SIZE = old_min_size
+
+    def test_multiple_streams(self):
+        f = self.open_bz2(b"".join(self.streams))
+        self.assertNotIsInstance(f, bz2.BZ2File)
+        self.assertEqual(self.data, f.read())
+
+    def test_single_stream(self):
+        f = self.open_bz2(bz2.compress(self.data))
+        self.assertIsInstance(f, bz2.BZ2File)
+        self.assertEqual(self.data, f.read())
+
+    def test_split_inside_stream(self):
+        # as if the bytes of a stream start occurred inside a stream
+        parts = [self.streams[0], self.streams[1][:500], self.streams[1][500:]]
+        parts += self.streams[2:]
+        self.assertEqual(self.data, b"".join(util._decompress_bz2_parts(parts)))
+
+    def test_truncated(self):
+        f = self.open_bz2(b"".join(self.streams)[:-100])
+        with self.assertRaises(EOFError):
+            f.read()
+
+    def test_invalid(self):
+        f = self.open_bz2(b"".join(self.streams) + b"BZh91AY&SY invalid")
+        with self.assertRaises(OSError):
+            f.read()
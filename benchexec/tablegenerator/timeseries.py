@@ -0,0 +1,132 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Plots of the resource usage of runs over time,
+as recorded by benchexec with --time-series-interval
+in files next to the log files of the runs.
+"""
+
+import csv
+from xml.sax.saxutils import escape
+
+_WIDTH = 600
+_CHART_HEIGHT = 120
+_MARGIN = 50
+
+
+def get_time_series_file(log_file):
+    """Return the name of the time-series file that belongs to a log file, or None."""
+    if log_file and log_file.endswith(".log"):
+        return log_file[: -len(".log")] + ".timeseries.csv"
+    return None
+
+
+def parse_time_series(lines):
+    """
+    Parse the content of a time-series file.
+    @param lines: the lines of the CSV file
+    @return: a list of (walltime, cputime, memory) tuples, where cputime and memory
+        may be None
+    """
+    samples = []
+    for row in csv.reader(lines[1:]):
+        if len(row) != 3:
+            continue
+        try:
+            walltime = float(row[0])
+            cputime = float(row[1]) if row[1] else None
+            memory = int(row[2]) if row[2] else None
+        except ValueError:
+            continue
+        samples.append((walltime, cputime, memory))
+    return samples
+
+
+def get_cpu_utilization(samples):
+    """
+    Compute the CPU utilization (used CPU time per wall time, i.e.,
+    the number of busy cores) between each two consecutive samples.
+    @return: a list of (walltime, utilization) pairs
+    """
+    points = [
+        (walltime, cputime) for walltime, cputime, _ in samples if cputime is not None
+    ]
+    return [
+        (walltime2, (cputime2 - cputime1) / (walltime2 - walltime1))
+        for (walltime1, cputime1), (walltime2, cputime2) in zip(points, points[1:])
+        if walltime2 > walltime1
+    ]
+
+
+def _format_number(value):
+    return "{:.3g}".format(value)
+
+
+def _plot_chart(points, title, max_time, y_offset):
+    """Create the SVG elements of one chart with a line for the given points."""
+    max_value = max((value for _, value in points), default=0) or 1
+    elements = [
+        '<text x="{}" y="{}">{}</text>'.format(_MARGIN, y_offset - 5, escape(title)),
+        '<rect x="{}" y="{}" width="{}" height="{}" fill="none" stroke="gray"/>'.format(
+            _MARGIN, y_offset, _WIDTH, _CHART_HEIGHT
+        ),
+        '<text x="{}" y="{}" text-anchor="end">{}</text>'.format(
+            _MARGIN - 5, y_offset + 10, _format_number(max_value)
+        ),
+        '<text x="{}" y="{}" text-anchor="end">0</text>'.format(
+            _MARGIN - 5, y_offset + _CHART_HEIGHT
+        ),
+    ]
+    if points:
+        coordinates = " ".join(
+            "{:.1f},{:.1f}".format(
+                _MARGIN + _WIDTH * walltime / max_time,
+                y_offset + _CHART_HEIGHT * (1 - value / max_value),
+            )
+            for walltime, value in points
+        )
+        elements.append(
+            '<polyline points="{}" fill="none" stroke="steelblue"/>'.format(coordinates)
+        )
+    return elements
+
+
+def plot_svg(samples, title):
+    """
+    Create an SVG image with charts of the memory usage and the CPU utilization
+    of a run over time.
+    @param samples: the samples as returned by parse_time_series()
+    @param title: the title of the image, e.g., the name of the task
+    @return: the SVG document as string
+    """
+    max_time = max((walltime for walltime, _, _ in samples), default=0) or 1
+    memory = [
+        (walltime, memory / 1000000)
+        for walltime, _, memory in samples
+        if memory is not None
+    ]
+    height = 3 * _MARGIN + 2 * _CHART_HEIGHT + 20
+    elements = ['<text x="{}" y="20">{}</text>'.format(_MARGIN, escape(title))]
+    elements += _plot_chart(memory, "Memory (MB)", max_time, 50)
+    elements += _plot_chart(
+        get_cpu_utilization(samples),
+        "CPU utilization (cores)",
+        max_time,
+        50 + _CHART_HEIGHT + _MARGIN,
+    )
+    elements.append(
+        '<text x="{}" y="{}" text-anchor="end">{} s</text>'.format(
+            _MARGIN + _WIDTH, height - 10, _format_number(max_time)
+        )
+    )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}" '
+        'font-family="sans-serif" font-size="12">\n{}\n</svg>\n'.format(
+            _WIDTH + 2 * _MARGIN, height, "\n".join(elements)
+        )
+    )
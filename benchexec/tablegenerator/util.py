@@ -9,15 +9,21 @@
 This module contains some useful functions for Strings, Files and Lists.
 """
 
+import bz2
 import collections
+import concurrent.futures
 from decimal import Decimal
 import glob
 import io
+import itertools
 import logging
 import os
+import re
 import urllib.request
 import platform
 
+from benchexec.tablegenerator import remote
+
 
 class TaskId(collections.namedtuple("TaskId", "name property expected_result runset")):
     """Uniquely identifies a task (name of input file, property, etc.)."""
@@ -75,21 +81,162 @@ def open_url_seekable(path_url, mode="rt"):
     """Open a URL and ensure that the result is seekable,
     copying it into a buffer if necessary."""
 
-    logging.debug("Making request to '%s'", path_url)
-    response = urllib.request.urlopen(path_url)  # noqa: S310
-    logging.debug("Got response %s", response.info())
-
-    try:
-        response.seek(0)
-    except (OSError, AttributeError):
-        # Copy into buffer to allow seeking.
-        response = io.BytesIO(response.read())
+    if remote.can_handle(path_url):
+        response = remote.open_url(path_url)
+    else:
+        logging.debug("Making request to '%s'", path_url)
+        response = urllib.request.urlopen(path_url)  # noqa: S310
+        logging.debug("Got response %s", response.info())
+
+        try:
+            response.seek(0)
+        except (OSError, AttributeError):
+            # Copy into buffer to allow seeking.
+            response = io.BytesIO(response.read())
     if "b" in mode:
         return response
     else:
         return io.TextIOWrapper(response)
 
 
+def open_url_random_access(path_url):
+    """Open a URL as seekable binary file for reading only some parts of it
+    (e.g., single files from a ZIP archive). For HTTP(S) URLs,
+    this avoids downloading the whole file if the server supports it."""
+    if remote.can_handle(path_url):
+        return remote.open_url_random_access(path_url)
+    return open_url_seekable(path_url, "rb")
+
+
+# Start of a bzip2 stream with at least one block: "BZh", block size, block magic
+_BZ2_STREAM_START = re.compile(b"BZh[1-9]1AY&SY")
+_BZ2_STREAM_START_LENGTH = 10
+# Files are decompressed in parallel only if another bzip2 stream starts in this prefix.
+_BZ2_PARALLEL_MIN_SIZE = 4 * 1024 * 1024
+_BZ2_READ_SIZE = 1024 * 1024
+
+
+def open_bz2(f):
+    """
+    Open a bzip2-compressed file (given as seekable binary file at position 0)
+    for reading. Large files that consist of several bzip2 streams
+    (like result files written by BenchExec) are decompressed in parallel threads,
+    other files with bz2.BZ2File.
+    """
+    head = f.read(_BZ2_PARALLEL_MIN_SIZE)
+    f.seek(0)
+    if (
+        len(head) < _BZ2_PARALLEL_MIN_SIZE
+        or not _BZ2_STREAM_START.match(head)
+        or not _BZ2_STREAM_START.search(head, 1)
+    ):
+        return bz2.BZ2File(f)
+    logging.debug("Decompressing bzip2 streams in parallel.")
+    return io.BufferedReader(
+        _ChunksReader(_decompress_bz2_parts(_split_bz2_streams(f)))
+    )
+
+
+def _split_bz2_streams(f):
+    """
+    Read a bzip2 file and split its content at each position where a bzip2 stream
+    seems to start. Each part is thus a complete bzip2 stream,
+    unless a stream happens to contain the bytes of a stream start.
+    """
+    buffer = bytearray()
+    search_start = 1
+    while True:
+        match = _BZ2_STREAM_START.search(buffer, search_start)
+        if match:
+            yield bytes(buffer[: match.start()])
+            del buffer[: match.start()]
+            search_start = 1
+            continue
+        data = f.read(_BZ2_READ_SIZE)
+        if not data:
+            if buffer:
+                yield bytes(buffer)
+            return
+        # a stream start could overlap the border between buffer and data
+        search_start = max(1, len(buffer) - _BZ2_STREAM_START_LENGTH + 1)
+        buffer += data
+
+
+def _decompress_bz2_stream(data):
+    """Decompress a single bzip2 stream, or return None if data is something else."""
+    decompressor = bz2.BZ2Decompressor()
+    try:
+        result = decompressor.decompress(data)
+    except OSError:
+        return None
+    if not decompressor.eof or decompressor.unused_data:
+        return None
+    return result
+
+
+def _decompress_bz2_parts(parts):
+    """
+    Decompress the parts from _split_bz2_streams() in parallel
+    and generate the decompressed data in the correct order.
+    """
+    worker_count = os.cpu_count() or 1
+    parts = iter(parts)
+    # decompression in the bz2 module releases the GIL, so threads suffice
+    with concurrent.futures.ThreadPoolExecutor(worker_count) as executor:
+        pending = collections.deque()
+
+        def submit_parts():
+            # Submit only a few parts in advance to bound memory usage.
+            for part in itertools.islice(parts, 2 * worker_count - len(pending)):
+                pending.append((part, executor.submit(_decompress_bz2_stream, part)))
+
+        submit_parts()
+        while pending:
+            part, future = pending.popleft()
+            result = future.result()
+            while result is None:
+                # The part was not a complete stream, retry with the following part.
+                submit_parts()
+                if not pending:
+                    # This raises the same errors as BZ2File for invalid data.
+                    bz2.BZ2Decompressor().decompress(part)
+                    raise EOFError(
+                        "Compressed file ended before the end-of-stream marker "
+                        "was reached"
+                    )
+                next_part, next_future = pending.popleft()
+                next_future.cancel()
+                part += next_part
+                result = _decompress_bz2_stream(part)
+            submit_parts()
+            yield result
+
+
+class _ChunksReader(io.RawIOBase):
+    """A readable file whose content is given by an iterable of byte strings."""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._chunk = b""
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._position >= len(self._chunk):
+            self._chunk = next(self._chunks, None)
+            self._position = 0
+            if self._chunk is None:
+                self._chunk = b""
+                return 0
+        length = min(len(buffer), len(self._chunk) - self._position)
+        buffer[:length] = self._chunk[self._position : self._position + length]
+        self._position += length
+        return length
+
+
 def split_number_and_unit(s):
     """
     Split a string into two parts: a number prefix and an arbitrary suffix.
@@ -25,6 +25,12 @@ sys.dont_write_bytecode = True  # prevent creation of .pyc files
 normal_result = ProcessExitCode(raw=0, value=0, signal=None)
 
 
+class _PatchableRun(Run):
+    """Run without __slots__ such that tests can override methods of instances."""
+
+    pass
+
+
 class TestResult(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -52,7 +58,7 @@ class TestResult(unittest.TestCase):
 
         runSet.benchmark.tool.determine_result = determine_result
 
-        run = Run(
+        run = _PatchableRun(
             identifier="test.c",
             sourcefiles=["test.c"],
             task_options=None,
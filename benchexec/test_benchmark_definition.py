@@ -8,11 +8,14 @@
 import collections
 import os
 import tempfile
+import types
 import unittest
 from unittest.mock import patch
 import yaml
 
-from benchexec.model import Benchmark
+from benchexec import BenchExecException
+from benchexec import localexecution
+from benchexec.model import Benchmark, FileSystemCache, TaskDefinitionCache
 import benchexec.result
 import benchexec.util as util
 
@@ -77,7 +80,7 @@ class TestBenchmarkDefinition(unittest.TestCase):
     @patch("benchexec.result.Property.create", new=mock_property_create)
     @patch("benchexec.util.expand_filename_pattern", new=mock_expand_filename_pattern)
     @patch("os.path.samefile", new=lambda a, b: a == b)
-    def parse_benchmark_definition(self, content):
+    def parse_benchmark_definition(self, content, config=DummyConfig):
         with tempfile.NamedTemporaryFile(
             prefix="BenchExec_test_benchmark_definition_", suffix=".xml", mode="w+"
         ) as temp:
@@ -86,7 +89,7 @@ class TestBenchmarkDefinition(unittest.TestCase):
 
             # Because we mocked everything that accesses the file system,
             # we can parse the benchmark definition although task files do not exist.
-            return Benchmark(temp.name, DummyConfig, util.read_local_time())
+            return Benchmark(temp.name, config, util.read_local_time())
 
     def check_task_filter(self, filter_attr, expected):
         # The following three benchmark definitions are equivalent, we check each.
@@ -157,3 +160,254 @@ class TestBenchmarkDefinition(unittest.TestCase):
         benchmark = self.parse_benchmark_definition(benchmark_definition)
         run_ids = [run.identifier for run in benchmark.run_sets[0].runs]
         self.assertListEqual(run_ids, ["false_sub_task.yml", "false_sub2_task.yml"])
+
+    def test_task_definitions_parsed_once(self):
+        benchmark_definition = """
+            <benchmark tool="dummy">
+              <propertyfile>test.prp</propertyfile>
+              <tasks><include>*.yml</include></tasks>
+              <rundefinition name="a"/>
+              <rundefinition name="b"/>
+            </benchmark>
+            """
+        read_files = []
+        read_file = util.read_file
+
+        def counting_read_file(f):
+            read_files.append(f)
+            return read_file(f)
+
+        # mock_load_task_def_file reads each task-definition file with read_file
+        with patch("benchexec.util.read_file", new=counting_read_file):
+            benchmark = self.parse_benchmark_definition(benchmark_definition)
+        self.assertEqual(len(benchmark.run_sets), 2)
+        self.assertListEqual(
+            [run.identifier for run in benchmark.run_sets[0].runs],
+            [run.identifier for run in benchmark.run_sets[1].runs],
+        )
+        self.assertTrue(read_files)
+        self.assertCountEqual(read_files, set(read_files))
+
+    def test_core_limit_of_run_definition(self):
+        benchmark_definition = """
+            <benchmark tool="dummy" cpuCores="2">
+              <propertyfile>test.prp</propertyfile>
+              <tasks><include>*.yml</include></tasks>
+              <rundefinition name="a"/>
+              <rundefinition name="b" cpuCores="8"/>
+            </benchmark>
+            """
+        benchmark = self.parse_benchmark_definition(benchmark_definition)
+        self.assertEqual(benchmark.rlimits.cpu_cores, 2)
+        self.assertEqual(benchmark.run_sets[0].rlimits.cpu_cores, 2)
+        self.assertEqual(benchmark.run_sets[1].rlimits.cpu_cores, 8)
+        # the machine needs to have enough cores for all run definitions
+        self.assertEqual(benchmark.requirements.cpu_cores, 8)
+
+        # a limit on the command line overrides the limits of all run definitions
+        config = DummyConfig._replace(corelimit="4")
+        benchmark = self.parse_benchmark_definition(benchmark_definition, config)
+        self.assertEqual(benchmark.run_sets[0].rlimits.cpu_cores, 4)
+        self.assertEqual(benchmark.run_sets[1].rlimits.cpu_cores, 4)
+
+    def test_repetitions(self):
+        benchmark = self.parse_benchmark_definition(
+            """
+            <benchmark tool="dummy" repetitions="3" warmup="1">
+              <propertyfile>test.prp</propertyfile>
+              <tasks><include>true_task.yml</include></tasks>
+              <rundefinition/>
+            </benchmark>
+            """
+        )
+        self.assertEqual(benchmark.repetitions, 3)
+        self.assertEqual(benchmark.warmup, 1)
+
+        run = benchmark.run_sets[0].runs[0]
+        base_name = run.log_file[: -len(".log")]
+        self.assertEqual(run.execution_log_file(0), base_name + ".warmup1.log")
+        self.assertEqual(run.execution_log_file(1), run.log_file)
+        self.assertEqual(run.execution_log_file(3), base_name + ".repetition3.log")
+
+        results = [
+            {
+                "cputime": 2.0,
+                "walltime": 3.0,
+                "exitcode": util.ProcessExitCode.create(value=0),
+            },
+            {
+                "cputime": 1.0,
+                "walltime": 2.0,
+                "exitcode": util.ProcessExitCode.create(signal=9),
+            },
+            {"cputime": 6.0, "walltime": 4.0, "terminationreason": "cputime"},
+        ]
+        statistic_values = run.set_repetition_results(results)
+        self.assertEqual(statistic_values["cputime"], 2.0)
+        self.assertEqual(statistic_values["cputime-min"], 1.0)
+        self.assertEqual(statistic_values["cputime-max"], 6.0)
+        self.assertAlmostEqual(statistic_values["cputime-stdev"], 2.6457513)
+        self.assertEqual(statistic_values["walltime"], 3.0)
+        self.assertNotIn("memory", statistic_values)
+        self.assertEqual(
+            run.samples,
+            [
+                {"cputime": 2.0, "walltime": 3.0, "returnvalue": 0},
+                {"cputime": 1.0, "walltime": 2.0, "exitsignal": 9},
+                {"cputime": 6.0, "walltime": 4.0, "terminationreason": "cputime"},
+            ],
+        )
+
+    def test_combine_repetitions(self):
+        benchmark = self.parse_benchmark_definition(
+            """
+            <benchmark tool="dummy" repetitions="3">
+              <propertyfile>test.prp</propertyfile>
+              <tasks><include>true_task.yml</include></tasks>
+              <rundefinition/>
+            </benchmark>
+            """
+        )
+        benchmark.config = types.SimpleNamespace(debug=False)
+        run = benchmark.run_sets[0].runs[0]
+
+        results = [
+            {"terminationreason": "failed"},
+            None,
+            {"cputime": 2.0, "exitcode": util.ProcessExitCode.create(value=0)},
+        ]
+        with patch("os.replace") as replace, patch("os.remove") as remove:
+            run_result, visible_columns = localexecution._combine_repetitions(
+                run, results
+            )
+
+        # the first successful repetition is the main one
+        self.assertEqual(run_result["exitcode"], results[2]["exitcode"])
+        self.assertNotIn("terminationreason", run_result)
+        self.assertEqual(run_result["cputime"], 2.0)
+        self.assertIn("cputime-min", visible_columns)
+        replace.assert_called_once_with(run.execution_log_file(2), run.log_file)
+        remove.assert_called_once_with(run.execution_log_file(1))
+        self.assertEqual(
+            run.samples,
+            [{"terminationreason": "failed"}, {"cputime": 2.0, "returnvalue": 0}],
+        )
+
+    def test_invalid_repetitions(self):
+        for attributes in ['repetitions="0"', 'warmup="-1"', 'repetitions="x"']:
+            benchmark_definition = """
+                <benchmark tool="dummy" {}>
+                  <tasks><include>true_task.yml</include></tasks>
+                  <rundefinition/>
+                </benchmark>
+                """.format(
+                attributes
+            )
+            self.assertRaises(
+                SystemExit, self.parse_benchmark_definition, benchmark_definition
+            )
+
+    @patch("benchexec.model.load_task_definition_file", new=mock_load_task_def_file)
+    @patch("benchexec.result.Property.create", new=mock_property_create)
+    @patch("benchexec.util.expand_filename_pattern", new=mock_expand_filename_pattern)
+    @patch("os.path.samefile", new=lambda a, b: a == b)
+    def test_lazy_run_creation(self):
+        benchmark_definition = """
+            <benchmark tool="dummy">
+              <tasks>
+                <propertyfile expectedverdict="false">test.prp</propertyfile>
+                <include>*.yml</include>
+              </tasks>
+              <rundefinition/>
+            </benchmark>
+            """
+        config = types.SimpleNamespace(lazy_run_creation=True, **DummyConfig._asdict())
+        benchmark = self.parse_benchmark_definition(benchmark_definition, config)
+        run_set = benchmark.run_sets[0]
+        self.assertListEqual(run_set.runs, [])
+        self.assertListEqual(run_set.blocks[0].runs, [])
+        all_tasks = list(ALL_TEST_TASKS.keys()) + ["other_task.yml"]
+        self.assertListEqual(run_set.task_identifiers, sorted(all_tasks))
+        self.assertEqual(run_set.run_count(), len(all_tasks))
+
+        created_runs = list(run_set.create_runs())
+        false_tasks = sorted(f for f in ALL_TEST_TASKS.keys() if f.startswith("false"))
+        self.assertListEqual([run.identifier for run in created_runs], false_tasks)
+        self.assertListEqual(run_set.runs, created_runs)
+        self.assertListEqual(run_set.blocks[0].runs, created_runs)
+        self.assertEqual(run_set.run_count(), len(false_tasks))
+        self.assertListEqual(list(run_set.create_runs()), [])
+
+
+class TestTaskDefinitionCache(unittest.TestCase):
+    def test_parallel_preload(self):
+        task_def_files = [
+            os.path.join(test_dir, f) for f in sorted(ALL_TEST_TASKS.keys())
+        ]
+        cache = TaskDefinitionCache(parallel_threshold=1)
+        with patch("os.cpu_count", return_value=2):
+            cache.preload(task_def_files)
+
+        def fail(f):
+            self.fail("task-definition file {} parsed again".format(f))
+
+        with patch("benchexec.model.load_task_definition_file", new=fail):
+            for f in task_def_files:
+                self.assertEqual(cache.get(f), mock_load_task_def_file(f))
+
+    def test_parallel_preload_invalid_file(self):
+        with tempfile.NamedTemporaryFile(
+            prefix="BenchExec_test_task_", suffix=".yml", mode="w+"
+        ) as invalid_file:
+            invalid_file.write("format_version: '2.0'\ninput_files: [")
+            invalid_file.flush()
+            valid_file = os.path.join(test_dir, "true_task.yml")
+
+            cache = TaskDefinitionCache(parallel_threshold=1)
+            with patch("os.cpu_count", return_value=2):
+                cache.preload([valid_file, invalid_file.name])
+
+            self.assertEqual(cache.get(valid_file), mock_load_task_def_file(valid_file))
+            with self.assertRaisesRegex(BenchExecException, "Invalid task definition"):
+                cache.get(invalid_file.name)
+
+    def test_lazy_loading_below_threshold(self):
+        task_def_file = os.path.join(test_dir, "true_task.yml")
+        cache = TaskDefinitionCache()
+        cache.preload([task_def_file])
+        self.assertEqual(
+            cache.get(task_def_file), mock_load_task_def_file(task_def_file)
+        )
+
+
+class TestFileSystemCache(unittest.TestCase):
+    def test_expand_filename_pattern_cached(self):
+        cache = FileSystemCache()
+        with patch(
+            "benchexec.util.expand_filename_pattern", return_value=["a", "b"]
+        ) as expand:
+            result = cache.expand_filename_pattern("*", "dir")
+            result.append("c")  # must not modify cache content
+            self.assertListEqual(cache.expand_filename_pattern("*", "dir"), ["a", "b"])
+            self.assertListEqual(
+                cache.expand_filename_pattern("*", "other"), ["a", "b"]
+            )
+        self.assertEqual(expand.call_count, 2)
+        self.assertEqual(str(cache), "glob: 1 of 3 cached (33%)")
+
+    def test_file_accesses_cached(self):
+        cache = FileSystemCache()
+        task_def_file = os.path.join(test_dir, "true_task.yml")
+        for _ in range(3):
+            self.assertTrue(cache.isfile(task_def_file))
+            self.assertTrue(cache.samefile(task_def_file, task_def_file))
+            self.assertIn('format_version: "1.0"', cache.read_lines(task_def_file))
+        self.assertEqual(
+            str(cache),
+            "isfile: 2 of 3 cached (67%), "
+            "read: 2 of 3 cached (67%), "
+            "samefile: 2 of 3 cached (67%)",
+        )
+
+    def test_no_accesses(self):
+        self.assertEqual(str(FileSystemCache()), "no file-system accesses")
@@ -0,0 +1,88 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import unittest
+
+from benchexec.calibration import OverheadCalibration
+from benchexec import util
+
+
+class _FakeRunExecutor(object):
+    """Returns the given times for the executed runs, in this order."""
+
+    def __init__(self, times):
+        self.times = list(times)
+        self.calls = []
+
+    def execute_run(self, args, output_filename, cores=None, **kwargs):
+        self.calls.append((args, cores))
+        cputime, walltime = self.times.pop(0)
+        return {
+            "exitcode": util.ProcessExitCode.create(value=0),
+            "cputime": cputime,
+            "walltime": walltime,
+        }
+
+
+class TestOverheadCalibration(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.longMessage = True
+        logging.disable(logging.CRITICAL)
+
+    def test_calibrate(self):
+        executor = _FakeRunExecutor(
+            [(0.001, 0.01), (0.002, 0.02), (0.003, 0.03), (0.004, 0.04)]
+        )
+        calibration = OverheadCalibration()
+        calibration.calibrate(executor, 2, [([0], None), ([1], None)])
+
+        # calibration runs are interleaved across cores
+        self.assertEqual(
+            [(["/bin/true"], [0]), (["/bin/true"], [1])] * 2, executor.calls
+        )
+        summary = calibration.summary()
+        self.assertEqual(4, summary["calibrationruns"])
+        self.assertEqual(0.001, summary["cputime-overhead-min"])
+        self.assertAlmostEqual(0.0025, summary["cputime-overhead-median"])
+        self.assertEqual(0.04, summary["walltime-overhead-max"])
+        self.assertIn("walltime-overhead-stdev", summary)
+
+        # runs are corrected with the overhead measured on the same cores
+        corrected = calibration.corrected_values({"cputime": 1.0, "walltime": 2.0}, [1])
+        self.assertAlmostEqual(0.997, corrected["cputime-corrected"])
+        self.assertAlmostEqual(1.97, corrected["walltime-corrected"])
+        # and with all measurements for other cores
+        corrected = calibration.corrected_values({"cputime": 1.0}, [2])
+        self.assertEqual({"cputime-corrected": 1.0 - 0.0025}, corrected)
+
+    def test_corrected_values_not_negative(self):
+        calibration = OverheadCalibration()
+        calibration.add_sample(None, {"cputime": 0.5, "walltime": 0.5})
+        self.assertEqual(
+            {"cputime-corrected": 0, "walltime-corrected": 0},
+            calibration.corrected_values({"cputime": 0.1, "walltime": 0.2}),
+        )
+
+    def test_failed_calibration_runs_ignored(self):
+        class FailingRunExecutor(object):
+            def execute_run(self, *args, **kwargs):
+                return {"terminationreason": "failed"}
+
+        calibration = OverheadCalibration()
+        calibration.calibrate(FailingRunExecutor(), 3, [(None, None)])
+        self.assertEqual({}, calibration.summary())
+        self.assertEqual({}, calibration.corrected_values({"cputime": 1.0}))
+
+    def test_should_stop(self):
+        executor = _FakeRunExecutor([(0.001, 0.01)] * 10)
+        calibration = OverheadCalibration()
+        calibration.calibrate(
+            executor, 10, [(None, None)], should_stop=lambda: len(executor.calls) >= 3
+        )
+        self.assertEqual(3, calibration.summary()["calibrationruns"])
@@ -10,8 +10,15 @@ import logging
 import sys
 import unittest
 import math
+from unittest.mock import patch
 
-from benchexec.resources import _get_cpu_cores_per_run0
+from benchexec import resources
+from benchexec.resources import (
+    _get_cpu_cores_for_max_runs0,
+    _get_cpu_cores_per_run0,
+    _select_core_class,
+    get_core_classes,
+)
 
 sys.dont_write_bytecode = True  # prevent creation of .pyc files
 
@@ -699,5 +706,267 @@ class TestCpuCoresPerRun_quadCPU_no_ht(TestCpuCoresPerRun):
         self.assertInvalid(6, 3)
 
 
+class TestCpuCoresPerRun_singleCPU_L3(TestCpuCoresPerRun_singleCPU):
+    """Single CPU with two L3 caches shared by four cores each (like AMD CCX)."""
+
+    oneCore_assignment = [[0], [4], [1], [5], [2], [6], [3], [7]]
+    twoCore_assignment = [[0, 1], [4, 5], [2, 3], [6, 7]]
+    threeCore_assignment = [[0, 1, 2], [4, 5, 6]]
+    fourCore_assignment = [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+    def machine(self):
+        allCpus, cores_of_package, siblings_of_core = super().machine()
+        cores_of_l3cache = {0: [0, 1, 2, 3], 4: [4, 5, 6, 7]}
+        return allCpus, cores_of_package, siblings_of_core, cores_of_l3cache
+
+
+class TestCpuCoresPerRun_singleCPU_HT_L3(TestCpuCoresPerRun_singleCPU):
+    """Single CPU with hyper-threading and two L3 caches."""
+
+    ht = True
+
+    oneCore_assignment = None
+    twoCore_assignment = [[0, 4], [2, 6], [1, 5], [3, 7]]
+    threeCore_assignment = [[0, 1, 4], [2, 3, 6]]
+    fourCore_assignment = [[0, 1, 4, 5], [2, 3, 6, 7]]
+
+    def machine(self):
+        allCpus, cores_of_package, siblings_of_core = super().machine()
+        cores_of_l3cache = {0: [0, 1, 4, 5], 2: [2, 3, 6, 7]}
+        return allCpus, cores_of_package, siblings_of_core, cores_of_l3cache
+
+    def test_oneCorePerRun_L3(self):
+        self.assertValid(1, 4, [[0], [2], [1], [3]])
+
+
+class TestCpuCoresPerRun_dualCPU_L3(TestCpuCoresPerRun):
+    """Two CPUs with four L3 caches shared by four cores each."""
+
+    cpus = 2
+    cores = 8
+    ht = False
+
+    twoCore_assignment = [
+        [0, 1],
+        [8, 9],
+        [4, 5],
+        [12, 13],
+        [2, 3],
+        [10, 11],
+        [6, 7],
+        [14, 15],
+    ]
+    fourCore_assignment = [[0, 1, 2, 3], [8, 9, 10, 11], [4, 5, 6, 7], [12, 13, 14, 15]]
+    eightCore_assignment = [list(range(8)), list(range(8, 16))]
+
+    def machine(self):
+        allCpus, cores_of_package, siblings_of_core = super().machine()
+        cores_of_l3cache = {i: list(range(i, i + 4)) for i in range(0, 16, 4)}
+        return allCpus, cores_of_package, siblings_of_core, cores_of_l3cache
+
+    def test_split_across_l3caches(self):
+        # runs with more cores than an L3 cache use as few L3 caches as possible
+        self.assertValid(5, 2, [[0, 1, 2, 3, 4], [8, 9, 10, 11, 12]])
+        self.assertValid(3, 4, [[0, 1, 2], [8, 9, 10], [4, 5, 6], [12, 13, 14]])
+
+
+class TestCpuCoresPerRun_asymmetric(unittest.TestCase):
+    """Machines where units have different numbers of cores or threads per core."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.longMessage = True
+        logging.disable(logging.CRITICAL)
+
+    def assertAssignment(self, coreLimit, num_of_threads, expectedResult, use_ht=True):
+        result = _get_cpu_cores_per_run0(
+            coreLimit, num_of_threads, use_ht, *self.machine()
+        )
+        self.assertEqual(expectedResult, result)
+
+
+class TestCpuCoresPerRun_unevenCPUs(TestCpuCoresPerRun_asymmetric):
+    """Two CPUs with 4 and 2 available cores."""
+
+    def machine(self):
+        allCpus = lrange(0, 6)
+        cores_of_unit = {0: [0, 1, 2, 3], 1: [4, 5]}
+        siblings_of_core = {core: [core] for core in allCpus}
+        return allCpus, cores_of_unit, siblings_of_core
+
+    def test_oneCorePerRun(self):
+        self.assertAssignment(1, 6, [[0], [4], [1], [5], [2], [3]])
+
+    def test_twoCoresPerRun(self):
+        self.assertAssignment(2, 3, [[0, 1], [4, 5], [2, 3]])
+
+    def test_runsSplitAcrossCPUs(self):
+        self.assertAssignment(3, 2, [[0, 1, 2], [3, 4, 5]])
+        self.assertAssignment(6, 1, [lrange(0, 6)])
+
+    def test_tooManyRuns(self):
+        self.assertRaises(
+            SystemExit,
+            _get_cpu_cores_per_run0,
+            4,
+            2,
+            True,
+            *self.machine(),
+        )
+
+    def test_maxRuns(self):
+        self.assertEqual(
+            [[0, 1], [4, 5], [2, 3]],
+            _get_cpu_cores_for_max_runs0(2, 5, True, *self.machine()),
+        )
+        self.assertEqual(
+            [[0, 1, 2, 3]], _get_cpu_cores_for_max_runs0(4, 2, True, *self.machine())
+        )
+        self.assertEqual(
+            [[0], [4]], _get_cpu_cores_for_max_runs0(1, 2, True, *self.machine())
+        )
+        self.assertRaises(
+            SystemExit,
+            _get_cpu_cores_for_max_runs0,
+            7,
+            2,
+            True,
+            *self.machine(),
+        )
+
+
+class TestCpuCoresPerRun_hybridCPU(TestCpuCoresPerRun_asymmetric):
+    """
+    Hybrid CPU with two performance cores with hyper-threading (0-3)
+    and four efficiency cores (4-7), which are put into separate units.
+    """
+
+    def machine(self):
+        allCpus = lrange(0, 8)
+        cores_of_unit = {(0, 0): [0, 1, 2, 3], (0, 1): [4, 5, 6, 7]}
+        siblings_of_core = {0: [0, 1], 1: [0, 1], 2: [2, 3], 3: [2, 3]}
+        siblings_of_core.update({core: [core] for core in range(4, 8)})
+        class_of_core = {core: 0 if core < 4 else 1 for core in allCpus}
+        return allCpus, cores_of_unit, siblings_of_core, None, class_of_core
+
+    def test_oneCorePerRun(self):
+        self.assertAssignment(1, 2, [[0], [2]])
+        self.assertAssignment(1, 4, [[4], [5], [6], [7]])
+        self.assertAssignment(1, 6, [[0], [4], [2], [5], [6], [7]])
+
+    def test_oneCorePerRun_splitSiblings(self):
+        self.assertAssignment(1, 8, [[0], [4], [1], [5], [2], [6], [3], [7]])
+
+    def test_twoCoresPerRun(self):
+        self.assertAssignment(2, 4, [[0, 1], [4, 5], [2, 3], [6, 7]])
+
+    def test_threeCoresPerRun(self):
+        self.assertAssignment(3, 2, [[0, 1, 2], [4, 5, 6]])
+
+    def test_fourCoresPerRun(self):
+        self.assertAssignment(4, 1, [[0, 1, 2, 3]])
+        self.assertAssignment(4, 2, [[0, 1, 2, 3], [4, 5, 6, 7]])
+
+    def test_noMixingOfCoreClasses(self):
+        self.assertAssignment(2, 2, [[0, 1], [2, 3]])
+        self.assertRaises(
+            SystemExit,
+            _get_cpu_cores_per_run0,
+            6,
+            1,
+            True,
+            *self.machine(),
+        )
+        self.assertRaises(
+            SystemExit,
+            _get_cpu_cores_per_run0,
+            3,
+            2,
+            False,
+            *self.machine(),
+        )
+
+    def test_warningForDifferentCoreClasses(self):
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertLogs(level=logging.WARNING) as logs:
+                self.assertAssignment(1, 6, [[0], [4], [2], [5], [6], [7]])
+            self.assertIn("different performance", logs.output[0])
+            with self.assertRaises(AssertionError):
+                with self.assertLogs(level=logging.WARNING):
+                    self.assertAssignment(1, 2, [[0], [2]])
+        finally:
+            logging.disable(logging.CRITICAL)
+
+    def test_noHyperthreading(self):
+        self.assertAssignment(1, 6, [[0], [4], [2], [5], [6], [7]], use_ht=False)
+        self.assertAssignment(2, 3, [[0, 2], [4, 5], [6, 7]], use_ht=False)
+
+
+class TestCoreClasses(unittest.TestCase):
+    """Reading and selecting the performance classes of cores."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.longMessage = True
+        logging.disable(logging.CRITICAL)
+
+    def core_classes(self, files, cores):
+        with patch.object(resources.util, "try_read_file", side_effect=files.get):
+            return get_core_classes(cores)
+
+    def test_hybrid_intel(self):
+        files = {
+            "/sys/devices/cpu_core/cpus": "0-3",
+            "/sys/devices/cpu_atom/cpus": "4-7",
+        }
+        self.assertEqual(
+            {0: 0, 1: 0, 2: 0, 3: 0, 4: 1, 5: 1, 6: 1, 7: 1},
+            self.core_classes(files, lrange(0, 8)),
+        )
+        self.assertEqual({}, self.core_classes(files, lrange(0, 4)))
+        # unknown core
+        self.assertEqual({}, self.core_classes(files, lrange(0, 9)))
+
+    def test_cpu_capacity(self):
+        capacities = [1024, 1024, 512, 512, 256]
+        files = {
+            "/sys/devices/system/cpu/cpu{}/cpu_capacity".format(core): str(capacity)
+            for core, capacity in enumerate(capacities)
+        }
+        self.assertEqual(
+            {0: 0, 1: 0, 2: 1, 3: 1, 4: 2}, self.core_classes(files, lrange(0, 5))
+        )
+        self.assertEqual({2: 0, 4: 1}, self.core_classes(files, [2, 4]))
+        self.assertEqual({}, self.core_classes(files, [0, 1]))
+        # capacity of core 5 is missing
+        self.assertEqual({}, self.core_classes(files, lrange(0, 6)))
+
+    def test_no_information(self):
+        self.assertEqual({}, self.core_classes({}, lrange(0, 4)))
+
+    def test_select_core_class(self):
+        allCpus = lrange(0, 6)
+        class_of_core = {0: 0, 1: 0, 2: 1, 3: 1, 4: 2, 5: 2}
+        self.assertEqual(
+            (allCpus, class_of_core), _select_core_class(allCpus, class_of_core, None)
+        )
+        self.assertEqual(
+            ([0, 1], {}),
+            _select_core_class(
+                allCpus, class_of_core, resources.CORE_CLASS_PERFORMANCE
+            ),
+        )
+        self.assertEqual(
+            ([4, 5], {}),
+            _select_core_class(allCpus, class_of_core, resources.CORE_CLASS_EFFICIENCY),
+        )
+        # all cores are equal
+        self.assertEqual(
+            (allCpus, {}),
+            _select_core_class(allCpus, {}, resources.CORE_CLASS_EFFICIENCY),
+        )
+
+
 # prevent execution of base class as its own test
-del TestCpuCoresPerRun
+del TestCpuCoresPerRun, TestCpuCoresPerRun_asymmetric
@@ -0,0 +1,91 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchexec.cpufrequency import FrequencyPinning
+from benchexec import util
+
+
+class TestFrequencyPinning(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.longMessage = True
+        logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        self.sys_dir = tempfile.mkdtemp(prefix="BenchExec_test_cpufrequency_")
+        self.cpu_dir = os.path.join(self.sys_dir, "devices", "system", "cpu")
+        for core in range(2):
+            cpufreq_dir = os.path.join(self.cpu_dir, "cpu{}".format(core), "cpufreq")
+            os.makedirs(cpufreq_dir)
+            for name, value in [
+                ("scaling_available_governors", "performance powersave"),
+                ("scaling_governor", "powersave"),
+                ("cpuinfo_min_freq", "800000"),
+                ("cpuinfo_max_freq", "3000000"),
+                ("scaling_min_freq", "1000000"),
+                ("scaling_max_freq", "2500000"),
+            ]:
+                util.write_file(value + "\n", cpufreq_dir, name)
+        os.makedirs(os.path.join(self.cpu_dir, "intel_pstate"))
+        util.write_file("0\n", self.cpu_dir, "intel_pstate", "no_turbo")
+
+    def tearDown(self):
+        shutil.rmtree(self.sys_dir)
+
+    def read(self, core, name):
+        return util.read_file(self.cpu_dir, "cpu{}".format(core), "cpufreq", name)
+
+    def read_no_turbo(self):
+        return util.read_file(self.cpu_dir, "intel_pstate", "no_turbo")
+
+    def test_pin_performance_governor(self):
+        with FrequencyPinning(sys_dir=self.sys_dir) as pinning:
+            self.assertEqual([0, 1], pinning.cores)
+            for core in range(2):
+                self.assertEqual("performance", self.read(core, "scaling_governor"))
+                self.assertEqual("1000000", self.read(core, "scaling_min_freq"))
+                self.assertEqual("2500000", self.read(core, "scaling_max_freq"))
+            self.assertEqual("1", self.read_no_turbo())
+
+        for core in range(2):
+            self.assertEqual("powersave", self.read(core, "scaling_governor"))
+        self.assertEqual("0", self.read_no_turbo())
+
+    def test_pin_frequency(self):
+        with FrequencyPinning([1], 2000000000, sys_dir=self.sys_dir):
+            self.assertEqual("performance", self.read(1, "scaling_governor"))
+            self.assertEqual("2000000", self.read(1, "scaling_min_freq"))
+            self.assertEqual("2000000", self.read(1, "scaling_max_freq"))
+            self.assertEqual("powersave", self.read(0, "scaling_governor"))
+            self.assertEqual("2500000", self.read(0, "scaling_max_freq"))
+
+        self.assertEqual("powersave", self.read(1, "scaling_governor"))
+        self.assertEqual("1000000", self.read(1, "scaling_min_freq"))
+        self.assertEqual("2500000", self.read(1, "scaling_max_freq"))
+
+    def test_unsupported_frequency(self):
+        pinning = FrequencyPinning(frequency=4000000000, sys_dir=self.sys_dir)
+        self.assertRaises(ValueError, pinning.pin)
+        self.assertEqual("powersave", self.read(0, "scaling_governor"))
+        self.assertEqual("0", self.read_no_turbo())
+
+    def test_failure_reverts_changes(self):
+        os.remove(os.path.join(self.cpu_dir, "cpu1", "cpufreq", "scaling_governor"))
+        pinning = FrequencyPinning(sys_dir=self.sys_dir)
+        self.assertRaises(OSError, pinning.pin)
+        self.assertEqual("powersave", self.read(0, "scaling_governor"))
+        self.assertEqual("0", self.read_no_turbo())
+
+    def test_restore_without_pin(self):
+        FrequencyPinning(sys_dir=self.sys_dir).restore()
+        self.assertEqual("powersave", self.read(0, "scaling_governor"))
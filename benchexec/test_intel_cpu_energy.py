@@ -0,0 +1,109 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+
+from benchexec import intel_cpu_energy
+
+sys.dont_write_bytecode = True  # prevent creation of .pyc files
+
+
+class TestPowercapEnergyMeasurement(unittest.TestCase):
+    def setUp(self):
+        self.powercap_dir = tempfile.mkdtemp(prefix="BenchExec_test_powercap_")
+        self.add_zone("intel-rapl:0", "package-0")
+        self.add_zone("intel-rapl:0:0", "core")
+        self.add_zone("intel-rapl:0:1", "dram")
+        self.add_zone("intel-rapl:1", "package-1")
+        self.add_zone("intel-rapl:1:0", "core")
+        self.add_zone("intel-rapl:2", "psys")
+        self.add_zone("intel-rapl-mmio:0", "package-0")
+
+    def tearDown(self):
+        shutil.rmtree(self.powercap_dir)
+
+    def add_zone(self, zone, name, max_energy=1000000000):
+        os.mkdir(os.path.join(self.powercap_dir, zone))
+        self.write(zone, "name", name)
+        self.write(zone, "max_energy_range_uj", max_energy)
+        self.set_energy(zone, 0)
+
+    def write(self, zone, filename, value):
+        with open(os.path.join(self.powercap_dir, zone, filename), "w") as f:
+            f.write("{}\n".format(value))
+
+    def set_energy(self, zone, value):
+        self.write(zone, "energy_uj", value)
+
+    def create_measurement(self):
+        return intel_cpu_energy.PowercapEnergyMeasurement.create_if_supported(
+            self.powercap_dir
+        )
+
+    def test_domains(self):
+        domains = intel_cpu_energy._find_powercap_domains(self.powercap_dir)
+        self.assertEqual(
+            [(0, "package"), (0, "core"), (0, "dram"), (1, "package"), (1, "core")],
+            [(package, domain) for package, domain, _, _ in domains],
+        )
+
+    def test_measurement(self):
+        measurement = self.create_measurement()
+        self.assertIsNotNone(measurement)
+        self.set_energy("intel-rapl:0", 1000)
+        self.set_energy("intel-rapl:0:0", 2000)
+        measurement.start()
+        self.assertTrue(measurement.is_running())
+        self.set_energy("intel-rapl:0", 1501000)
+        self.set_energy("intel-rapl:0:0", 2500)
+        self.set_energy("intel-rapl:1", 42)
+        result = measurement.stop()
+        self.assertFalse(measurement.is_running())
+
+        self.assertEqual(
+            {
+                0: {"package": Decimal("1.5"), "core": Decimal("0.0005"), "dram": 0},
+                1: {"package": Decimal("0.000042"), "core": 0},
+            },
+            result,
+        )
+        self.assertEqual(
+            Decimal("1.500042"),
+            intel_cpu_energy.format_energy_results(result)["cpuenergy"],
+        )
+        self.assertIsNone(measurement.stop())
+
+    def test_wrap_around(self):
+        self.write("intel-rapl:0", "max_energy_range_uj", 1000)
+        measurement = self.create_measurement()
+        self.set_energy("intel-rapl:0", 900)
+        measurement.start()
+        self.set_energy("intel-rapl:0", 950)
+        measurement._update()
+        self.set_energy("intel-rapl:0", 100)
+        measurement._update()
+        self.set_energy("intel-rapl:0", 300)
+        result = measurement.stop()
+        self.assertEqual(Decimal("0.0004"), result[0]["package"])
+
+    def test_unsupported(self):
+        os.chmod(os.path.join(self.powercap_dir, "intel-rapl:0", "energy_uj"), 0)
+        if os.access(
+            os.path.join(self.powercap_dir, "intel-rapl:0", "energy_uj"), os.R_OK
+        ):
+            self.skipTest("cannot make file unreadable when running as root")
+        self.assertIsNone(self.create_measurement())
+
+    def test_no_powercap(self):
+        shutil.rmtree(self.powercap_dir)
+        os.mkdir(self.powercap_dir)
+        self.assertIsNone(self.create_measurement())
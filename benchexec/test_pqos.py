@@ -11,10 +11,14 @@
 import json
 import copy
 import logging
+import os
+import tempfile
+import time
 import unittest
 from subprocess import CalledProcessError
 from unittest.mock import patch, MagicMock
-from benchexec.pqos import Pqos
+from benchexec import pqos_monitor
+from benchexec.pqos import MonitoringService, Pqos
 
 
 mock_pqos_wrapper_output = {
@@ -365,3 +369,81 @@ class TestPqos(unittest.TestCase):
         """
         ret = Pqos.convert_core_list([[0, 1], [2, 3]])
         self.assertEqual(ret, "[[0,1],[2,3]]")
+
+
+class TestMonitoringService(unittest.TestCase):
+    def test_fake_monitoring(self):
+        service = MonitoringService(helper_args=["--fake", "--interval", "0.01"])
+        self.assertTrue(service.start())
+        try:
+            group1 = service.start_group([0, 1])
+            group2 = service.start_group([2])
+            self.assertNotEqual(group1, group2)
+            time.sleep(0.05)
+            data1 = service.stop_group(group1)
+            data2 = service.stop_group(group2)
+        finally:
+            service.close()
+
+        self.assertEqual(2000000, data1["llc_occupancy_avg"])
+        self.assertEqual(1000000, data2["llc_occupancy_max"])
+        self.assertIn("mbm_local_bandwidth_avg", data1)
+        self.assertIn("mbm_total_bandwidth_max", data2)
+        # keys of pqos_wrapper are not used because units differ
+        self.assertNotIn("llc_avg", data1)
+        self.assertNotIn("mbm_local_avg", data1)
+        self.assertIsNone(service.process)
+
+    def test_stop_unknown_group(self):
+        service = MonitoringService(helper_args=["--fake"])
+        self.assertTrue(service.start())
+        try:
+            self.assertEqual({}, service.stop_group("42"))
+        finally:
+            service.close()
+
+    def test_unsupported(self):
+        with tempfile.TemporaryDirectory() as resctrl_dir:
+            service = MonitoringService(helper_args=["--resctrl-dir", resctrl_dir])
+            self.assertFalse(service.start())
+            self.assertIsNone(service.process)
+            self.assertIsNone(service.start_group([0]))
+
+
+class TestPqosMonitor(unittest.TestCase):
+    def test_resctrl_monitor(self):
+        with tempfile.TemporaryDirectory() as resctrl_dir:
+            os.makedirs(os.path.join(resctrl_dir, "info", "L3_MON"))
+            os.mkdir(os.path.join(resctrl_dir, "mon_groups"))
+            monitor = pqos_monitor.ResctrlMonitor(resctrl_dir)
+            self.assertIsNone(monitor.check_support())
+
+            monitor.create_group("run1", [0, 2])
+            group_dir = os.path.join(resctrl_dir, "mon_groups", "benchexec_run1")
+            with open(os.path.join(group_dir, "cpus_list")) as f:
+                self.assertEqual("0,2", f.read())
+            for domain, values in [("00", ["100", "5"]), ("01", ["20", "Unavailable"])]:
+                domain_dir = os.path.join(group_dir, "mon_data", "mon_L3_" + domain)
+                os.makedirs(domain_dir)
+                for event, value in zip(["llc_occupancy", "mbm_total_bytes"], values):
+                    with open(os.path.join(domain_dir, event), "w") as f:
+                        f.write(value + "\n")
+            self.assertEqual(
+                {"llc_occupancy": 120, "mbm_total_bytes": 5},
+                monitor.read_group("run1"),
+            )
+
+    def test_compute_monitoring_data(self):
+        samples = [
+            (0, {"llc_occupancy": 100, "mbm_local_bytes": 0}),
+            (1, {"llc_occupancy": 300, "mbm_local_bytes": 1000}),
+            (2, {"llc_occupancy": 200, "mbm_local_bytes": 4000}),
+        ]
+        self.assertEqual(
+            {
+                "cores": [1],
+                "llc_occupancy": {"avg": 200, "max": 300},
+                "mbm_local_bandwidth": {"avg": 2000, "max": 3000},
+            },
+            pqos_monitor.compute_monitoring_data([1], samples),
+        )
@@ -0,0 +1,84 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+from benchexec.cgroups import CPUACCT, MEMORY
+from benchexec.resourcesampling import ResourceSamplingThread
+
+sys.dont_write_bytecode = True  # prevent creation of .pyc files
+
+
+class _FakeCgroups(object):
+    """Cgroups with increasing CPU time and memory usage on each read."""
+
+    def __init__(self, subsystems=(CPUACCT, MEMORY)):
+        self.subsystems = subsystems
+        self.reads = 0
+
+    def __contains__(self, subsystem):
+        return subsystem in self.subsystems
+
+    def has_value(self, subsystem, option):
+        return option == "usage_in_bytes"
+
+    def read_cputime(self):
+        self.reads += 1
+        return self.reads * 0.5
+
+    def get_value(self, subsystem, option):
+        assert (subsystem, option) == (MEMORY, "usage_in_bytes")
+        return str(self.reads * 1000)
+
+
+class TestResourceSamplingThread(unittest.TestCase):
+    def test_sampling(self):
+        thread = ResourceSamplingThread(_FakeCgroups(), interval=0.01)
+        thread.start()
+        while len(thread.samples) < 3:
+            thread._finished.wait(0.01)
+        thread.cancel()
+        thread.join()
+
+        self.assertGreaterEqual(len(thread.samples), 4)
+        walltimes = [walltime for walltime, _, _ in thread.samples]
+        self.assertEqual(sorted(walltimes), walltimes)
+        self.assertEqual((0.5, 1000), thread.samples[0][1:])
+
+    def test_decimation(self):
+        thread = ResourceSamplingThread(_FakeCgroups(), interval=1, max_samples=10)
+        for _ in range(25):
+            thread.sample()
+        self.assertLessEqual(len(thread.samples), 10)
+        self.assertEqual(8, thread._interval)  # doubled three times
+        self.assertEqual(0.5, thread.samples[0][1])  # first sample is kept
+
+    def test_missing_values(self):
+        thread = ResourceSamplingThread(_FakeCgroups(subsystems=[MEMORY]), interval=1)
+        thread.sample()
+        self.assertEqual((None, 0), thread.samples[0][1:])
+
+    def test_write_csv(self):
+        thread = ResourceSamplingThread(_FakeCgroups(), interval=1)
+        thread.samples = [(0, 0.0, 100), (1.5, 1.25, None)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "run.timeseries.csv")
+            thread.write_csv(filename)
+            with open(filename, newline="") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(
+            [
+                ["walltime (s)", "cputime (s)", "memory (B)"],
+                ["0.000", "0.000", "100"],
+                ["1.500", "1.250", ""],
+            ],
+            rows,
+        )
@@ -0,0 +1,147 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+
+from benchexec import systeminfo
+
+sys.dont_write_bytecode = True  # prevent creation of .pyc files
+
+
+class TestSystemHealthSampler(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp(prefix="BenchExec_test_systeminfo_")
+        self.sys_dir = os.path.join(self.base_dir, "sys")
+        self.proc_dir = os.path.join(self.base_dir, "proc")
+        os.makedirs(os.path.join(self.proc_dir, "pressure"))
+        for cpu in range(4):
+            cpu_dir = os.path.join(self.sys_dir, "devices", "system", "cpu")
+            os.makedirs(os.path.join(cpu_dir, "cpu{}".format(cpu), "cpufreq"))
+            os.makedirs(os.path.join(cpu_dir, "cpu{}".format(cpu), "thermal_throttle"))
+        self.set_state(frequency=3000000, throttle_count=0, swapped=0, stalled=0)
+        self.sampler = systeminfo.SystemHealthSampler(
+            sys_dir=self.sys_dir, proc_dir=self.proc_dir
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def write(self, value, *path):
+        with open(os.path.join(*path), "w") as f:
+            f.write(value)
+
+    def set_state(self, frequency, throttle_count, swapped, stalled, cpus=range(4)):
+        for cpu in cpus:
+            cpu_dir = os.path.join(
+                self.sys_dir, "devices", "system", "cpu", "cpu{}".format(cpu)
+            )
+            self.write(str(frequency), cpu_dir, "cpufreq", "scaling_cur_freq")
+            for kind in ["core", "package"]:
+                self.write(
+                    str(throttle_count),
+                    cpu_dir,
+                    "thermal_throttle",
+                    kind + "_throttle_count",
+                )
+        self.write(
+            "pgfault 1000\npgmajfault 7\npswpin {}\npswpout 0\n".format(swapped),
+            self.proc_dir,
+            "vmstat",
+        )
+        for resource in ["cpu", "memory", "io"]:
+            self.write(
+                "some avg10=0.00 avg60=0.00 avg300=0.00 total={0}\n"
+                "full avg10=0.00 avg60=0.00 avg300=0.00 total={0}\n".format(stalled),
+                self.proc_dir,
+                "pressure",
+                resource,
+            )
+
+    def test_summarize(self):
+        self.sampler.sample()
+        start = self.sampler._samples[-1].time
+        self.set_state(
+            frequency=1000000, throttle_count=2, swapped=5, stalled=1500000, cpus=[1]
+        )
+        self.sampler.sample()
+        self.sampler.sample()
+        end = self.sampler._samples[-1].time
+
+        result = self.sampler.summarize(start, end, cores=[0, 1])
+        self.assertEqual(1000000000, result["cpufreq-min"])
+        self.assertEqual(2000000000, result["cpufreq-avg"])
+        self.assertEqual(4, result["throttlecount"])
+        self.assertEqual(5, result["swappedpages"])
+        self.assertEqual(0, result["majorpagefaults"])
+        self.assertEqual(Decimal("1.5"), result["pressure-memory-full"])
+
+        result = self.sampler.summarize(start, end, cores=[2, 3])
+        self.assertEqual(3000000000, result["cpufreq-min"])
+        self.assertEqual(0, result["throttlecount"])
+
+    def test_summarize_takes_new_sample(self):
+        self.sampler.sample()
+        start = self.sampler._samples[-1].time
+        self.set_state(frequency=3000000, throttle_count=1, swapped=0, stalled=0)
+        result = self.sampler.summarize(start, start + 1e-9)
+        self.assertEqual(2, len(self.sampler._samples))
+        self.assertEqual(8, result["throttlecount"])
+
+    def test_summarize_interval_not_covered(self):
+        sampler = systeminfo.SystemHealthSampler(
+            capacity=2, sys_dir=self.sys_dir, proc_dir=self.proc_dir
+        )
+        baseline = sampler.sample()
+        self.set_state(frequency=1000000, throttle_count=1, swapped=5, stalled=0)
+        for _ in range(3):
+            sampler.sample()
+        end = sampler._samples[-1].time
+
+        # baseline was evicted from ring buffer, values would cover only part of run
+        result = sampler.summarize(baseline.time, end)
+        self.assertNotIn("cpufreq-min", result)
+        self.assertNotIn("throttlecount", result)
+        self.assertNotIn("swappedpages", result)
+        self.assertNotIn("pressure-cpu-some", result)
+
+        result = sampler.summarize(baseline.time, end, baseline=baseline)
+        self.assertNotIn("cpufreq-min", result)
+        self.assertEqual(8, result["throttlecount"])
+        self.assertEqual(5, result["swappedpages"])
+        self.assertEqual(Decimal(0), result["pressure-cpu-some"])
+
+    def test_ring_buffer(self):
+        sampler = systeminfo.SystemHealthSampler(
+            capacity=2, sys_dir=self.sys_dir, proc_dir=self.proc_dir
+        )
+        for _ in range(5):
+            sampler.sample()
+        self.assertEqual(2, len(sampler._samples))
+
+    def test_background_sampling(self):
+        sampler = systeminfo.SystemHealthSampler(
+            interval=0.01, sys_dir=self.sys_dir, proc_dir=self.proc_dir
+        )
+        sampler.start()
+        try:
+            while len(sampler._samples) < 3:
+                sampler._stop_event.wait(0.01)
+        finally:
+            sampler.stop()
+        self.assertIsNone(sampler._thread)
+
+    def test_missing_files(self):
+        sampler = systeminfo.SystemHealthSampler(
+            sys_dir=os.path.join(self.base_dir, "nonexistent"),
+            proc_dir=os.path.join(self.base_dir, "nonexistent"),
+        )
+        self.assertEqual({}, sampler.summarize(0, 1))
@@ -5,7 +5,9 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import bz2
 import datetime
+import io
 import sys
 import unittest
 from benchexec.util import ProcessExitCode
@@ -153,3 +155,38 @@ class TestRmtree(unittest.TestCase):
 
         time2 = util.read_local_time()  # contains backwards-compatible code
         self.assertLess(time2 - time, datetime.timedelta(seconds=1))
+
+
+class TestBZ2MultiStreamWriter(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp(prefix="BenchExec_test_util_bz2")
+        self.file = os.path.join(self.base_dir, "file.bz2")
+
+    def tearDown(self):
+        util.rmtree(self.base_dir)
+
+    def write_and_read(self, chunks, stream_size):
+        with util.BZ2MultiStreamWriter(self.file, stream_size=stream_size) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        with open(self.file, "rb") as f:
+            content = f.read()
+        self.assertEqual(b"".join(chunks), bz2.decompress(content))
+        return content.count(b"BZh9")
+
+    def test_streams(self):
+        chunks = [bytes([i]) * 1000 for i in range(10)]
+        self.assertEqual(4, self.write_and_read(chunks, 2500))
+        self.assertEqual(5, self.write_and_read(chunks, 2000))
+        self.assertEqual(1, self.write_and_read(chunks, 10000))
+
+    def test_empty(self):
+        self.assertEqual(1, self.write_and_read([], 1000))
+
+    def test_text(self):
+        with io.TextIOWrapper(
+            util.BZ2MultiStreamWriter(self.file, "wb", 10), encoding="utf-8"
+        ) as f:
+            f.write("<result>\n" * 10)
+        with bz2.open(self.file, "rt", encoding="utf-8") as f:
+            self.assertEqual("<result>\n" * 10, f.read())
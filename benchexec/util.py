@@ -10,11 +10,13 @@ This module contains some useful functions for Strings, XML or Lists.
 """
 
 import argparse
+import bz2
 import collections
 import datetime
 import errno
 import fnmatch
 import glob
+import io
 import logging
 import os
 import shutil
@@ -479,6 +481,54 @@ def read_key_value_pairs_from_file(*path):
             yield line.split(" ", 1)  # maxsplit=1
 
 
+class BZ2MultiStreamWriter(io.BufferedIOBase):
+    """
+    Writable file that compresses its content with bzip2 like bz2.BZ2File,
+    but starts a new bzip2 stream after each stream_size bytes of uncompressed data.
+    This is a valid bzip2 file (bzip2 and the bz2 module decompress all streams),
+    but the streams can be found easily and decompressed in parallel.
+    Compression is not noticeably worse because bzip2 compresses blocks of at most
+    900 kB independently anyway.
+    """
+
+    def __init__(self, filename, mode="wb", stream_size=16 * 1024 * 1024):
+        if mode not in ["w", "wb"]:
+            raise ValueError("Invalid mode: {!r}".format(mode))
+        super().__init__()
+        self._file = open(filename, "wb")
+        self._stream_size = stream_size
+        self._compressor = bz2.BZ2Compressor()
+        self._remaining_size = stream_size
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = memoryview(data).cast("B")
+        written = 0
+        while written < len(data):
+            size = min(len(data) - written, self._remaining_size)
+            self._file.write(self._compressor.compress(data[written : written + size]))
+            written += size
+            self._remaining_size -= size
+            if not self._remaining_size:
+                self._file.write(self._compressor.flush())
+                self._compressor = bz2.BZ2Compressor()
+                self._remaining_size = self._stream_size
+        return written
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            # a stream is necessary for empty files as well
+            if self._remaining_size < self._stream_size or not self._file.tell():
+                self._file.write(self._compressor.flush())
+        finally:
+            self._file.close()
+            super().close()
+
+
 class ProcessExitCode(collections.namedtuple("ProcessExitCode", "raw value signal")):
     """Tuple for storing the exit status indication given by a os.wait() call.
     Only value or signal are present, not both
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measure how much memory BenchExec needs per run for the in-memory representation
+of a benchmark (model.Run) and of results in table-generator (RunResult).
+This is meant for comparing different versions of BenchExec, e.g.:
+
+    contrib/measure-memory-usage.py --runs 100000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+import types
+from xml.etree import ElementTree
+
+sys.dont_write_bytecode = True  # prevent creation of .pyc files
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import benchexec.model  # noqa: E402
+import benchexec.util  # noqa: E402
+from benchexec.tablegenerator import RunResult  # noqa: E402
+from benchexec.tablegenerator.columns import Column  # noqa: E402
+
+TASK_DEFINITION = """format_version: "2.0"
+input_files: task.c
+properties:
+  - property_file: test.prp
+    expected_verdict: {}
+"""
+
+BENCHMARK_DEFINITION = """<?xml version="1.0"?>
+<benchmark tool="dummy" timelimit="60 s">
+  <option name="-option">value</option>
+  <columns>
+    <column title="first">First value</column>
+    <column title="second">Second value</column>
+  </columns>
+  <rundefinition name="config"/>
+  <tasks>
+    <include>tasks/*.yml</include>
+    <propertyfile>tasks/test.prp</propertyfile>
+  </tasks>
+</benchmark>
+"""
+
+
+def measure(create):
+    """Return the result of create() and the memory in bytes that was allocated."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = create()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def create_benchmark(directory, count):
+    task_dir = os.path.join(directory, "tasks")
+    os.mkdir(task_dir)
+    benchexec.util.write_file("", task_dir, "task.c")
+    benchexec.util.write_file(
+        "CHECK( init(main()), LTL(G ! call(reach_error())) )\n", task_dir, "test.prp"
+    )
+    for i in range(count):
+        benchexec.util.write_file(
+            TASK_DEFINITION.format(str(i % 2 == 0).lower()),
+            task_dir,
+            "task{:07}.yml".format(i),
+        )
+    benchmark_file = os.path.join(directory, "benchmark.xml")
+    benchexec.util.write_file(BENCHMARK_DEFINITION, benchmark_file)
+
+    config = types.SimpleNamespace(
+        name=None,
+        output_path=os.path.join(directory, "results/"),
+        container=False,
+        timelimit=None,
+        walltimelimit=None,
+        memorylimit=None,
+        corelimit=None,
+        num_of_threads=None,
+        selected_run_definitions=None,
+        selected_sourcefile_sets=None,
+        description_file=None,
+    )
+    return benchmark_file, config
+
+
+def measure_runs(count):
+    with tempfile.TemporaryDirectory(prefix="BenchExec_memory_") as directory:
+        benchmark_file, config = create_benchmark(directory, count)
+        benchmark, size = measure(
+            lambda: benchexec.model.Benchmark(
+                benchmark_file, config, benchexec.util.read_local_time()
+            )
+        )
+        assert len(benchmark.run_sets[0].runs) == count
+        return size
+
+
+def measure_run_results(count):
+    columns = [
+        Column("status"),
+        Column("cputime"),
+        Column("walltime"),
+        Column("memory", unit="MB", source_unit="B"),
+    ]
+
+    def create():
+        statuses = ["true", "false(unreach-call)", "TIMEOUT", "OUT OF MEMORY"]
+        return [
+            RunResult.create_from_xml(
+                _create_run_tag(i, statuses[i % len(statuses)]),
+                lambda lines, identifier: None,
+                columns,
+                False,
+                {},
+                set(),
+                "results.xml",
+            )
+            for i in range(count)
+        ]
+
+    return measure(create)[1]
+
+
+def _create_run_tag(i, status):
+    run_tag = ElementTree.Element("run", name="task{:07}.yml".format(i))
+    for title, value in [
+        ("status", status),
+        ("category", "correct" if status == "true" else "wrong"),
+        ("cputime", "{}.{:03}s".format(i % 100, i % 1000)),
+        ("walltime", "{}.{:03}s".format(i % 100 + 1, i % 1000)),
+        ("memory", "{}B".format(i * 4096)),
+    ]:
+        ElementTree.SubElement(run_tag, "column", title=title, value=value)
+    return run_tag
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=10000,
+        help="number of runs to create (default: 10000)",
+    )
+    options = parser.parse_args(argv)
+
+    run_size = measure_runs(options.runs)
+    print(
+        "model.Benchmark with {} runs: {:.1f} MB ({:.0f} bytes per run)".format(
+            options.runs, run_size / 1e6, run_size / options.runs
+        )
+    )
+    result_size = measure_run_results(options.runs)
+    print(
+        "tablegenerator.RunResult for {} runs: {:.1f} MB ({:.0f} bytes per run)".format(
+            options.runs, result_size / 1e6, result_size / options.runs
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()